@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+
+## -*-Pyth-*-
+ # ###################################################################
+ #  FiPy - Python-based finite volume PDE solver
+ #
+ #  FILE: "operatorMatrix.py"
+ #
+ #  Author: Jonathan Guyer <guyer@nist.gov>
+ #  Author: Daniel Wheeler <daniel.wheeler@nist.gov>
+ #  Author: James Warren   <jwarren@nist.gov>
+ #    mail: NIST
+ #     www: http://www.ctcms.nist.gov/fipy/
+ #
+ # ========================================================================
+ # This software was developed at the National Institute of Standards
+ # of Standards and Technology, an agency of the Federal Government.
+ # Pursuant to title 17 section 105 of the United States Code,
+ # United States Code this software is not subject to copyright
+ # protection, and this software is considered to be in the public domain.
+ # FiPy is an experimental system.
+ # NIST assumes no responsibility whatsoever for its use by whatsoever for its use by
+ # other parties, and makes no guarantees, expressed or implied, about
+ # its quality, reliability, or any other characteristic.  We would
+ # appreciate acknowledgement if the software is used.
+ #
+ # To the extent that NIST may hold copyright in countries other than the
+ # United States, you are hereby granted the non-exclusive irrevocable and
+ # unconditional right to print, publish, prepare derivative works and
+ # distribute this software, in any medium, or authorize others to do so on
+ # your behalf, on a royalty-free basis throughout the world.
+ #
+ # You may improve, modify, and create derivative works of the software or
+ # any portion of the software, and you may copy and distribute such
+ # modifications or works.  Modified works should carry a notice stating
+ # that you changed the software and should note the date and nature of any
+ # such change.  Please explicitly acknowledge the National Institute of
+ # Standards and Technology as the original source.
+ #
+ # This software can be redistributed and/or modified freely provided that
+ # any derivative works bear some notice that they are derived from it, and
+ # any modified versions bear some notice that they have been modified.
+ # ========================================================================
+ #
+ # ###################################################################
+ ##
+
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tools import numerix
+
+from fipy.matrices.sparseMatrix import _SparseMatrix
+
+class _OperatorMatrix(_SparseMatrix):
+    """Sparse matrix that is only ever multiplied by vectors
+
+    The contributions made with `addAt` are kept as they are given and
+    applied to a vector with a scatter-add, so no sparse matrix is ever
+    assembled. Products and sums of `_OperatorMatrix` objects are applied
+    term by term. The contributions are held as (value, `id1`, `id2`)
+    triplets, like a COO matrix, so this saves the time of assembly, not
+    memory.
+
+        >>> from fipy import Grid1D
+        >>> mesh = Grid1D(nx=3)
+        >>> L = _OperatorMatrix(mesh=mesh)
+        >>> L.addAt([3., 10., numerix.pi, 2.5], [0, 0, 1, 2], [2, 1, 1, 0])
+        >>> L.addAtDiagonal(1.)
+        >>> x = numerix.array((1., 2., 3.))
+        >>> print L * x
+        [ 30.           8.28318531   5.5       ]
+        >>> print (L - 2 * L) * x
+        [-30.          -8.28318531  -5.5       ]
+        >>> print (L * L) * x
+        [ 129.33185307   34.30557942   80.5       ]
+
+    The rows and columns match those of the solver's matrix with the same
+    arguments
+
+        >>> from fipy.solvers import DefaultSolver
+        >>> from fipy.matrices.offsetSparseMatrix import OffsetSparseMatrix
+        >>> x = numerix.arange(6.)
+        >>> for SparseMatrix in (_OperatorMatrix, DefaultSolver()._matrixClass):
+        ...     OffsetMatrix = OffsetSparseMatrix(SparseMatrix=SparseMatrix,
+        ...                                       numberOfVariables=2,
+        ...                                       numberOfEquations=2)
+        ...     OffsetMatrix.equationIndex = 1
+        ...     L = OffsetMatrix(mesh=mesh)
+        ...     L.addAt(numerix.array((1., 2.)), numerix.array((0, 2)),
+        ...             numerix.array((1, 1)))
+        ...     L.addAtDiagonal(3.)
+        ...     print L * x
+        [ 0.  0.  0.  1.  3.  8.]
+        [ 0.  0.  0.  1.  3.  8.]
+    """
+
+    def __init__(self, mesh, bandwidth=0, sizeHint=None, numberOfVariables=1, numberOfEquations=1, storeZeros=True):
+        """
+        :Parameters:
+          - `mesh`: The `Mesh` that the matrix is for.
+          - `bandwidth`: *unused*
+          - `sizeHint`: *unused*
+          - `numberOfVariables`: The columns of the matrix are determined by `numberOfVariables * mesh.numberOfCells`.
+          - `numberOfEquations`: The rows of the matrix are determined by `numberOfEquations * mesh.numberOfCells`.
+          - `storeZeros`: *unused*
+        """
+        self.mesh = mesh
+        self.numberOfVariables = numberOfVariables
+        self.numberOfEquations = numberOfEquations
+        self._contributions = []
+        self._products = []
+
+    @property
+    def _shape(self):
+        N = self.mesh.numberOfCells
+        return (self.numberOfEquations * N, self.numberOfVariables * N)
+
+    def _new(self):
+        return _OperatorMatrix(mesh=self.mesh,
+                               numberOfVariables=self.numberOfVariables,
+                               numberOfEquations=self.numberOfEquations)
+
+    def copy(self):
+        other = self._new()
+        other._contributions = list(self._contributions)
+        other._products = list(self._products)
+        return other
+
+    def addAt(self, vector, id1, id2):
+        self._contributions.append((numerix.asarray(vector).ravel(),
+                                    numerix.asarray(id1).ravel(),
+                                    numerix.asarray(id2).ravel()))
+
+    def addAtDiagonal(self, vector):
+        if type(vector) in [type(1), type(1.)]:
+            vector = numerix.repeat(vector, self._shape[0])
+
+        ids = numerix.arange(len(vector))
+        self.addAt(vector, ids, ids)
+
+    def _scaled(self, factor):
+        other = self._new()
+        other._contributions = [(factor * vector, id1, id2) for vector, id1, id2 in self._contributions]
+        other._products = [(factor * sign, left, right) for sign, left, right in self._products]
+        return other
+
+    def __iadd__(self, other):
+        if isinstance(other, _OperatorMatrix):
+            self._contributions.extend(other._contributions)
+            self._products.extend(other._products)
+        elif other != 0:
+            raise TypeError
+        return self
+
+    def __add__(self, other):
+        return self.copy().__iadd__(other)
+
+    __radd__ = __add__
+
+    def __isub__(self, other):
+        if isinstance(other, _OperatorMatrix):
+            other = -other
+        return self.__iadd__(other)
+
+    def __sub__(self, other):
+        return self.copy().__isub__(other)
+
+    def __rsub__(self, other):
+        return (-self).__iadd__(other)
+
+    def __neg__(self):
+        return self._scaled(-1)
+
+    def __mul__(self, other):
+        if isinstance(other, _OperatorMatrix):
+            product = self._new()
+            product._products.append((1, self, other))
+            return product
+        elif numerix.shape(other) == ():
+            return self._scaled(other)
+        else:
+            return self._apply(numerix.asarray(other).ravel())
+
+    def __rmul__(self, other):
+        if numerix.shape(other) == ():
+            return self._scaled(other)
+        else:
+            raise TypeError
+
+    def _apply(self, x):
+        rows = self._shape[0]
+        y = numerix.zeros((rows,), 'd')
+        for vector, id1, id2 in self._contributions:
+            y += numerix.bincount(id1, weights=vector * x[id2], minlength=rows)
+        for sign, left, right in self._products:
+            y += sign * (left * (right * x))
+        return y
+
+    def putDiagonal(self, vector):
+        self.addAtDiagonal(vector - self.takeDiagonal())
+
+    def takeDiagonal(self):
+        rows = self._shape[0]
+        diagonal = numerix.zeros((rows,), 'd')
+        for vector, id1, id2 in self._contributions:
+            onDiagonal = id1 == id2
+            diagonal += numerix.bincount(id1[onDiagonal], weights=vector[onDiagonal], minlength=rows)
+        if self._products:
+            raise NotImplementedError
+        return diagonal
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
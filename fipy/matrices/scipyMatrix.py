@@ -50,6 +50,8 @@ __docformat__ = 'restructuredtext'
 
 __all__ = []
 
+import hashlib
+
 import scipy.sparse as sp
 from fipy.tools import numerix
 
@@ -62,6 +64,11 @@ class _ScipyMatrix(_SparseMatrix):
     `_ScipyMatrix` is always NxN.
     Allows basic python operations __add__, __sub__ etc.
     Facilitate matrix populating in an easy way.
+
+    Contributions made with `addAt` are held as COO triplets and only
+    summed into the CSR `matrix` when it is next read, so that the many
+    small additions made while building a system of equations cost a
+    single sparse addition.
     """
 
     def __init__(self, matrix):
@@ -72,6 +79,46 @@ class _ScipyMatrix(_SparseMatrix):
         """
         self.matrix = matrix
 
+    def _setMatrix(self, m):
+        self._matrix = m
+        self._pending = []
+
+    def _getMatrix(self):
+        self._assemble()
+        return self._matrix
+
+    def _delMatrix(self):
+        del self._matrix
+        self._pending = []
+
+    matrix = property(_getMatrix, _setMatrix, _delMatrix)
+
+    def _assemble(self):
+        """Sum any deferred COO contributions into the CSR `matrix`.
+
+            >>> L = _ScipyMatrixFromShape(size=3)
+            >>> L.addAt([1., 2.], [0, 1], [0, 1])
+            >>> L.addAt([3., 4.], [0, 2], [0, 1])
+            >>> len(L._pending)
+            2
+            >>> print L.matrix.nnz
+            3
+            >>> len(L._pending)
+            0
+        """
+        if self._pending:
+            vector, id1, id2 = self._popPending()
+            temp = sp.csr_matrix((vector, (id1, id2)), self._matrix.shape)
+            self._matrix = self._matrix + temp
+
+    def _popPending(self):
+        """Return the deferred contributions as concatenated (`vector`, `id1`, `id2`) arrays
+        and clear them.
+        """
+        pending = self._pending
+        self._pending = []
+        return [numerix.concatenate(a) for a in zip(*pending)]
+
     def getCoupledClass(self):
         return _CoupledScipyMeshMatrix
 
@@ -89,7 +136,13 @@ class _ScipyMatrix(_SparseMatrix):
         return self._iadd(other)
 
     def _iadd(self, other, sign=1):
-        if hasattr(other, "matrix"):
+        if isinstance(other, _ScipyMatrix):
+            if other._matrix.nnz == 0:
+                self._pending.extend([(sign * vector, id1, id2) for vector, id1, id2 in other._pending])
+            else:
+                other = other.matrix.tocoo()
+                self._pending.append((sign * other.data, other.row, other.col))
+        elif hasattr(other, "matrix"):
             self.matrix = self.matrix + (sign * other.matrix)
         elif type(other) in [float, int]:
             fillVec = numerix.repeat(other, self.matrix.nnz)
@@ -265,9 +318,9 @@ class _ScipyMatrix(_SparseMatrix):
         """
         assert(len(id1) == len(id2) == len(vector))
 
-        temp = sp.csr_matrix((vector, (id1, id2)), self.matrix.shape)
-
-        self.matrix = self.matrix + temp
+        self._pending.append((numerix.asarray(vector).ravel(),
+                              numerix.asarray(id1).ravel(),
+                              numerix.asarray(id2).ravel()))
 
     def addAtDiagonal(self, vector):
         if type(vector) in [type(1), type(1.)]:
@@ -326,6 +379,68 @@ class _ScipyMeshMatrix(_ScipyMatrixFromShape):
         assert numberOfEquations == self.numberOfVariables
         _ScipyMatrixFromShape.__init__(self, size=size, matrix=matrix)
 
+    def _assemble(self):
+        """Scatter the deferred contributions into an empty matrix using the
+        sparsity pattern cached on the mesh for these coordinates.
+
+            >>> from fipy import Grid1D
+            >>> from fipy.tools import serialComm
+            >>> mesh = Grid1D(nx=3, communicator=serialComm)
+            >>> for value in (1., 2.):
+            ...     L = _ScipyMeshMatrix(mesh=mesh)
+            ...     L.addAt([value, 3., 0., value], [0, 1, 2, 0], [0, 2, 2, 0])
+            ...     print L
+             2.000000      ---        ---    
+                ---        ---     3.000000  
+                ---        ---        ---    
+             4.000000      ---        ---    
+                ---        ---     3.000000  
+                ---        ---        ---    
+            >>> len(mesh._scipyStencils)
+            1
+
+        Terms with as many coordinates as each other keep stencils of
+        their own, rather than evicting each other
+
+            >>> for i in range(3):
+            ...     for cols in ([0, 1], [1, 2]):
+            ...         L = _ScipyMeshMatrix(mesh=mesh)
+            ...         L.addAt([1., 1.], [0, 1], cols)
+            ...         L = L.matrix
+            >>> print len(mesh._scipyStencils), len(set(id(s) for s in mesh._scipyStencils.values()))
+            3 3
+        """
+        if self._pending and self._matrix.nnz == 0:
+            vector, id1, id2 = self._popPending()
+            self._matrix = self._getStencil(id1, id2).csr(vector)
+        else:
+            _ScipyMatrixFromShape._assemble(self)
+
+    _maxStencils = 16
+
+    def _getStencil(self, id1, id2):
+        """Return the stencil of the coordinates `id1` and `id2`, keyed on a
+        hash of their contents, so that each term of an equation finds its
+        own stencil again on the next sweep.
+        """
+        if not hasattr(self.mesh, '_scipyStencils'):
+            self.mesh._scipyStencils = {}
+        stencils = self.mesh._scipyStencils
+
+        key = hashlib.sha1()
+        for a in (id1, id2):
+            key.update(numerix.ascontiguousarray(a, dtype=int))
+        key = (self._matrix.shape, len(id1), key.hexdigest())
+
+        stencil = stencils.get(key, None)
+        if stencil is None:
+            if len(stencils) >= self._maxStencils:
+                stencils.clear()
+            stencil = _ScipyStencil(id1, id2, shape=self._matrix.shape)
+            stencils[key] = stencil
+
+        return stencil
+
     def __mul__(self, other):
         if isinstance(other, _ScipyMeshMatrix):
             return _ScipyMeshMatrix(mesh=self.mesh,
@@ -397,6 +512,49 @@ class _ScipyMeshMatrix(_ScipyMatrixFromShape):
         """
         pass
 
+class _ScipyStencil(object):
+    """Symbolic CSR structure of a sequence of (`id1`, `id2`) coordinates.
+
+    Holds the `indptr` and `indices` of the summed matrix and the map
+    scattering each coordinate onto its entry in `data`, so that a matrix
+    with the same coordinates and new values can be built without
+    repeating the COO to CSR conversion.
+
+        >>> stencil = _ScipyStencil(numerix.array([1, 0, 1]),
+        ...                         numerix.array([0, 1, 0]), shape=(2, 2))
+        >>> print stencil.csr(numerix.array([1., 2., 3.])).toarray()
+        [[ 0.  2.]
+         [ 4.  0.]]
+    """
+    def __init__(self, id1, id2, shape):
+        self.shape = shape
+
+        order = numerix.lexsort((id2, id1))
+        rows = id1[order]
+        cols = id2[order]
+        unique = numerix.ones(len(order), dtype=bool)
+        unique[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+
+        self.scatter = numerix.empty(len(order), dtype=int)
+        self.scatter[order] = numerix.cumsum(unique) - 1
+        self.nnz = unique.sum()
+
+        indptr = numerix.zeros(shape[0] + 1, dtype=int)
+        indptr[1:] = numerix.cumsum(numerix.bincount(rows[unique], minlength=shape[0]))
+
+        # let scipy choose the index dtype once; the structure is shared
+        # by every matrix built from this stencil, so it must not be
+        # modified in place
+        pattern = sp.csr_matrix((numerix.zeros(self.nnz), cols[unique], indptr), shape=shape)
+        self.indices = pattern.indices
+        self.indptr = pattern.indptr
+        self.indices.flags.writeable = False
+        self.indptr.flags.writeable = False
+
+    def csr(self, vector):
+        data = numerix.bincount(self.scatter, weights=vector, minlength=self.nnz)
+        return sp.csr_matrix((data, self.indices, self.indptr), shape=self.shape)
+
 class _ScipyIdentityMatrix(_ScipyMatrixFromShape):
     """
     Represents a sparse identity matrix for scipy.
@@ -52,13 +52,13 @@ import fipy.tests.testProgram
 from fipy.solvers import solver
 
 if solver == 'trilinos':
-    docTestModuleNames = ('trilinosMatrix', 'pysparseMatrix')
+    docTestModuleNames = ('trilinosMatrix', 'pysparseMatrix', 'operatorMatrix')
 elif solver == 'no-pysparse':
-    docTestModuleNames = ('trilinosMatrix',)
+    docTestModuleNames = ('trilinosMatrix', 'operatorMatrix')
 elif solver == 'scipy' or solver == 'pyamg':
-    docTestModuleNames = ('scipyMatrix',)
+    docTestModuleNames = ('scipyMatrix', 'operatorMatrix')
 elif solver == 'pysparse':
-    docTestModuleNames = ('pysparseMatrix',)
+    docTestModuleNames = ('pysparseMatrix', 'operatorMatrix')
 else:
     raise ImportError, 'Unknown solver package %s' % solver
 
@@ -247,6 +247,9 @@ class AbstractMesh(object):
            True
 
         """
+        ## the geometry of the unconnected faces is changed in place below
+        self._calcGeometry()
+
         ## check for errors
 
         ## check that faces are members of exterior faces
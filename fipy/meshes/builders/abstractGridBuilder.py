@@ -59,7 +59,7 @@ class _AbstractGridBuilder(object):
     NumPtsCalcClass = None
 
     def buildGridData(self, ds, ns, overlap, communicator,
-                            cacheOccupiedNodes=False):
+                            cacheOccupiedNodes=False, decomposition=None):
         """
         Build and save any information relevant to the construction of a grid.
         Generalized to handle any dimension. Has side-effects.
@@ -81,6 +81,9 @@ class _AbstractGridBuilder(object):
             - `ds` - A list containing grid spacing information, e.g. [dx, dy]
             - `ns` - A list containing number of grid points, e.g. [nx, ny, nz]
             - `overlap`
+            - `decomposition` - The number of processes along each axis, e.g.
+              (px, py), or "auto" to choose them. By default, the grid is
+              split along its last axis only.
         """
 
         dim = len(ns)
@@ -109,6 +112,7 @@ class _AbstractGridBuilder(object):
 
         newNs = self._calcNs(ns, newDs)
 
+        globalShape = tuple(newNs)
         globalNumCells = reduce(self._mult, newNs)
         globalNumFaces = self._calcGlobalNumFaces(newNs)
 
@@ -121,28 +125,53 @@ class _AbstractGridBuilder(object):
         procID = communicator.procID
         Nproc = communicator.Nproc
 
-        overlap = min(overlap, newNs[-1])
-        cellsPerNode = max(newNs[-1] // Nproc, overlap)
-        occupiedNodes = min(newNs[-1] // (cellsPerNode or 1), Nproc)
+        procGrid = self._calcProcGrid(decomposition, Nproc, newNs)
 
-        (firstOverlap,
-         secOverlap,
-         overlap) = self._buildOverlap(overlap, procID, occupiedNodes)
+        # the process' position in `procGrid`, with the first axis varying
+        # fastest. Surplus processes fall beyond the end of the last axis.
+        procCoords = []
+        for p in procGrid[:-1]:
+            procCoords.append(procID % p)
+            procID //= p
+        procCoords.append(procID)
 
-        offsetArg = min(procID, occupiedNodes-1) * cellsPerNode - firstOverlap
-        offset = self._packOffset(offsetArg)
+        firstOverlaps = []
+        secOverlaps = []
+        offsetArgs = []
+        occupiedNodes = 1
 
-        """
-        local nx, [ny, [nz]] calculation
-        """
-        local_n = cellsPerNode * (procID < occupiedNodes)
+        for axis, (n, p, c) in enumerate(zip(newNs, procGrid, procCoords)):
+            axisOverlap = min(overlap, n)
+            cellsPerNode = max(n // p, axisOverlap)
+            axisOccupiedNodes = min(n // (cellsPerNode or 1), p)
+            occupiedNodes *= axisOccupiedNodes
+
+            (firstOverlap,
+             secOverlap) = self._buildOverlap(axisOverlap, c, axisOccupiedNodes)
 
-        if procID == occupiedNodes - 1:
-            local_n += (newNs[-1] - cellsPerNode * occupiedNodes)
+            offsetArgs.append(min(c, axisOccupiedNodes-1) * cellsPerNode - firstOverlap)
 
-        local_n += firstOverlap + secOverlap
+            """
+            local nx, [ny, [nz]] calculation
+            """
+            local_n = cellsPerNode * (c < axisOccupiedNodes)
 
-        newNs = tuple(newNs[:-1] + [local_n])
+            if c == axisOccupiedNodes - 1:
+                local_n += (n - cellsPerNode * axisOccupiedNodes)
+
+            local_n += firstOverlap + secOverlap
+
+            newNs[axis] = local_n
+            firstOverlaps.append(firstOverlap)
+            secOverlaps.append(secOverlap)
+
+        if 0 in newNs:
+            firstOverlaps = secOverlaps = [0] * dim
+
+        overlap = self._packOverlap(firstOverlaps, secOverlaps)
+        offset = self._packOffset(offsetArgs)
+
+        newNs = tuple(newNs)
 
         """
         post-parallel
@@ -173,6 +202,7 @@ class _AbstractGridBuilder(object):
 
         self.globalNumberOfCells = globalNumCells
         self.globalNumberOfFaces = globalNumFaces
+        self.globalShape = globalShape
 
         self.offset = offset
         self.overlap = overlap
@@ -199,6 +229,7 @@ class _AbstractGridBuilder(object):
                 self.scale,
                 self.globalNumberOfCells,
                 self.globalNumberOfFaces,
+                self.globalShape,
                 self.overlap,
                 self.offset,
                 self.numberOfVertices,
@@ -282,16 +313,82 @@ class _AbstractGridBuilder(object):
     def _calcNs(self, ns, ds):
         return self.NumPtsCalcClass.calcNs(ns, ds)
 
-    def _buildOverlap(self, overlap, procID, occupiedNodes):
-        (first, sec) = (overlap * (procID > 0) * (procID < occupiedNodes),
-                        overlap * (procID < occupiedNodes - 1))
+    def _calcProcGrid(self, decomposition, Nproc, ns):
+        """
+        Return the number of processes along each axis.
+
+        By default, all processes are stacked along the last axis
+
+        >>> from fipy.meshes.builders.grid2DBuilder import _Grid2DBuilder
+        >>> gb = _Grid2DBuilder()
+        >>> print gb._calcProcGrid(None, 64, [4096, 256])
+        (1, 64)
+        >>> print gb._calcProcGrid((8, 8), 64, [4096, 256])
+        (8, 8)
+        >>> print gb._calcProcGrid((8, 16), 64, [4096, 256])
+        Traceback (most recent call last):
+            ...
+        ValueError: decomposition (8, 16) needs 128 processes, but only 64 are available
+
+        "auto" chooses the grid with the smallest interfaces between
+        processes, without leaving any of them idle
+
+        >>> print gb._calcProcGrid("auto", 64, [4096, 256])
+        (32, 2)
+        >>> print gb._calcProcGrid("auto", 4, [2, 2])
+        (2, 2)
+
+        >>> from fipy.meshes.builders.grid3DBuilder import _Grid3DBuilder
+        >>> gb3 = _Grid3DBuilder()
+        >>> print gb3._calcProcGrid("auto", 8, [10, 10, 10])
+        (2, 2, 2)
+        """
+        dim = len(ns)
+
+        if decomposition is None:
+            return (1,) * (dim - 1) + (Nproc,)
+        elif decomposition == "auto":
+            def factorizations(N, naxes):
+                if naxes == 1:
+                    yield (N,)
+                else:
+                    for p in range(1, N + 1):
+                        if N % p == 0:
+                            for rest in factorizations(N // p, naxes - 1):
+                                yield (p,) + rest
+
+            def cost(procGrid):
+                # cells of the faces between the processes, penalizing
+                # the processes left idle
+                idle = sum([max(p - n, 0) for p, n in zip(procGrid, ns)])
+                interfaces = sum([(p - 1) * reduce(self._mult, ns[:axis] + ns[axis+1:], 1)
+                                  for axis, p in enumerate(procGrid)])
+                return (idle, interfaces)
+
+            return min(factorizations(Nproc, dim), key=cost)
+        else:
+            procGrid = tuple(decomposition)
+            if len(procGrid) != dim:
+                raise ValueError("decomposition %s must have %d entries" % (procGrid, dim))
+            numProcs = reduce(self._mult, procGrid)
+            if numProcs > Nproc:
+                raise ValueError("decomposition %s needs %d processes, but only %d are available"
+                                 % (procGrid, numProcs, Nproc))
+
+            return procGrid
 
-        return first, sec, self._packOverlap(first, sec)
+    def _buildOverlap(self, overlap, procID, occupiedNodes):
+        """
+        Return the overlaps at the start and the end of an axis, where
+        `procID` is the position of this process along that axis.
+        """
+        return (overlap * (procID > 0) * (procID < occupiedNodes),
+                overlap * (procID < occupiedNodes - 1))
 
-    def _packOverlap(self, first, sec):
+    def _packOverlap(self, firsts, secs):
         raise NotImplementedError
 
-    def _packOffset(self, arg):
+    def _packOffset(self, args):
         raise NotImplementedError
 
     def _mult(self, x, y):
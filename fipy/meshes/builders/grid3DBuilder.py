@@ -180,12 +180,13 @@ class _Grid3DBuilder(_AbstractGridBuilder):
         return numerix.ravel(a)
 
 
-    def _packOverlap(self, first, second):
-        return {'left': 0, 'right': 0, 'bottom' : 0, 'top' : 0,
-                'front': first, 'back': second}
+    def _packOverlap(self, firsts, secs):
+        return {'left': firsts[0], 'right': secs[0],
+                'bottom' : firsts[1], 'top' : secs[1],
+                'front': firsts[2], 'back': secs[2]}
 
-    def _packOffset(self, arg):
-        return (0, 0, arg)
+    def _packOffset(self, args):
+        return tuple(args)
 
 class _NonuniformGrid3DBuilder(_Grid3DBuilder):
 
@@ -242,9 +243,10 @@ class _UniformGrid3DBuilder(_Grid3DBuilder):
 
         super(_UniformGrid3DBuilder, self).__init__()
 
-    def buildGridData(self, ds, ns, overlap, communicator, origin):
+    def buildGridData(self, ds, ns, overlap, communicator, origin, decomposition=None):
         super(_UniformGrid3DBuilder, self).buildGridData(ds, ns, overlap,
-                                                        communicator)
+                                                        communicator,
+                                                        decomposition=decomposition)
 
         self.origin = _UniformOrigin.calcOrigin(origin,
                                                 self.offset, self.ds, self.scale)
@@ -97,6 +97,9 @@ class CylindricalNonUniformGrid1D(NonUniformGrid1D):
                                                           *args,
                                                           **kwargs)
 
+        ## the geometry is calculated from the unshifted vertices
+        self._calcGeometry()
+
         self.vertexCoords += origin
         self.args['origin'] = origin
 
@@ -73,6 +73,9 @@ class CylindricalNonUniformGrid2D(NonUniformGrid2D):
         super(CylindricalNonUniformGrid2D, self).__init__(dx=dx, dy=dy, nx=nx, ny=ny, overlap=overlap,
                         communicator=communicator, *args, **kwargs)
 
+        ## the geometry is changed in place below
+        self._calcGeometry()
+
         self._faceAreas *= self.faceCenters[0]
 
         self._scaledFaceAreas = self._scale['area'] * self._faceAreas
@@ -97,7 +100,8 @@ class CylindricalNonUniformGrid2D(NonUniformGrid2D):
         return CylindricalNonUniformGrid2D(dx=self.args['dx'], nx=self.args['nx'],
                                            dy=self.args['dy'], ny=self.args['ny'],
                                            origin=self.args['origin'] + vector,
-                                           overlap=self.args['overlap'])
+                                           overlap=self.args['overlap'],
+                                           decomposition=self.args['decomposition'])
 
     def __mul__(self, factor):
         if numerix.shape(factor) is ():
@@ -106,7 +110,8 @@ class CylindricalNonUniformGrid2D(NonUniformGrid2D):
         return CylindricalNonUniformGrid2D(dx=self.args['dx'] * numerix.array(factor[0]), nx=self.args['nx'],
                                            dy=self.args['dy'] * numerix.array(factor[1]), ny=self.args['ny'],
                                            origin=self.args['origin'] * factor,
-                                           overlap=self.args['overlap'])
+                                           overlap=self.args['overlap'],
+                                           decomposition=self.args['decomposition'])
 
     def _test(self):
         """
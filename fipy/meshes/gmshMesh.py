@@ -49,7 +49,10 @@
 
 __docformat__ = 'restructuredtext'
 
+import hashlib
+import json
 import os
+import re
 from subprocess import Popen, PIPE
 import sys
 import tempfile
@@ -149,11 +152,6 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
     if order > 1:
         communicator = serialComm
 
-    # Enforce gmsh version to be either >= 2 or 2.5, based on Nproc.
-    version = _gmshVersion(communicator=communicator)
-    if version < StrictVersion("2.0"):
-        raise EnvironmentError("Gmsh version must be >= 2.0.")
-
     # If we're being passed a .msh file, leave it be. Otherwise,
     # we've gotta compile a .msh file from either (i) a .geo file,
     # or (ii) a gmsh script passed as a string.
@@ -191,6 +189,11 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
                 geoFile = name
 
         if geoFile is not None:
+            # Enforce gmsh version to be either >= 2 or 2.5, based on Nproc.
+            version = _gmshVersion(communicator=communicator)
+            if version < StrictVersion("2.0"):
+                raise EnvironmentError("Gmsh version must be >= 2.0.")
+
             gmshFlags = ["-%d" % dimensions, "-nopopup"]
 
             if communicator.Nproc > 1:
@@ -209,6 +212,9 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
 
             gmshFlags += ["-format", "msh"]
 
+            if 'b' in mode:
+                gmshFlags += ["-bin"]
+
             if background is not None:
                 if communicator.procID == 0:
                     f, bgmf = tempfile.mkstemp(suffix=".pos")
@@ -269,6 +275,207 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
                    mode=mode,
                    fileIsTemporary=fileIsTemporary)
 
+def _readMode(binary):
+    """The mode in which `Gmsh2D` and `Gmsh3D` open their MSH file
+
+    A 'b' makes Gmsh mesh a geometry into a binary file, so it is only
+    used on request; by default, Gmsh writes ASCII, as it always has.
+
+        >>> print _readMode(False), _readMode(True)
+        r rb
+    """
+    if binary:
+        return 'rb'
+    else:
+        return 'r'
+
+# changed whenever the contents of the `FIPY_GMSH_CACHE` files change
+_gmshCacheFormat = 1
+
+_gmshIncludes = re.compile(r'\b(?:Include|Merge)\s*"([^"]*)"')
+
+def _gmshText(name, directory=None, _seen=None):
+    """The text of the geometry (or MSH file) `name`, followed by the text
+    of every file it `Include`s or `Merge`s, recursively
+
+    File names are resolved as Gmsh does, relative to the directory of the
+    file that names them. Only literal file names are followed, not ones
+    that Gmsh would have to compute.
+
+        >>> import shutil
+        >>> directory = tempfile.mkdtemp()
+        >>> geo = os.path.join(directory, "main.geo")
+        >>> f = open(geo, "w")
+        >>> f.write('cellSize = 0.3;\\nInclude "points.geo";\\n')
+        >>> f.close()
+        >>> text = _gmshText(geo)
+        >>> f = open(os.path.join(directory, "points.geo"), "w")
+        >>> f.write('Point(1) = {0, 0, 0, cellSize};\\n')
+        >>> f.close()
+        >>> print _gmshText(geo) == text
+        False
+        >>> print _gmshText(geo).endswith('Point(1) = {0, 0, 0, cellSize};\\n')
+        True
+        >>> shutil.rmtree(directory)
+    """
+    if _seen is None:
+        _seen = set()
+
+    if os.path.exists(name):
+        f = open(name, 'rb')
+        try:
+            text = f.read()
+        finally:
+            f.close()
+        directory = os.path.dirname(os.path.abspath(name))
+    else:
+        text = name
+        directory = directory or os.getcwd()
+
+    if text.startswith("$MeshFormat"):
+        return text
+
+    texts = [text]
+    for include in _gmshIncludes.findall(text):
+        include = os.path.join(directory, include)
+        if include in _seen:
+            continue
+        _seen.add(include)
+        texts.append("\0%s\0" % include)
+        if os.path.exists(include):
+            texts.append(_gmshText(include, _seen=_seen))
+
+    return "".join(texts)
+
+def _openCachedMSHFile(name, dimensions=None, coordDimensions=None, communicator=parallelComm, order=1, mode='r', background=None):
+    """Open a Gmsh MSH file for reading, or what was read from it before
+
+    If :envvar:`FIPY_GMSH_CACHE` names a directory, the results of
+    `MSHFile.read()` are stored there, keyed by the text of the geometry (or
+    MSH file) and of any files it includes (see `_gmshText()`), the Gmsh
+    version, `order`, `background` and the number of partitions, and a
+    `_CachedMSHFile` loads them the next time, without running Gmsh or
+    deriving the cells and faces again.
+
+    An MSH file is cached the same way, and doesn't need Gmsh at all.
+
+        >>> import shutil
+        >>> os.environ["FIPY_GMSH_CACHE"] = tempfile.mkdtemp()
+        >>> (f, msh) = tempfile.mkstemp(".msh")
+        >>> os.close(f)
+        >>> f = open(msh, "w")
+        >>> f.write(dedent('''
+        ...     $MeshFormat
+        ...     2.2 0 8
+        ...     $EndMeshFormat
+        ...     $Nodes
+        ...     4
+        ...     1 0 0 0
+        ...     2 1 0 0
+        ...     3 1 1 0
+        ...     4 0 1 0
+        ...     $EndNodes
+        ...     $Elements
+        ...     2
+        ...     1 2 2 0 1 1 2 3
+        ...     2 2 2 0 1 1 3 4
+        ...     $EndElements
+        ...     ''').lstrip())
+        >>> f.close()
+        >>> print isinstance(_openCachedMSHFile(msh, dimensions=2, coordDimensions=2,
+        ...                                     communicator=serialComm),
+        ...                  _CachedMSHFile)
+        False
+        >>> mesh0 = Gmsh2D(msh, communicator=serialComm)
+        >>> cached = _openCachedMSHFile(msh, dimensions=2, coordDimensions=2,
+        ...                             communicator=serialComm)
+        >>> print isinstance(cached, _CachedMSHFile)
+        True
+        >>> cached.close()
+        >>> mesh1 = Gmsh2D(msh, communicator=serialComm)
+        >>> print mesh1.numberOfCells, mesh1.numberOfFaces
+        2 5
+        >>> print (nx.allequal(mesh0.vertexCoords, mesh1.vertexCoords)
+        ...        and nx.allequal(mesh0.faceVertexIDs, mesh1.faceVertexIDs)
+        ...        and nx.allequal(mesh0.cellFaceIDs, mesh1.cellFaceIDs))
+        True
+        >>> os.remove(msh)
+        >>> shutil.rmtree(os.environ["FIPY_GMSH_CACHE"])
+        >>> del os.environ["FIPY_GMSH_CACHE"]
+
+    A geometry is meshed by Gmsh the first time.
+
+        >>> import shutil
+        >>> os.environ["FIPY_GMSH_CACHE"] = tempfile.mkdtemp()
+        >>> geo = '''
+        ... cellSize = 0.3;
+        ... Point(1) = {0, 0, 0, cellSize};
+        ... Point(2) = {1, 0, 0, cellSize};
+        ... Point(3) = {1, 1, 0, cellSize};
+        ... Point(4) = {0, 1, 0, cellSize};
+        ... Line(5) = {1, 2};
+        ... Line(6) = {2, 3};
+        ... Line(7) = {3, 4};
+        ... Line(8) = {4, 1};
+        ... Line Loop(9) = {5, 6, 7, 8};
+        ... Plane Surface(10) = {9};
+        ... Physical Line("bottom") = {5};
+        ... Physical Surface("square") = {10};
+        ... '''
+        >>> mesh0 = Gmsh2D(geo) # doctest: +GMSH
+        >>> print isinstance(_openCachedMSHFile(geo, dimensions=2, coordDimensions=2),
+        ...                  _CachedMSHFile) # doctest: +GMSH
+        True
+        >>> mesh1 = Gmsh2D(geo) # doctest: +GMSH
+        >>> print (nx.allequal(mesh0.vertexCoords, mesh1.vertexCoords)
+        ...        and nx.allequal(mesh0.faceVertexIDs, mesh1.faceVertexIDs)
+        ...        and nx.allequal(mesh0.cellFaceIDs, mesh1.cellFaceIDs)
+        ...        and nx.allequal(mesh0._orderedCellVertexIDs, mesh1._orderedCellVertexIDs)
+        ...        and nx.allequal(mesh0.physicalFaces["bottom"], mesh1.physicalFaces["bottom"])
+        ...        and nx.allequal(mesh0.physicalCells["square"], mesh1.physicalCells["square"])) # doctest: +GMSH
+        True
+        >>> shutil.rmtree(os.environ["FIPY_GMSH_CACHE"])
+        >>> del os.environ["FIPY_GMSH_CACHE"]
+    """
+    directory = os.environ.get('FIPY_GMSH_CACHE')
+    if not directory:
+        return openMSHFile(name, dimensions=dimensions, coordDimensions=coordDimensions,
+                           communicator=communicator, order=order, mode=mode,
+                           background=background)
+
+    if order > 1:
+        # as for `openMSHFile()`
+        communicator = serialComm
+
+    text = _gmshText(name)
+
+    key = hashlib.sha1(repr((_gmshCacheFormat,
+                             str(_gmshVersion(communicator=communicator)),
+                             dimensions, coordDimensions, order,
+                             communicator.Nproc)))
+    key.update(text)
+    if background is not None:
+        key.update(nx.ascontiguousarray(background.mesh.cellCenters.globalValue).tostring())
+        key.update(nx.ascontiguousarray(background.globalValue).tostring())
+
+    filename = os.path.join(directory, key.hexdigest(), "%d.npz" % communicator.procID)
+
+    try:
+        mshFile = _CachedMSHFile(filename)
+    except (IOError, OSError, KeyError, ValueError):
+        mshFile = None
+
+    # every partition must agree whether to run Gmsh
+    if communicator.all(nx.array(mshFile is not None)):
+        return mshFile
+
+    mshFile = openMSHFile(name, dimensions=dimensions, coordDimensions=coordDimensions,
+                          communicator=communicator, order=order, mode=mode,
+                          background=background)
+    mshFile._cacheFilename = filename
+
+    return mshFile
+
 def openPOSFile(name, communicator=parallelComm, mode='w'):
     """Open a Gmsh POS post-processing file
     """
@@ -505,8 +712,21 @@ class MSHFile(GmshFile):
     Does not support gmsh versions < 2. If partitioning, gmsh
     version must be >= 2.5.
 
+    Both the ASCII and the binary (file-type 1) variants of the MSH 2.2
+    format can be read. A file opened for writing with a 'b' in its mode
+    is written in binary.
+
     TODO: Refactor face extraction functions.
     """
+
+    # number of nodes of each Gmsh element type
+    _numNodesPerElementType = {1: 2, 2: 3, 3: 4, 4: 4, 5: 8, 6: 6, 7: 5,
+                               8: 3, 9: 6, 10: 9, 11: 10, 12: 27, 13: 18, 14: 14,
+                               15: 1, 16: 8, 17: 20, 18: 15, 19: 13,
+                               20: 9, 21: 10, 22: 12, 23: 15, 24: 15, 25: 21,
+                               26: 4, 27: 5, 28: 6, 29: 20, 30: 35, 31: 56,
+                               92: 64, 93: 125}
+
     def __init__(self, filename,
                        dimensions,
                        coordDimensions=None,
@@ -530,9 +750,11 @@ class MSHFile(GmshFile):
         self.dimensions = dimensions
         self.coordDimensions = coordDimensions
         self.gmshOutput = gmshOutput
+        self._cacheFilename = None
 
         self.mesh = None
         self.meshWritten = False
+        self.binary = 'b' in mode
 
         GmshFile.__init__(self, filename=filename, communicator=communicator, mode=mode, fileIsTemporary=fileIsTemporary)
 
@@ -540,36 +762,124 @@ class MSHFile(GmshFile):
         """
         Extracts gmshVersion, file-type, and data-size in that
         order.
+
+        For binary files, also determines the byte order of the data from
+        the integer 1 that follows.
         """
         self._seekForHeader("MeshFormat")
-        metaData = self.fileobj.readline().split()
+        metaData = [float(x) for x in self.fileobj.readline().split()]
+
+        self._intType = nx.dtype(nx.int32)
+        self._doubleType = nx.dtype(nx.float64)
+        if metaData[1] == 1:
+            if metaData[2] != self._doubleType.itemsize:
+                raise SyntaxError("Binary MSH files must have a data-size of %d, not %d" % (self._doubleType.itemsize, metaData[2]))
+            one = nx.frombuffer(self.fileobj.read(self._intType.itemsize), dtype=self._intType)[0]
+            if one != 1:
+                self._intType = self._intType.newbyteorder()
+                self._doubleType = self._doubleType.newbyteorder()
+
         self.fileobj.seek(0)
-        return [float(x) for x in metaData]
+        return metaData
 
     def _isolateData(self, title):
         """
-        Gets all data between $[title] and $End[title], writes
-        it out to its own file.
+        Positions `self.fileobj` at the data between $[title] and
+        $End[title] and returns the number of entries the section
+        declares on its first line.
         """
-        newF, newPath = tempfile.mkstemp(title, text=True)
-        newF = os.fdopen(newF, 'w')
-        try:
-            self._seekForHeader(title)
-        except Exception, e:
-            newF.close()
-            os.unlink(newPath)
-            raise
+        self.fileobj.seek(0)
+        self._seekForHeader(title)
+        return int(self.fileobj.readline())
 
-        # extract the actual data within section
-        while True:
-            line = self.fileobj.readline()
-            if ("$End%s" % title) not in line:
-                newF.write(line)
-            else: break
+    def _readDataBlocks(self, numLines, linesPerBlock=100000):
+        """
+        Reads the next `numLines` lines of `self.fileobj` as a sequence of
+        strings of at most `linesPerBlock` lines each, so that sections can
+        be converted in bulk without holding all of their text at once.
+        """
+        readline = self.fileobj.readline
+        while numLines > 0:
+            n = min(numLines, linesPerBlock)
+            yield "".join([readline() for i in range(n)])
+            numLines -= n
 
-        self.fileobj.seek(0)
-        newF.close()
-        return newPath
+    def _readBinary(self, dtype, count):
+        """
+        Returns the next `count` items of `dtype` from `self.fileobj`.
+        """
+        dtype = nx.dtype(dtype)
+        return nx.frombuffer(self.fileobj.read(count * dtype.itemsize), dtype=dtype, count=count)
+
+    def _parseNodes(self):
+        """
+        Returns the Gmsh IDs of all nodes and their (3, numNodes) coordinates.
+        """
+        numNodes = self._isolateData("Nodes")
+        if self.fileType == 1:
+            # each node is an int followed by three doubles
+            nodes = self._readBinary(dtype=[("id", self._intType),
+                                            ("coords", self._doubleType, (3,))],
+                                     count=numNodes)
+            return nodes["id"].astype(nx.INT_DTYPE), nodes["coords"].swapaxes(0, 1)
+
+        blocks = [nx.fromstring(block, sep=" ") for block in self._readDataBlocks(numNodes)]
+        nodes = nx.concatenate([nx.empty((0,))] + blocks).reshape((-1, 4))
+
+        return nodes[..., 0].astype(nx.INT_DTYPE), nodes[..., 1:].swapaxes(0, 1)
+
+    def _parseElements(self):
+        """
+        Returns the integers of the $Elements section as one flat array,
+        along with the offset and the length of each element's record in it.
+
+        Records are returned in the ASCII layout,
+        `id type numTags tags... nodes...`, regardless of the file-type.
+        """
+        numElements = self._isolateData("Elements")
+        values = [nx.empty((0,), dtype=nx.INT_DTYPE)]
+        lengths = [nx.empty((0,), dtype=nx.INT_DTYPE)]
+
+        if self.fileType == 1:
+            # binary elements come in blocks of the same type, each led by
+            # an `elm-type num-elm-follow num-tags` header
+            while numElements > 0:
+                elType, numFollow, numTags = self._readBinary(dtype=self._intType, count=3)
+                if elType not in self._numNodesPerElementType:
+                    raise SyntaxError("Unknown Gmsh element type %d" % elType)
+                width = 1 + numTags + self._numNodesPerElementType[elType]
+                block = self._readBinary(dtype=self._intType,
+                                         count=numFollow * width).reshape((numFollow, width))
+
+                records = nx.empty((numFollow, width + 2), dtype=nx.INT_DTYPE)
+                records[..., 0] = block[..., 0]
+                records[..., 1] = elType
+                records[..., 2] = numTags
+                records[..., 3:] = block[..., 1:]
+
+                values.append(records.ravel())
+                lengths.append(nx.zeros((numFollow,), dtype=nx.INT_DTYPE) + width + 2)
+                numElements -= numFollow
+
+        for block in self._readDataBlocks(numElements):
+            values.append(nx.fromstring(block, dtype=nx.INT_DTYPE, sep=" "))
+
+            # records have different lengths, so count the numbers that
+            # start on each line: a number starts wherever a character
+            # beyond the space follows whitespace
+            chars = nx.frombuffer(block, dtype=nx.uint8)
+            isDigit = chars > ord(" ")
+            starts = isDigit.copy()
+            starts[1:] &= ~isDigit[:-1]
+            line = nx.cumsum(chars == ord("\n"))
+            numLines = block.count("\n") + (not block.endswith("\n"))
+            lengths.append(nx.bincount(line[starts], minlength=numLines))
+
+        values = nx.concatenate(values).astype(nx.INT_DTYPE)
+        lengths = nx.concatenate(lengths).astype(nx.INT_DTYPE)
+        offsets = nx.cumsum(lengths) - lengths
+
+        return values, offsets, lengths
 
     def _seekForHeader(self, title):
         """
@@ -590,117 +900,170 @@ class MSHFile(GmshFile):
         """
         Uses element information obtained from `_parseElementFile` to deliver
         `facesToVertices` and `cellsToFaces`.
+
+        The candidate faces of all cells of a given shape are extracted
+        at once and duplicates are eliminated by sorting the vertices of
+        each face. Faces are numbered in the order they are first
+        encountered, e.g., for two triangles that share an edge and a
+        quadrangle
+
+            >>> import tempfile
+            >>> f = MSHFile(filename=tempfile.TemporaryFile(), dimensions=2)
+            >>> f.numFacesPerCell = {2: 3, 3: 4}
+            >>> facesToV, cellsToF, faceKeys = f._deriveCellsAndFaces(
+            ...     cellsToVertIDs=nx.array([[0, 1, 2, -1],
+            ...                              [2, 1, 3, -1],
+            ...                              [1, 4, 5, 3]]),
+            ...     shapeTypes=nx.array([2, 2, 3]),
+            ...     numCells=3)
+            >>> print facesToV
+            [[1 2 0 3 2 4 5 3]
+             [0 1 2 1 3 1 4 5]]
+            >>> print cellsToF
+            [[ 0  1  5]
+             [ 1  3  6]
+             [ 2  4  7]
+             [-1 -1  3]]
+
+        `faceKeys` pairs the sorted vertices of each distinct face with its
+        face ID, for `_matchFaces` to look up the faces Gmsh has tagged.
         """
+        cellsToVertIDs = nx.asarray(cellsToVertIDs, dtype=nx.INT_DTYPE)
+        shapeTypes = nx.asarray(shapeTypes)
 
         allShapes  = nx.unique(shapeTypes).tolist()
         maxFaces   = max([self.numFacesPerCell[x] for x in allShapes])
 
+        # move any padding of each cell to its end
+        isPadding = (cellsToVertIDs < 0)
+        numVertices = (~isPadding).sum(axis=-1)
+        order = nx.argsort(isPadding, axis=-1, kind='mergesort')
+        cellsToVertIDs = cellsToVertIDs[nx.arange(numCells)[..., nx.newaxis], order]
+
+        # gather the candidate faces of each group of like cells
+        cellIDs = []
+        faceIDs = []
+        faces = []
+        for shapeType in allShapes:
+            ofShape = (shapeTypes == shapeType)
+            for numVerts in nx.unique(numVertices[ofShape]):
+                IDs = nx.nonzero(ofShape & (numVertices == numVerts))[0]
+                template = self._faceTemplate(shapeType, numVerts)
+                facesPerCell, faceLength = template.shape
+                groupFaces = cellsToVertIDs[IDs][..., template]
+                groupFaces = nx.where(template > -1, groupFaces, -1)
+                cellIDs.append(nx.repeat(IDs, facesPerCell))
+                faceIDs.append(nx.tile(nx.arange(facesPerCell), len(IDs)))
+                faces.append(groupFaces.reshape((-1, faceLength)))
+
+        # pad short faces with -1
+        maxFaceLen = max([f.shape[-1] for f in faces])
+        faces = [nx.concatenate((-nx.ones((len(f), maxFaceLen - f.shape[-1]), dtype=nx.INT_DTYPE),
+                                 f), axis=-1) for f in faces]
+
+        # restore the order of the cells
+        cellIDs = nx.concatenate(cellIDs)
+        faceIDs = nx.concatenate(faceIDs)
+        order = nx.lexsort((faceIDs, cellIDs))
+        cellIDs = cellIDs[order]
+        faceIDs = faceIDs[order]
+        faces = nx.concatenate(faces)[order]
+
+        # NB: the vertices of each face are sorted to spot duplicates
+        keys, first, inverse = nx.unique(self._faceKeys(faces),
+                                         return_index=True,
+                                         return_inverse=True)
+        firstOrder = nx.argsort(first)
+        faceNumbers = nx.empty(len(first), dtype='l')
+        faceNumbers[firstOrder] = nx.arange(len(first))
+
         # `cellsToFaces` must be padded with -1; see mesh.py
-        currNumFaces = 0
         cellsToFaces = nx.ones((numCells, maxFaces), 'l') * -1
-        facesDict    = {}
-        uniqueFaces  = []
-
-        # we now build `cellsToFaces` and `uniqueFaces`,
-        # the latter will result in `facesToVertices`.
-        for cellIdx in range(numCells):
-            shapeType = shapeTypes[cellIdx]
-            cell = cellsToVertIDs[cellIdx]
-
-            if shapeType in [5, 12, 17]: # hexahedron
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3], # ordering of vertices gleaned from
-                                                                 [4, 5, 6, 7], # a one-cube Grid3D example
-                                                                 [0, 1, 5, 4],
-                                                                 [3, 2, 6, 7],
-                                                                 [0, 3, 7, 4],
-                                                                 [1, 2, 6, 5]])
-            elif shapeType in [6, 13, 18]: # prism
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2],
-                                                                 [5, 4, 3],
-                                                                 [3, 4, 1, 0],
-                                                                 [4, 5, 2, 1],
-                                                                 [5, 3, 0, 2]])
-            elif shapeType in [7, 14, 19]: # pyramid
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3],
-                                                                 [0, 1, 4],
-                                                                 [1, 2, 4],
-                                                                 [2, 3, 4],
-                                                                 [3, 0, 4]])
-            else:
-                if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
-                    faceLength = 2 # triangle
-                elif shapeType in [3, 10, 16]:
-                    faceLength = 2 # quadrangle
-                elif shapeType in [4, 11, 29, 30, 31]:
-                    faceLength = 3 # tetrahedron
-
-                faces = self._extractRegularFaces(cell=cell,
-                                                  faceLength=faceLength,
-                                                  facesPerCell=self.numFacesPerCell[shapeType])
-
-            for faceIdx in range(len(faces)):
-                # NB: currFace is sorted for the key to spot duplicates
-                currFace = faces[faceIdx]
-                keyStr   = ' '.join([str(x) for x in sorted(currFace)])
-
-                if keyStr in facesDict:
-                    cellsToFaces[cellIdx][faceIdx] = facesDict[keyStr]
-                else: # new face
-                    facesDict[keyStr] = currNumFaces
-                    cellsToFaces[cellIdx][faceIdx] = currNumFaces
-                    uniqueFaces.append(currFace)
-                    currNumFaces += 1
+        cellsToFaces[cellIDs, faceIDs] = faceNumbers[inverse]
 
-        # pad short faces with -1
-        maxFaceLen = max([len(f) for f in uniqueFaces])
-        uniqueFaces = [[-1] * (maxFaceLen - len(f)) + f for f in uniqueFaces]
+        facesToVertices = faces[first[firstOrder]]
 
-        facesToVertices = nx.array(uniqueFaces, dtype=nx.INT_DTYPE)
+        return facesToVertices.swapaxes(0,1)[::-1], cellsToFaces.swapaxes(0,1).copy('C'), (keys, faceNumbers)
 
-        return facesToVertices.swapaxes(0,1)[::-1], cellsToFaces.swapaxes(0,1).copy('C'), facesDict
+    def _faceKeys(self, faces):
+        """Return a sortable key of the sorted vertices of each of `faces`
+        """
+        faces = nx.ascontiguousarray(nx.sort(faces, axis=-1))
+        return faces.view(nx.dtype((nx.void, faces.dtype.itemsize * faces.shape[-1]))).ravel()
 
-    def _translateNodesToVertices(self, entitiesNodes, vertexMap):
-        """Translates entitiesNodes from Gmsh node IDs to `vertexCoords` indices.
+    def _matchFaces(self, faces, faceKeys):
+        """Return the IDs of the faces found by `_deriveCellsAndFaces` that
+        have the same vertices as each of `faces`, or -1 if none does.
+        """
+        keys, faceNumbers = faceKeys
+        maxFaceLen = keys.dtype.itemsize // nx.dtype(nx.INT_DTYPE).itemsize
+
+        faces = nx.sort(nx.asarray(faces, dtype=nx.INT_DTYPE), axis=-1)
+        matchable = ((faces > -1).sum(axis=-1) <= maxFaceLen)
+        if faces.shape[-1] < maxFaceLen:
+            faces = nx.concatenate((-nx.ones((len(faces), maxFaceLen - faces.shape[-1]), dtype=nx.INT_DTYPE),
+                                    faces), axis=-1)
+        faces = faces[..., faces.shape[-1] - maxFaceLen:]
+
+        faces = self._faceKeys(faces)
+        index = nx.searchsorted(keys, faces).clip(max=max(len(keys) - 1, 0))
+        matched = matchable & (keys[index] == faces)
+
+        return nx.where(matched, faceNumbers[index], -1)
+
+    def _faceTemplate(self, shapeType, numVertices):
+        """Return the local IDs of the vertices of the faces of a cell of
+        `shapeType` with `numVertices` vertices, with short faces padded
+        with -1.
         """
-        entitiesVertices = []
+        if shapeType in [5, 12, 17]: # hexahedron
+            faces = [[0, 1, 2, 3], # ordering of vertices gleaned from
+                     [4, 5, 6, 7], # a one-cube Grid3D example
+                     [0, 1, 5, 4],
+                     [3, 2, 6, 7],
+                     [0, 3, 7, 4],
+                     [1, 2, 6, 5]]
+        elif shapeType in [6, 13, 18]: # prism
+            faces = [[0, 1, 2],
+                     [5, 4, 3],
+                     [3, 4, 1, 0],
+                     [4, 5, 2, 1],
+                     [5, 3, 0, 2]]
+        elif shapeType in [7, 14, 19]: # pyramid
+            faces = [[0, 1, 2, 3],
+                     [0, 1, 4],
+                     [1, 2, 4],
+                     [2, 3, 4],
+                     [3, 0, 4]]
+        else:
+            if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
+                faceLength = 2 # triangle
+            elif shapeType in [3, 10, 16]:
+                faceLength = 2 # quadrangle
+            elif shapeType in [4, 11, 29, 30, 31]:
+                faceLength = 3 # tetrahedron
 
-        for entity in entitiesNodes:
-            try:
-                vertIndices = vertexMap[nx.array(entity)]
-            except IndexError:
-                vertIndices = nx.ones((len(entity),), 'l') * -1
-            entitiesVertices.append(vertIndices)
+            # faces of a regular poly(gon|hedron); we may wrap
+            faces = [[(i + j) % numVertices for j in range(faceLength)]
+                     for i in range(self.numFacesPerCell[shapeType])]
 
-        return entitiesVertices
+        maxFaceLen = max([len(f) for f in faces])
 
-    def _extractRegularFaces(self, cell, faceLength, facesPerCell):
-        """Return faces for a regular poly(gon|hedron)
+        return nx.array([[-1] * (maxFaceLen - len(f)) + f for f in faces])
 
-        Given `cell`, defined by node IDs, returns an array of
-        `facesPerCell` faces of length `faceLength` in terms of nodes.
-        """
-        faces = []
-        for i in range(facesPerCell):
-            aFace = []
-            for j in range(faceLength):
-                aVertex = (i + j) % len(cell) # we may wrap
-                aFace.append(int(cell[aVertex]))
-            faces.append(aFace)
-        return faces
-
-    def _extractOrderedFaces(self, cell, faceOrderings):
-        """Return faces for a 8-node hexahedron cell.
+    def _translateNodesToVertices(self, entitiesNodes, vertexMap):
+        """Translates entitiesNodes from Gmsh node IDs to `vertexCoords` indices.
+
+        Padding is preserved as -1. An entity with nodes beyond those of
+        any cell is translated to -1 entirely.
         """
-        def orderingToFace(vertList):
-            aFace = []
-            for i in vertList:
-                aFace.append(int(cell[i]))
-            return aFace
+        isNode = (entitiesNodes > -1) & (entitiesNodes < len(vertexMap))
+        entitiesVertices = nx.where(isNode, vertexMap[nx.where(isNode, entitiesNodes, 0)], -1)
+
+        outside = (entitiesNodes >= len(vertexMap)).any(axis=-1)
+        entitiesVertices[outside] = -1
 
-        return [orderingToFace(o) for o in faceOrderings]
+        return entitiesVertices
 
     def read(self):
         """
@@ -711,165 +1074,185 @@ class MSHFile(GmshFile):
         3. Build faces
         4. Build cellsToFaces
 
-        Isolate relevant data into three files, store in
-        `self.nodesPath` for $Nodes,
-        `self.elemsPath` for $Elements.
-        `self.namesFile` for $PhysicalNames.
+        The $Nodes and $Elements sections are each converted to arrays
+        in bulk, from either ASCII or binary files.
 
         Returns vertexCoords, facesToVertexID, cellsToFaceID,
                 cellGlobalIDMap, ghostCellGlobalIDMap.
         """
         self.version, self.fileType, self.dataSize = self._getMetaData()
-        self.nodesPath = self._isolateData("Nodes")
-        self.elemsPath = self._isolateData("Elements")
-        try:
-            self.namesPath = self._isolateData("PhysicalNames")
-        except EOFError, e:
-            self.namesPath = None
 
-        try:
-            if self.dimensions is None:
-                nodesFile = open(self.nodesPath, 'r')
-                nodesFile.readline() # skip number of nodes
+        nodeIDs, nodeCoords = self._parseNodes()
 
-                # We assume we have a 2D file unless we find a node
-                # with a non-zero Z coordinate
+        if self.dimensions is None:
+            # We assume we have a 2D file unless we find a node
+            # with a non-zero Z coordinate
+            if (nodeCoords[2] != 0.).any():
+                self.dimensions = 3
+            else:
                 self.dimensions = 2
-                for node in nodesFile:
-                    line   = node.split()
 
-                    newVert = [float(x) for x in line]
+        self.coordDimensions = self.coordDimensions or self.dimensions
+
+        # we need a conditional here so we don't pick up 2D shapes in 3D
+        if self.dimensions == 2:
+            self.numVertsPerFace = {1: 2, # 2-node line
+                                    8: 2} # 3-node line
+            self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 faces)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+        elif self.dimensions == 3:
+            self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 vertices)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+            self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
+                                    11: 4, # 10-node tetrahedron (we only read 1st 4)
+                                    29: 4, # 20-node tetrahedron (we only read 1st 4)
+                                    30: 4, # 35-node tetrahedron (we only read 1st 4)
+                                    31: 4, # 56-node tetrahedron (we only read 1st 4)
+                                     5: 6, # 8-node hexahedron (6 faces)
+                                    12: 6, # 27-node tetrahedron (we only read 1st 6)
+                                    17: 6, # 20-node tetrahedron (we only read 1st 6)
+                                     6: 5, # 6-node prism (5 faces)
+                                    13: 5, # 18-node prism (we only read 1st 6)
+                                    18: 5, # 15-node prism (we only read 1st 6)
+                                     7: 5, # 5-node pyramid (5 faces)
+                                    14: 5, # 14-node pyramid (we only read 1st 5)
+                                    19: 5} # 13-node pyramid (we only read 1st 5)
+        else:
+            raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
+
+        parprint("Parsing elements.")
+        (cellsData,
+         ghostsData,
+         facesData) = self._parseElementFile()
+
+        cellsToGmshVerts = nx.concatenate((cellsData.nodes, ghostsData.nodes))
+        numCellsTotal    = len(cellsToGmshVerts)
+        allShapeTypes    = nx.concatenate((cellsData.shapes, ghostsData.shapes))
+        self.physicalCellMap = nx.concatenate((cellsData.physicalEntities,
+                                               ghostsData.physicalEntities))
+        self.geometricalCellMap = nx.concatenate((cellsData.geometricalEntities,
+                                                  ghostsData.geometricalEntities))
+
+        if numCellsTotal < 1:
+            errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
+            errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
+            raise GmshException(errStr)
+
+        parprint("Recovering coords.")
+        parprint("numcells %d" % numCellsTotal)
+        vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts,
+                                                             nodeIDs, nodeCoords)
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
+                                                        vertIDtoIdx)
+
+        parprint("Building cells and faces.")
+        (facesToV,
+         cellsToF,
+         faceKeys) = self._deriveCellsAndFaces(cellsToVertIDs,
+                                                allShapeTypes,
+                                                numCellsTotal)
+
+        # cell entities were easy to record on parsing
+        # but we don't use Gmsh faces, so we need to correlate the nodes
+        # that make up the Gmsh faces with the vertex IDs of the FiPy faces
+        # so that we can check if any are named
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
+                                                        vertIDtoIdx)
+
+        # not all faces are necessarily tagged
+        faceIDs = self._matchFaces(facesToVertIDs, faceKeys)
+        tagged = (faceIDs > -1)
+
+        self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.physicalFaceMap[faceIDs[tagged]] = facesData.physicalEntities[tagged]
+        self.geometricalFaceMap[faceIDs[tagged]] = facesData.geometricalEntities[tagged]
+
+        self.physicalNames = self._parseNamesFile()
+
+        # convert padded cell vertices to a properly oriented masked array
+        cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs, value=-1).swapaxes(0,1)
 
-                    if newVert[2] != 0.0:
-                        self.dimensions = 3
-                        break
+        parprint("Done with cells and faces.")
+        results = (vertexCoords, facesToV, cellsToF,
+                   cellsData.idmap.tolist(), ghostsData.idmap.tolist(),
+                   cellsToVertIDs)
 
-                nodesFile.close()
-
-            self.coordDimensions = self.coordDimensions or self.dimensions
-
-            # we need a conditional here so we don't pick up 2D shapes in 3D
-            if self.dimensions == 2:
-                self.numVertsPerFace = {1: 2, # 2-node line
-                                        8: 2} # 3-node line
-                self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 faces)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-            elif self.dimensions == 3:
-                self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 vertices)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-                self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
-                                        11: 4, # 10-node tetrahedron (we only read 1st 4)
-                                        29: 4, # 20-node tetrahedron (we only read 1st 4)
-                                        30: 4, # 35-node tetrahedron (we only read 1st 4)
-                                        31: 4, # 56-node tetrahedron (we only read 1st 4)
-                                         5: 6, # 8-node hexahedron (6 faces)
-                                        12: 6, # 27-node tetrahedron (we only read 1st 6)
-                                        17: 6, # 20-node tetrahedron (we only read 1st 6)
-                                         6: 5, # 6-node prism (5 faces)
-                                        13: 5, # 18-node prism (we only read 1st 6)
-                                        18: 5, # 15-node prism (we only read 1st 6)
-                                         7: 5, # 5-node pyramid (5 faces)
-                                        14: 5, # 14-node pyramid (we only read 1st 5)
-                                        19: 5} # 13-node pyramid (we only read 1st 5)
-            else:
-                raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
-
-            parprint("Parsing elements.")
-            (cellsData,
-             ghostsData,
-             facesData) = self._parseElementFile()
-
-            cellsToGmshVerts = cellsData.nodes + ghostsData.nodes
-            numCellsTotal    = len(cellsData.nodes) + len(ghostsData.nodes)
-            allShapeTypes    = cellsData.shapes + ghostsData.shapes
-            allShapeTypes    = nx.array(allShapeTypes)
-            allShapeTypes    = nx.delete(allShapeTypes, nx.s_[numCellsTotal:])
-            self.physicalCellMap = nx.array(cellsData.physicalEntities
-                                            + ghostsData.physicalEntities)
-            self.geometricalCellMap = nx.array(cellsData.geometricalEntities
-                                               + ghostsData.geometricalEntities)
-
-            if numCellsTotal < 1:
-                errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
-                errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
-                raise GmshException(errStr)
-
-            parprint("Recovering coords.")
-            parprint("numcells %d" % numCellsTotal)
-            vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts)
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
-                                                            vertIDtoIdx)
-
-            parprint("Building cells and faces.")
-            (facesToV,
-             cellsToF,
-             facesDict) = self._deriveCellsAndFaces(cellsToVertIDs,
-                                                    allShapeTypes,
-                                                    numCellsTotal)
-
-            # cell entities were easy to record on parsing
-            # but we don't use Gmsh faces, so we need to correlate the nodes
-            # that make up the Gmsh faces with the vertex IDs of the FiPy faces
-            # so that we can check if any are named
-            faceEntitiesDict = dict()
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
-                                                            vertIDtoIdx)
-
-            for face, physicalEntity, geometricalEntity in zip(facesToVertIDs,
-                                                               facesData.physicalEntities,
-                                                               facesData.geometricalEntities):
-                faceEntitiesDict[' '.join([str(x) for x in sorted(face)])] = (physicalEntity, geometricalEntity)
-
-            self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            for face in facesDict.keys():
-                # not all faces are necessarily tagged
-                if face in faceEntitiesDict:
-                    self.physicalFaceMap[facesDict[face]] = faceEntitiesDict[face][0]
-                    self.geometricalFaceMap[facesDict[face]] = faceEntitiesDict[face][1]
-
-            self.physicalNames = self._parseNamesFile()
+        if self._cacheFilename is not None:
+            self._storeCache(results)
 
-        finally:
-            os.unlink(self.nodesPath)
-            os.unlink(self.elemsPath)
-            if self.namesPath is not None:
-                os.unlink(self.namesPath)
-
-        # convert lists of cell vertices to a properly oriented masked array
-        maxVerts = max([len(v) for v in cellsToVertIDs])
-        # ticket:539 - NumPy 1.7 casts to array before concatenation and empty array defaults to float
-        cellsToVertIDs = [nx.concatenate((v, nx.array([-1] * (maxVerts-len(v)), dtype=nx.INT_DTYPE))) for v in cellsToVertIDs]
-        cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs, value=-1).swapaxes(0,1)
+        return results
 
-        parprint("Done with cells and faces.")
-        return (vertexCoords, facesToV, cellsToF,
-                cellsData.idmap, ghostsData.idmap,
-                cellsToVertIDs)
+    def _storeCache(self, results):
+        """Store the results of `read()` for a `_CachedMSHFile`"""
+        (vertexCoords, facesToV, cellsToF,
+         cellGlobalIDs, gCellGlobalIDs, cellsToVertIDs) = results
 
-    def write(self, obj, time=0.0, timeindex=0):
+        dirname = os.path.dirname(self._cacheFilename)
+        try:
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            # write to a scratch file and rename it, so that concurrent
+            # processes never see a partially written cache
+            fd, scratch = tempfile.mkstemp(dir=dirname)
+            f = os.fdopen(fd, 'wb')
+            try:
+                nx.savez(f,
+                         vertexCoords=vertexCoords,
+                         facesToV=facesToV,
+                         cellsToF=cellsToF,
+                         cellGlobalIDs=nx.array(cellGlobalIDs, dtype=nx.INT_DTYPE),
+                         gCellGlobalIDs=nx.array(gCellGlobalIDs, dtype=nx.INT_DTYPE),
+                         cellsToVertIDs=nx.MA.filled(cellsToVertIDs, -1),
+                         physicalCellMap=self.physicalCellMap,
+                         geometricalCellMap=self.geometricalCellMap,
+                         physicalFaceMap=self.physicalFaceMap,
+                         geometricalFaceMap=self.geometricalFaceMap,
+                         physicalNames=json.dumps(self.physicalNames),
+                         dimensions=self.dimensions,
+                         coordDimensions=self.coordDimensions)
+            finally:
+                f.close()
+            os.rename(scratch, self._cacheFilename)
+        except (IOError, OSError):
+            # the cache is an optimization; an unwritable
+            # directory just means running Gmsh next time
+            pass
+
+    def write(self, obj, time=0.0, timeindex=0, nodal=False):
+        """
+        Write a `Mesh` or a `CellVariable` (and its `Mesh`) to the file.
+
+        :Parameters:
+          - `obj`: the `Mesh` or `CellVariable` to write
+          - `time`: the time associated with the values of a `CellVariable`
+          - `timeindex`: the index of the time step of a `CellVariable`
+          - `nodal`: if `True`, write the values of a `CellVariable` to
+            each node of its cells as $ElementNodeData, rather than as
+            $ElementData
+        """
         if not self.formatWritten:
             self._writeMeshFormat()
             self.formatWritten = True
@@ -905,32 +1288,54 @@ class MSHFile(GmshFile):
             self.meshWritten = True
 
         if isinstance(obj, CellVariable):
-            self._writeValues(var=obj, dimensions=dimensions, time=time, timeindex=timeindex)
+            self._writeValues(var=obj, dimensions=dimensions, time=time, timeindex=timeindex, nodal=nodal)
 
     def _writeMeshFormat(self):
         versionNumber = 2.2
         sizeOfDouble = 8
         lines = ["$MeshFormat\n",
-                 "%f 0 %d\n" % (versionNumber, sizeOfDouble),
-                 "$EndMeshFormat\n"]
+                 "%f %d %d\n" % (versionNumber, self.binary, sizeOfDouble)]
+        if self.binary:
+            # lets readers detect the byte order
+            lines += [nx.array([1], dtype=nx.int32).tostring() + "\n"]
+        lines += ["$EndMeshFormat\n"]
         self.fileobj.writelines(lines)
 
+    def _runs(self, keys):
+        """
+        Returns the start and stop of each run of equal `keys`.
+        """
+        keys = nx.asarray(keys)
+        breaks = nx.nonzero(keys[1:] != keys[:-1])[0] + 1
+        return zip(nx.concatenate(([0], breaks)), nx.concatenate((breaks, [len(keys)])))
+
     def _writeNodes(self, coords, dimensions, numNodes):
         self.fileobj.write("$Nodes\n")
         self.fileobj.write(str(numNodes) + '\n')
 
-        for i in range(numNodes):
-            self.fileobj.write("%s %s %s " % (str(i + 1),
-                                              str(coords[0, i]),
-                                              str(coords[1, i])))
-            if dimensions == 2:
-                self.fileobj.write("0 \n")
-            elif dimensions == 3:
-                self.fileobj.write(str(coords[2, i]))
-                self.fileobj.write (" \n")
-            else:
+        if self.binary:
+            if dimensions not in (2, 3):
                 raise MeshExportError, "Mesh has fewer than 2 or more than 3 dimensions"
 
+            nodes = nx.zeros((numNodes,), dtype=[("id", nx.int32),
+                                                 ("coords", nx.float64, (3,))])
+            nodes["id"] = nx.arange(1, numNodes + 1)
+            nodes["coords"][..., :dimensions] = coords.swapaxes(0, 1)
+            self.fileobj.write(nodes.tostring())
+            self.fileobj.write("\n")
+        else:
+            for i in range(numNodes):
+                self.fileobj.write("%s %s %s " % (str(i + 1),
+                                                  str(coords[0, i]),
+                                                  str(coords[1, i])))
+                if dimensions == 2:
+                    self.fileobj.write("0 \n")
+                elif dimensions == 3:
+                    self.fileobj.write(str(coords[2, i]))
+                    self.fileobj.write (" \n")
+                else:
+                    raise MeshExportError, "Mesh has fewer than 2 or more than 3 dimensions"
+
         self.fileobj.write("$EndNodes\n")
 
     def _writeElements(self, mesh, coords, dimensions, numNodes):
@@ -941,6 +1346,8 @@ class MSHFile(GmshFile):
         numCells = cellFaceIDs.shape[1]
         self.fileobj.write(str(numCells) + '\n')
 
+        elementTypes = []
+        vertexLists = []
         for i in range(numCells):
             ## build the vertex list
             vertexList = []
@@ -959,15 +1366,52 @@ class MSHFile(GmshFile):
                 vertexList = self._orderVertices(coords, vertexList)
 
             numVertices = len(vertexList)
-            elementType = self._getElementType(numVertices, dimensions)
-            self.fileobj.write("%s %s 0 " % (str(i + 1), str(elementType)))
+            elementTypes.append(self._getElementType(numVertices, dimensions))
+            vertexLists.append(vertexList)
+
+        if self.binary:
+            # consecutive elements of the same type share one header
+            for start, stop in self._runs(elementTypes):
+                header = nx.array([elementTypes[start], stop - start, 0], dtype=nx.int32)
+                self.fileobj.write(header.tostring())
+
+                records = nx.empty((stop - start, len(vertexLists[start]) + 1), dtype=nx.int32)
+                records[..., 0] = nx.arange(start, stop) + 1
+                records[..., 1:] = nx.array(vertexLists[start:stop]) + 1
+                self.fileobj.write(records.tostring())
+            self.fileobj.write("\n")
+        else:
+            for i, (elementType, vertexList) in enumerate(zip(elementTypes, vertexLists)):
+                self.fileobj.write("%s %s 0 " % (str(i + 1), str(elementType)))
 
-            self.fileobj.write(" ".join([str(a + 1) for a in vertexList]) + "\n")
+                self.fileobj.write(" ".join([str(a + 1) for a in vertexList]) + "\n")
 
         self.fileobj.write("$EndElements\n")
 
-    def _writeValues(self, var, dimensions, time=0.0, timeindex=0):
-        self.fileobj.write("$ElementData\n")
+        self._numElementNodes = nx.array([len(vertexList) for vertexList in vertexLists])
+
+    def _componentValues(self, var):
+        """
+        Returns the values of `var` as a (numberOfCells, 3**rank) array,
+        padding vectors and tensors of 2D meshes out to three dimensions.
+        """
+        numCells = var.mesh.numberOfCells
+        value = nx.array(var.value, dtype=float).reshape((-1, numCells))
+        if var.rank == 0:
+            return value.swapaxes(0, 1)
+
+        dimensions = var.mesh.dim
+        padded = nx.zeros((3,) * var.rank + (numCells,))
+        padded[(slice(0, dimensions),) * var.rank] = value.reshape((dimensions,) * var.rank + (numCells,))
+        return padded.reshape((-1, numCells)).swapaxes(0, 1)
+
+    def _writeValues(self, var, dimensions, time=0.0, timeindex=0, nodal=False):
+        if nodal:
+            section = "ElementNodeData"
+        else:
+            section = "ElementData"
+
+        self.fileobj.write("$%s\n" % section)
 
         # string-tags
         # "By default the first string-tag is interpreted as the name of the
@@ -991,53 +1435,63 @@ class MSHFile(GmshFile):
                                                     str(var.mesh.numberOfCells),
                                                     str(0)]])
 
-        for i in range(var.mesh.numberOfCells):
-            self.fileobj.write(" ".join([str(s) for s in [i+1] + list(var[..., i].value.flat)]) + "\n")
+        values = self._componentValues(var)
+        ids = nx.arange(1, var.mesh.numberOfCells + 1)
+
+        if nodal:
+            # the cell value is repeated on each of the cell's nodes
+            numNodes = self._numElementNodes
+            for start, stop in self._runs(numNodes):
+                nodeValues = nx.tile(values[start:stop], (1, numNodes[start]))
+                if self.binary:
+                    records = nx.empty((stop - start,),
+                                       dtype=[("id", nx.int32),
+                                              ("numNodes", nx.int32),
+                                              ("value", nx.float64, nodeValues.shape[1:])])
+                    records["id"] = ids[start:stop]
+                    records["numNodes"] = numNodes[start]
+                    records["value"] = nodeValues
+                    self.fileobj.write(records.tostring())
+                else:
+                    for i in range(start, stop):
+                        self.fileobj.write(" ".join([str(s) for s in [ids[i], numNodes[i]] + list(nodeValues[i - start])]) + "\n")
+        elif self.binary:
+            records = nx.empty((var.mesh.numberOfCells,),
+                               dtype=[("id", nx.int32),
+                                      ("value", nx.float64, values.shape[1:])])
+            records["id"] = ids
+            records["value"] = values
+            self.fileobj.write(records.tostring())
+        else:
+            for i in range(var.mesh.numberOfCells):
+                self.fileobj.write(" ".join([str(s) for s in [ids[i]] + list(values[i])]) + "\n")
 
-        self.fileobj.write("$EndElementData\n")
+        if self.binary:
+            self.fileobj.write("\n")
 
-    def _vertexCoordsAndMap(self, cellsToGmshVerts):
+        self.fileobj.write("$End%s\n" % section)
+
+    def _vertexCoordsAndMap(self, cellsToGmshVerts, nodeIDs, nodeCoords):
         """
         Returns `vertexCoords` and mapping from Gmsh ID to `vertexCoords`
         indices (same as in MSHFile).
 
-        Unlike parent, doesn't use genfromtxt
-        because we want to avoid loading the entire msh file into memory.
+        Only the nodes used by `cellsToGmshVerts` become vertices.
         """
-        allVerts     = [v for c in cellsToGmshVerts for v in c] # flatten
-        allVerts     = nx.unique(nx.array(allVerts, dtype=nx.INT_DTYPE)) # remove dups
-        allVerts     = nx.sort(allVerts)
+        allVerts     = nx.unique(cellsToGmshVerts[cellsToGmshVerts > -1]) # sorted, without dups
         maxVertIdx   = allVerts[-1] + 1 # add one to offset zero
         vertGIDtoIdx = nx.ones(maxVertIdx, 'l') * -1 # gmsh ID -> vertexCoords idx
-        vertexCoords = nx.empty((len(allVerts), self.coordDimensions))
-        nodeCount    = 0
 
         # establish map. This works because allVerts is a sorted set.
         vertGIDtoIdx[allVerts] = nx.arange(len(allVerts))
 
-        nodesFile = open(self.nodesPath, 'r')
-        nodesFile.readline() # skip number of nodes
-
-        # now we walk through node file with a sorted unique list of vertices
-        # in hand. When we encounter 0th element in `allVerts`, save it
-        # to `vertexCoords` then pop its ID off `allVerts`.
-        for node in nodesFile:
-            line   = node.split()
-            nodeID = int(line[0])
+        # gmsh ID -> position in the $Nodes section
+        nodeGIDtoIdx = nx.zeros(max(nodeIDs.max(), allVerts[-1]) + 1, 'l')
+        nodeGIDtoIdx[nodeIDs] = nx.arange(len(nodeIDs))
 
-            if nodeID == allVerts[nodeCount]:
-                newVert = [float(x) for x in line[1:self.coordDimensions+1]]
-                vertexCoords[nodeCount,:] = nx.array(newVert)
-                nodeCount += 1
+        vertexCoords = nodeCoords[:self.coordDimensions, nodeGIDtoIdx[allVerts]]
 
-            if len(allVerts) == nodeCount:
-                break
-
-        nodesFile.close()
-
-        # transpose for FiPy
-        transCoords = vertexCoords.swapaxes(0,1)
-        return transCoords, vertGIDtoIdx
+        return vertexCoords, vertGIDtoIdx
 
     def _parseElementFile(self):
         """
@@ -1047,96 +1501,92 @@ class MSHFile(GmshFile):
         All nastiness concerning ghost cell
         calculation is consolidated here: if we were ever to need to CALCULATE
         GHOST CELLS OURSELVES, the only code we'd have to change is in here.
-        """
 
-        def _parseTags(offset, currLineInts):
-            if offset == -1:
-                # if first valid shape
-                offset = currLineInts[0]
+        Each record is `id type numTags tags... nodes...`. The records are
+        classified and split into their fields for all elements at once.
+        """
+        values, offsets, lengths = self._parseElements()
+
+        last = max(len(values) - 1, 0)
+        ids = values[offsets]
+        shapes = values[offsets + 1]
+        numTags = values[offsets + 2]
+
+        # the partition tags for don't seem to always be present
+        # and don't always make much sense when they are
+
+        hasEntities = numTags >= 2
+        physicalEntities = nx.where(hasEntities, values[nx.minimum(offsets + 3, last)], -1)
+        geometricalEntities = nx.where(hasEntities, values[nx.minimum(offsets + 4, last)], -1)
+
+        isCell = nx.in1d(shapes, self.numFacesPerCell.keys())
+        isFace = nx.in1d(shapes, self.numVertsPerFace.keys())
+
+        # any remaining tags are a count followed by the partitions
+        partitionStart = offsets + 3 + nx.where(hasEntities, 2, 0)
+        numPartitionTags = numTags - nx.where(hasEntities, 2, 0)
+        hasPartitions = isCell & (numPartitionTags > 0)
+        counts = values[nx.minimum(partitionStart, last)]
+        disagree = hasPartitions & (counts != numPartitionTags - 1)
+        if disagree.any():
+            first = nx.nonzero(disagree)[0][0]
+            warnings.warn("Partition count %d does not agree with number of remaining tags %d." % (counts[first], numPartitionTags[first] - 1),
+                          SyntaxWarning, stacklevel=2)
 
-            numTags = currLineInts[2]
-            tags    = currLineInts[3:(3+numTags)]
+        if self.communicator.Nproc > 1:
+            pid = self.communicator.procID + 1
+
+            numPartitions = nx.where(hasPartitions, numPartitionTags - 1, 0)
+            element = nx.repeat(nx.arange(len(offsets)), numPartitions)
+            position = (nx.repeat(partitionStart + 1 - (nx.cumsum(numPartitions) - numPartitions), numPartitions)
+                        + nx.arange(len(element)))
+            partitions = values[position]
+
+            # if we're collecting ghost cells and this is our ghost cell
+            isGhost = nx.zeros(len(offsets), dtype=bool)
+            isGhost[element[partitions == -pid]] = True
+            # el is in this processor's partition
+            isLocal = nx.zeros(len(offsets), dtype=bool)
+            isLocal[element[partitions == pid]] = True
+        else:
+            # we collect all cells
+            isGhost = nx.zeros(len(offsets), dtype=bool)
+            isLocal = isCell
 
-            # the partition tags for don't seem to always be present
-            # and don't always make much sense when they are
+        nodesStart = offsets + 3 + numTags
+        numNodes = lengths - 3 - numTags
 
-            if len(tags) >= 2:
-                physicalEntity = tags.pop(0)
-                geometricalEntity = tags.pop(0)
+        def _offset(isType):
+            # this will be subtracted from gmsh ID to obtain global ID
+            if isType.any():
+                return ids[isType][0]
             else:
-                physicalEntity = geometricalEntity = -1
-
-            return offset, tags, physicalEntity, geometricalEntity
-
-
-        cellsData = _ElementData()
-        ghostsData = _ElementData()
-        facesData = _ElementData()
-
-        cellOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        faceOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        pid = self.communicator.procID + 1
-
-        elemsFile = open(self.elemsPath, 'r')
-
-        elemsFile.readline() # skip number of elements
-        for el in elemsFile:
-            currLineInts = [int(x) for x in el.split()]
-            elemType     = currLineInts[1]
-
-            if elemType in self.numFacesPerCell.keys():
-                # element is a cell
-
-                (cellOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=cellOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= cellOffset
-
-                if len(tags) > 0:
-                    # next item is a count
-                    if tags[0] != len(tags) - 1:
-                        warnings.warn("Partition count %d does not agree with number of remaining tags %d." % (tags[0], len(tags) - 1),
-                                      SyntaxWarning, stacklevel=2)
-                    tags = tags[1:]
-
-                if self.communicator.Nproc > 1:
-                    for tag in tags:
-                        if -tag == pid:
-                            # if we're collecting ghost cells and this is our ghost cell
-                            ghostsData.add(currLine=currLineInts, elType=elemType,
-                                           physicalEntity=physicalEntity,
-                                           geometricalEntity=geometricalEntity)
-                        elif tag == pid:
-                            # el is in this processor's partition or we collect all cells
-                            cellsData.add(currLine=currLineInts, elType=elemType,
-                                          physicalEntity=physicalEntity,
-                                          geometricalEntity=geometricalEntity)
-                else:
-                    # we collect all cells
-                    cellsData.add(currLine=currLineInts, elType=elemType,
-                                  physicalEntity=physicalEntity,
-                                  geometricalEntity=geometricalEntity)
-            elif elemType in self.numVertsPerFace.keys():
-                # element is a face
-
-                (faceOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=faceOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= faceOffset
-
-                facesData.add(currLine=currLineInts, elType=elemType,
-                              physicalEntity=physicalEntity,
-                              geometricalEntity=geometricalEntity)
-
-        elemsFile.close()
+                return 0
+
+        def _elementData(selected, offset, width):
+            columns = nx.arange(width)
+            isNode = columns < numNodes[selected][..., nx.newaxis]
+            nodes = nx.where(isNode,
+                             values[nx.where(isNode, nodesStart[selected][..., nx.newaxis] + columns, 0)],
+                             -1)
+
+            return _ElementData(nodes=nodes,
+                                shapes=shapes[selected],
+                                idmap=ids[selected] - offset,
+                                physicalEntities=physicalEntities[selected],
+                                geometricalEntities=geometricalEntities[selected])
+
+        def _maxNodes(selected):
+            return max(numNodes[selected].max() if selected.any() else 0, 0)
+
+        cellOffset = _offset(isCell)
+        cellWidth = _maxNodes(isLocal | isGhost)
+        cellsData = _elementData(isLocal & isCell, offset=cellOffset, width=cellWidth)
+        ghostsData = _elementData(isGhost & isCell, offset=cellOffset, width=cellWidth)
+        facesData = _elementData(isFace, offset=_offset(isFace), width=_maxNodes(isFace))
 
         return cellsData, ghostsData, facesData
 
-
     def _parseNamesFile(self):
         physicalNames = {
             0: dict(),
@@ -1144,12 +1594,14 @@ class MSHFile(GmshFile):
             2: dict(),
             3: dict()
         }
-        if self.namesPath is not None:
-            namesFile = open(self.namesPath, 'r')
+        try:
+            numNames = self._isolateData("PhysicalNames")
+        except EOFError, e:
+            numNames = 0
 
-            namesFile.readline() # skip number of elements
-            for nm in namesFile:
-                nm = nm.split()
+        if numNames > 0:
+            for i in range(numNames):
+                nm = self.fileobj.readline().split()
                 if self.version > 2.0:
                     dim = [int(nm.pop(0))]
                 else:
@@ -1162,8 +1614,6 @@ class MSHFile(GmshFile):
                 for d in dim:
                     physicalNames[d][name] = int(num)
 
-            namesFile.close()
-
         return physicalNames
 
     def makeMapVariables(self, mesh):
@@ -1199,7 +1649,7 @@ class MSHFile(GmshFile):
         >>> import os
         >>> import tempfile
 
-        >>> from fipy import Grid2D, Tri2D, Grid3D, CylindricalGrid2D, CellVariable, doctest_raw_input
+        >>> from fipy import Grid2D, Tri2D, Grid3D, CylindricalGrid2D, CellVariable, doctest_raw_input, numerix
         >>> from fipy.meshes.uniformGrid2D import UniformGrid2D
 
         >>> dir = tempfile.mkdtemp()
@@ -1245,6 +1695,16 @@ class MSHFile(GmshFile):
         ...     p = Popen(["gmsh", os.path.join(dir, "concat.msh")]) # doctest: +GMSH
         ...     doctest_raw_input("Tri2D + Grid2D... Press enter.")
 
+        >>> f = openMSHFile(name=os.path.join(dir, "gbin.msh"), mode='wb') # doctest: +GMSH
+        >>> f.write(g) # doctest: +GMSH
+        >>> f.write(gvar) # doctest: +GMSH
+        >>> f.write(gvar, nodal=True) # doctest: +GMSH
+        >>> f.close() # doctest: +GMSH
+
+        >>> gbin = Gmsh2D(os.path.join(dir, "gbin.msh")) # doctest: +GMSH
+        >>> print numerix.allclose(gbin.cellCenters, g.cellCenters) # doctest: +GMSH
+        True
+
         >>> g3d = Grid3D(nx=10, ny=10, nz=30)
         >>> f = openMSHFile(name=os.path.join(dir, "g3d.msh"), mode='w') # doctest: +GMSH
         >>> f.write(g3d) # doctest: +GMSH
@@ -1268,30 +1728,55 @@ class MSHFile(GmshFile):
         """
         pass
 
+class _CachedMSHFile(MSHFile):
+    """The results of reading an `MSHFile`, as stored by `MSHFile._storeCache()`
+    """
+    fileIsTemporary = False
+
+    def __init__(self, filename):
+        data = nx.load(filename)
+        try:
+            self.dimensions = int(data["dimensions"])
+            self.coordDimensions = int(data["coordDimensions"])
+            self.physicalCellMap = data["physicalCellMap"]
+            self.geometricalCellMap = data["geometricalCellMap"]
+            self.physicalFaceMap = data["physicalFaceMap"]
+            self.geometricalFaceMap = data["geometricalFaceMap"]
+            self.physicalNames = dict([(int(dim), names) for dim, names
+                                       in json.loads(str(data["physicalNames"])).items()])
+            self._results = (data["vertexCoords"],
+                             data["facesToV"],
+                             data["cellsToF"],
+                             data["cellGlobalIDs"].tolist(),
+                             data["gCellGlobalIDs"].tolist(),
+                             nx.MA.masked_equal(data["cellsToVertIDs"], value=-1))
+        finally:
+            data.close()
+
+        self.filename = filename
+
+    def read(self):
+        return self._results
+
+    def close(self):
+        pass
+
 class _ElementData(object):
     """
     Bookkeeping for cells. Declared as own class for generality.
 
-    "nodes": A Python list of the vertices that make up this element
-    "shapes": A shapeTypes Python list
-    "idmap": A Python list which maps vertexCoords idx -> global ID
-    "physicalEntities": A Python list of the Gmsh physical entities each element is in
-    "geometricalEntities": A Python list of the Gmsh geometrical entities each element is in
+    "nodes": An array of the vertices that make up each element, padded with -1
+    "shapes": An array of the shapeTypes
+    "idmap": An array which maps vertexCoords idx -> global ID
+    "physicalEntities": An array of the Gmsh physical entities each element is in
+    "geometricalEntities": An array of the Gmsh geometrical entities each element is in
     """
-    def __init__(self):
-        self.nodes = []
-        self.shapes = []
-        self.idmap = [] # vertexCoords idx -> gmsh ID (global ID)
-        self.physicalEntities = []
-        self.geometricalEntities = []
-
-    def add(self, currLine, elType, physicalEntity, geometricalEntity):
-        numTags = currLine[2]
-        self.nodes.append(currLine[(numTags+3):])
-        self.shapes.append(elType)
-        self.idmap.append(currLine[0])
-        self.physicalEntities.append(physicalEntity)
-        self.geometricalEntities.append(geometricalEntity)
+    def __init__(self, nodes, shapes, idmap, physicalEntities, geometricalEntities):
+        self.nodes = nodes
+        self.shapes = shapes
+        self.idmap = idmap # vertexCoords idx -> gmsh ID (global ID)
+        self.physicalEntities = physicalEntities
+        self.geometricalEntities = geometricalEntities
 
 class _GmshTopology(_MeshTopology):
 
@@ -1564,22 +2049,27 @@ class Gmsh2D(Mesh2D):
       - `order`: ???
       - `background`: a `CellVariable` that specifies the desired characteristic
         lengths of the mesh cells
+      - `binary`: whether Gmsh should write the mesh of a geometry as a
+        binary MSH file, which is quicker to read than the default ASCII
     """
 
+    _shareGeometry = True
+
     def __init__(self,
                  arg,
                  coordDimensions=2,
                  communicator=parallelComm,
                  order=1,
-                 background=None):
+                 background=None,
+                 binary=False):
 
-        self.mshFile = openMSHFile(arg,
-                                   dimensions=2,
-                                   coordDimensions=coordDimensions,
-                                   communicator=communicator,
-                                   order=order,
-                                   mode='r',
-                                   background=background)
+        self.mshFile = _openCachedMSHFile(arg,
+                                          dimensions=2,
+                                          coordDimensions=coordDimensions,
+                                          communicator=communicator,
+                                          order=order,
+                                          mode=_readMode(binary),
+                                          background=background)
 
         (verts,
          faces,
@@ -1857,14 +2347,17 @@ class Gmsh2DIn3DSpace(Gmsh2D):
       - `order`: ???
       - `background`: a `CellVariable` that specifies the desired characteristic
         lengths of the mesh cells
+      - `binary`: whether Gmsh should write the mesh of a geometry as a
+        binary MSH file, which is quicker to read than the default ASCII
     """
-    def __init__(self, arg, communicator=parallelComm, order=1, background=None):
+    def __init__(self, arg, communicator=parallelComm, order=1, background=None, binary=False):
         Gmsh2D.__init__(self,
                         arg,
                         coordDimensions=3,
                         communicator=communicator,
                         order=order,
-                        background=background)
+                        background=background,
+                        binary=binary)
 
     def _test(self):
         """
@@ -1932,14 +2425,18 @@ class Gmsh3D(Mesh):
       - `order`: ???
       - `background`: a `CellVariable` that specifies the desired characteristic
         lengths of the mesh cells
+      - `binary`: whether Gmsh should write the mesh of a geometry as a
+        binary MSH file, which is quicker to read than the default ASCII
     """
-    def __init__(self, arg, communicator=parallelComm, order=1, background=None):
-        self.mshFile  = openMSHFile(arg,
-                                    dimensions=3,
-                                    communicator=communicator,
-                                    order=order,
-                                    mode='r',
-                                    background=background)
+    _shareGeometry = True
+
+    def __init__(self, arg, communicator=parallelComm, order=1, background=None, binary=False):
+        self.mshFile  = _openCachedMSHFile(arg,
+                                           dimensions=3,
+                                           communicator=communicator,
+                                           order=order,
+                                           mode=_readMode(binary),
+                                           background=background)
 
         (verts,
          faces,
@@ -50,6 +50,10 @@
 
 __docformat__ = 'restructuredtext'
 
+import hashlib
+import os
+import tempfile
+
 from fipy.meshes.abstractMesh import AbstractMesh
 from fipy.meshes.representations.meshRepresentation import _MeshRepresentation
 from fipy.meshes.topologies.meshTopology import _MeshTopology
@@ -64,6 +68,49 @@ __all__ = ["MeshAdditionError", "Mesh"]
 class MeshAdditionError(Exception):
     pass
 
+class _LazyGeometry(object):
+    """Geometric quantity of a `Mesh` that is only calculated when first used
+
+    `calc` returns the values of all of `names` at once. They are stored in
+    the instance dictionary, which takes precedence over this (non-data)
+    descriptor, so they can be assigned or changed in place like any other
+    attribute. Quantities that depend on the scale of the mesh are not
+    `shared` through :envvar:`FIPY_GEOMETRY_CACHE`.
+    """
+    def __init__(self, calc, names, index=0, shared=True):
+        self.calc = calc
+        self.names = names
+        self.index = index
+        self.shared = shared
+
+    def __get__(self, mesh, meshClass):
+        if mesh is None:
+            return self
+        mesh._calcLazyGeometry(self.calc, self.names, shared=self.shared)
+        return mesh.__dict__[self.names[self.index]]
+
+def _saveGeometry(filename, value):
+    dirname = os.path.dirname(filename)
+    try:
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        # write to a scratch file and rename it, so that concurrent
+        # processes never see a partially written array
+        fd, scratch = tempfile.mkstemp(dir=dirname)
+        f = os.fdopen(fd, 'wb')
+        try:
+            numerix.save(f, value)
+        finally:
+            f.close()
+        os.rename(scratch, filename)
+    except (IOError, OSError):
+        pass
+
+def _loadGeometry(filename):
+    # a read-only view of the file, rather than a `memmap`, so that
+    # arithmetic returns ordinary arrays
+    return numerix.asarray(numerix.load(filename, mmap_mode='r'))
+
 class Mesh(AbstractMesh):
     """Generic mesh class using numerix to do the calculations
 
@@ -99,6 +146,10 @@ class Mesh(AbstractMesh):
         self._setTopology()
         self._setGeometry(scaleLength = 1.)
 
+    # whether `FIPY_GEOMETRY_CACHE` applies, i.e., the geometry is not
+    # changed in place after the `Mesh` is constructed
+    _shareGeometry = False
+
     """
     Topology set and calc
     """
@@ -111,7 +162,7 @@ class Mesh(AbstractMesh):
         self._cellToFaceOrientations = self._calcCellToFaceOrientations()
         self._adjacentCellIDs = self._calcAdjacentCellIDs()
         self._cellToCellIDs = self._calcCellToCellIDs()
-        self._cellToCellIDsFilled = self._calcCellToCellIDsFilled()
+        self.__dict__.pop("_cellToCellIDsFilled", None)
 
     def _calcInteriorAndExteriorFaceIDs(self):
         from fipy.variables.faceVariable import FaceVariable
@@ -161,30 +212,167 @@ class Mesh(AbstractMesh):
         return MA.where(MA.getmaskarray(self._cellToCellIDs), cellIDs,
                         self._cellToCellIDs)
 
+    _cellToCellIDsFilled = _LazyGeometry(lambda self: self._calcCellToCellIDsFilled(),
+                                         ("_cellToCellIDsFilled",))
+
     """
     Geometry set and calc
     """
 
     def _setGeometry(self, scaleLength = 1.):
-        self._faceCenters = self._calcFaceCenters()
-        self._faceAreas = self._calcFaceAreas()
-        self._cellCenters = self._calcCellCenters()
-        (self._internalFaceToCellDistances,
-         self._cellToFaceDistanceVectors) = self._calcFaceToCellDistAndVec()
-        (self._internalCellDistances,
-         self._cellDistanceVectors) = self._calcCellDistAndVec()
-        self.faceNormals = self._calcFaceNormals()
-        self._orientedFaceNormals = self._calcOrientedFaceNormals()
-        self._cellVolumes = self._calcCellVolumes()
-        self._faceCellToCellNormals = self._calcFaceCellToCellNormals()
-        (self._faceTangents1,
-         self._faceTangents2) = self._calcFaceTangents()
-        self._cellToCellDistances = self._calcCellToCellDist()
+        """
+        Discard any calculated geometry. Each geometric quantity is
+        calculated when it is first used.
+
+            >>> from fipy.meshes.nonUniformGrid2D import NonUniformGrid2D
+            >>> mesh = NonUniformGrid2D(nx=2, ny=1)
+            >>> print "_cellVolumes" in mesh.__dict__
+            False
+            >>> print mesh.cellVolumes, "_cellVolumes" in mesh.__dict__
+            [ 1.  1.] True
+            >>> print "_faceTangents1" in mesh.__dict__
+            False
+
+        Anything derived from the geometry, such as the moments used by
+        least-squares gradients, is discarded too.
+
+            >>> from fipy.meshes.nonUniformGrid1D import NonUniformGrid1D
+            >>> from fipy.variables.cellVariable import CellVariable
+            >>> mesh = NonUniformGrid1D(dx=(1., 1., 1.))
+            >>> var = CellVariable(mesh=mesh, value=(0.5, 1.5, 2.5))
+            >>> print var.leastSquaresGrad
+            [[ 0.8  1.   0.8]]
+            >>> mesh.vertexCoords *= 2
+            >>> mesh._setGeometry()
+            >>> print CellVariable(mesh=mesh, value=var).leastSquaresGrad
+            [[ 0.4  0.5  0.4]]
+        """
+        # so is anything derived from it
+        for name in self._lazyGeometryNames + ["_cellCenterTreeData",
+                                               "_leastSquaresGeometry"]:
+            self.__dict__.pop(name, None)
 
         self._setScaledGeometry(self.scale['length'])
 
-        self._cellAreas = self._calcCellAreas()
-        self._cellNormals = self._calcCellNormals()
+    def _calcGeometry(self):
+        """Calculate all of the geometry now, e.g., before changing it in place"""
+        for name in self._lazyGeometryNames:
+            getattr(self, name)
+
+    @property
+    def _lazyGeometryNames(self):
+        names = []
+        for name in dir(self.__class__):
+            attr = getattr(self.__class__, name, None)
+            if isinstance(attr, _LazyGeometry) and name not in names:
+                names.append(name)
+        return names
+
+    def _calcLazyGeometry(self, calc, names, shared=True):
+        if shared:
+            store = self._geometryStore
+        else:
+            store = None
+        if store is not None:
+            filenames = [os.path.join(store, name + ".npy") for name in names]
+            try:
+                values = [self._loadLazyGeometry(filename) for filename in filenames]
+            except (IOError, OSError, ValueError):
+                values = None
+        else:
+            values = None
+
+        if values is None:
+            values = calc(self)
+            if len(names) == 1:
+                values = (values,)
+
+            if store is not None:
+                for filename, value in zip(filenames, values):
+                    self._saveLazyGeometry(filename, value)
+                try:
+                    values = [self._loadLazyGeometry(filename) for filename in filenames]
+                except (IOError, OSError, ValueError):
+                    pass
+
+        for name, value in zip(names, values):
+            self.__dict__[name] = value
+
+    @staticmethod
+    def _saveLazyGeometry(filename, value):
+        if isinstance(value, MA.MaskedArray):
+            _saveGeometry(filename + ".mask", MA.getmaskarray(value))
+            value = MA.getdata(value)
+        _saveGeometry(filename, numerix.asarray(value))
+
+    @staticmethod
+    def _loadLazyGeometry(filename):
+        value = _loadGeometry(filename)
+        if os.path.exists(filename + ".mask"):
+            value = MA.array(value, mask=_loadGeometry(filename + ".mask"), copy=False)
+        return value
+
+    @property
+    def _geometryStore(self):
+        """Directory of read-only files holding the geometry of this `Mesh`,
+        or `None`
+
+        If :envvar:`FIPY_GEOMETRY_CACHE` is set, the geometry of meshes that
+        never change it in place, such as `Gmsh3D`, is memory-mapped from
+        files in that directory, so that every process using an identical
+        `Mesh` shares a single copy.
+
+            >>> import os, shutil, tempfile
+            >>> from fipy.meshes.mesh2D import Mesh2D
+            >>> from fipy.meshes.nonUniformGrid2D import NonUniformGrid2D
+            >>> os.environ["FIPY_GEOMETRY_CACHE"] = tempfile.mkdtemp()
+            >>> class _SharedMesh(Mesh2D):
+            ...     _shareGeometry = True
+            >>> def sharedMesh():
+            ...     mesh = NonUniformGrid2D(nx=3, ny=2)
+            ...     return _SharedMesh(vertexCoords=mesh.vertexCoords,
+            ...                        faceVertexIDs=mesh.faceVertexIDs,
+            ...                        cellFaceIDs=mesh.cellFaceIDs)
+            >>> mesh0, mesh1 = sharedMesh(), sharedMesh()
+            >>> print mesh0._geometryStore == mesh1._geometryStore
+            True
+            >>> print mesh0.cellVolumes
+            [ 1.  1.  1.  1.  1.  1.]
+            >>> print mesh1._cellVolumes.flags.writeable
+            False
+            >>> print mesh1._faceToCellDistances.mask[1].sum()
+            10
+            >>> print numerix.allclose(mesh1.faceNormals,
+            ...                        NonUniformGrid2D(nx=3, ny=2).faceNormals)
+            True
+
+        Quantities that depend on the scale of the mesh are not shared.
+
+            >>> print os.path.exists(os.path.join(mesh0._geometryStore, "_cellVolumes.npy"))
+            True
+            >>> print os.path.exists(os.path.join(mesh0._geometryStore, "_scaledCellVolumes.npy"))
+            False
+            >>> print mesh1.cellVolumes.flags.writeable
+            True
+            >>> shutil.rmtree(os.environ["FIPY_GEOMETRY_CACHE"])
+            >>> del os.environ["FIPY_GEOMETRY_CACHE"]
+        """
+        if not hasattr(self, "_geometryStoreData"):
+            directory = os.environ.get('FIPY_GEOMETRY_CACHE')
+            if self._shareGeometry and directory:
+                key = hashlib.sha1(repr((self.__class__.__module__,
+                                         self.__class__.__name__)))
+                for array in (self.vertexCoords,
+                              MA.filled(self.faceVertexIDs, -1),
+                              MA.filled(self.cellFaceIDs, -1)):
+                    array = numerix.ascontiguousarray(array)
+                    key.update(repr((array.dtype.str, array.shape)))
+                    key.update(array.tostring())
+                self._geometryStoreData = os.path.join(directory, key.hexdigest())
+            else:
+                self._geometryStoreData = None
+
+        return self._geometryStoreData
 
     def _calcFaceAreas(self):
         faceVertexIDs = MA.filled(self.faceVertexIDs, -1)
@@ -306,6 +494,39 @@ class Mesh(AbstractMesh):
     def _calcCellToCellDist(self):
         return numerix.take(self._cellDistances, self.cellFaceIDs)
 
+    _faceCenters = _LazyGeometry(lambda self: self._calcFaceCenters(),
+                                 ("_faceCenters",))
+    _faceAreas = _LazyGeometry(lambda self: self._calcFaceAreas(),
+                               ("_faceAreas",))
+    _cellCenters = _LazyGeometry(lambda self: self._calcCellCenters(),
+                                 ("_cellCenters",))
+    _internalFaceToCellDistances = _LazyGeometry(lambda self: self._calcFaceToCellDistAndVec(),
+                                                 ("_internalFaceToCellDistances",
+                                                  "_cellToFaceDistanceVectors"), 0)
+    _cellToFaceDistanceVectors = _LazyGeometry(lambda self: self._calcFaceToCellDistAndVec(),
+                                               ("_internalFaceToCellDistances",
+                                                "_cellToFaceDistanceVectors"), 1)
+    _internalCellDistances = _LazyGeometry(lambda self: self._calcCellDistAndVec(),
+                                           ("_internalCellDistances",
+                                            "_cellDistanceVectors"), 0)
+    _cellDistanceVectors = _LazyGeometry(lambda self: self._calcCellDistAndVec(),
+                                         ("_internalCellDistances",
+                                          "_cellDistanceVectors"), 1)
+    faceNormals = _LazyGeometry(lambda self: self._calcFaceNormals(),
+                                ("faceNormals",))
+    _orientedFaceNormals = _LazyGeometry(lambda self: self._calcOrientedFaceNormals(),
+                                         ("_orientedFaceNormals",))
+    _cellVolumes = _LazyGeometry(lambda self: self._calcCellVolumes(),
+                                 ("_cellVolumes",))
+    _faceCellToCellNormals = _LazyGeometry(lambda self: self._calcFaceCellToCellNormals(),
+                                           ("_faceCellToCellNormals",))
+    _faceTangents1 = _LazyGeometry(lambda self: self._calcFaceTangents(),
+                                   ("_faceTangents1", "_faceTangents2"), 0)
+    _faceTangents2 = _LazyGeometry(lambda self: self._calcFaceTangents(),
+                                   ("_faceTangents1", "_faceTangents2"), 1)
+    _cellToCellDistances = _LazyGeometry(lambda self: self._calcCellToCellDist(),
+                                         ("_cellToCellDistances",))
+
     def _calcCellAreas(self):
         from fipy.tools.numerix import take
         return take(self._faceAreas, self.cellFaceIDs)
@@ -322,6 +543,11 @@ class Mesh(AbstractMesh):
         else:
             return cellNormals
 
+    _cellAreas = _LazyGeometry(lambda self: self._calcCellAreas(),
+                               ("_cellAreas",))
+    _cellNormals = _LazyGeometry(lambda self: self._calcCellNormals(),
+                                 ("_cellNormals",))
+
     """settable geometry properties"""
     def _getFaceToCellDistances(self):
         return self._internalFaceToCellDistances
@@ -370,19 +596,37 @@ class Mesh(AbstractMesh):
         self._setScaledValues()
 
     def _setScaledValues(self):
-        self._scaledFaceAreas = self._scale['area'] * self._faceAreas
-        self._scaledCellVolumes = self._scale['volume'] * self._cellVolumes
-        self._scaledCellCenters = self._scale['length'] * self._cellCenters
-        self._scaledFaceToCellDistances = self._scale['length'] * self._faceToCellDistances
-        self._scaledCellDistances = self._scale['length'] * self._cellDistances
+        for name in ("_scaledFaceAreas", "_scaledCellVolumes", "_scaledCellCenters",
+                     "_scaledFaceToCellDistances", "_scaledCellDistances"):
+            self.__dict__.pop(name, None)
         self._setFaceDependentScaledValues()
 
     def _setFaceDependentScaledValues(self):
-        self._scaledCellToCellDistances = self._scale['length'] * self._cellToCellDistances
-        self._areaProjections = self._calcAreaProjections()
-        self._orientedAreaProjections = self._calcOrientedAreaProjections()
-        self._faceToCellDistanceRatio = self._calcFaceToCellDistanceRatio()
-        self._faceAspectRatios = self._calcFaceAspectRatios()
+        for name in ("_scaledCellToCellDistances", "_areaProjections",
+                     "_orientedAreaProjections", "_faceToCellDistanceRatio",
+                     "_faceAspectRatios"):
+            self.__dict__.pop(name, None)
+
+    _scaledFaceAreas = _LazyGeometry(lambda self: self._scale['area'] * self._faceAreas,
+                                     ("_scaledFaceAreas",), shared=False)
+    _scaledCellVolumes = _LazyGeometry(lambda self: self._scale['volume'] * self._cellVolumes,
+                                       ("_scaledCellVolumes",), shared=False)
+    _scaledCellCenters = _LazyGeometry(lambda self: self._scale['length'] * self._cellCenters,
+                                       ("_scaledCellCenters",), shared=False)
+    _scaledFaceToCellDistances = _LazyGeometry(lambda self: self._scale['length'] * self._faceToCellDistances,
+                                               ("_scaledFaceToCellDistances",), shared=False)
+    _scaledCellDistances = _LazyGeometry(lambda self: self._scale['length'] * self._cellDistances,
+                                         ("_scaledCellDistances",), shared=False)
+    _scaledCellToCellDistances = _LazyGeometry(lambda self: self._scale['length'] * self._cellToCellDistances,
+                                               ("_scaledCellToCellDistances",), shared=False)
+    _areaProjections = _LazyGeometry(lambda self: self._calcAreaProjections(),
+                                     ("_areaProjections",))
+    _orientedAreaProjections = _LazyGeometry(lambda self: self._calcOrientedAreaProjections(),
+                                             ("_orientedAreaProjections",))
+    _faceToCellDistanceRatio = _LazyGeometry(lambda self: self._calcFaceToCellDistanceRatio(),
+                                             ("_faceToCellDistanceRatio",))
+    _faceAspectRatios = _LazyGeometry(lambda self: self._calcFaceAspectRatios(),
+                                      ("_faceAspectRatios",), shared=False)
 
     def _calcAreaScale(self):
         return self.scale['length']**2
@@ -589,8 +833,45 @@ class Mesh(AbstractMesh):
            >>> print m0._getNearestCellID(m1.cellCenters.globalValue)
            [4 5 7 8]
 
+        The spatial index of cell centers is built once and kept on the mesh
+
+           >>> m2 = Grid2D(dx=(.1, 1., 10.), dy=(.1, 1., 10.))
+           >>> points = numerix.random.random((2, 50)) * 11.1
+           >>> print (m2._getNearestCellID(points)
+           ...        == numerix.nearest(m2.cellCenters.globalValue, points)).all()
+           True
+           >>> print m2._cellCenterTree is m2._cellCenterTree
+           True
+
+        """
+        tree = self._cellCenterTree
+        if tree is None:
+            return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+
+        points = numerix.asarray(points)
+        D = points.shape[0]
+        distances, IDs = tree.query(points.reshape((D, -1)).swapaxes(0, 1))
+
+        return IDs.reshape(points.shape[1:])
+
+    @property
+    def _cellCenterTree(self):
+        """KD-tree of the global cell centers, or `None` if scipy is not
+        available or the mesh has no cells.
         """
-        return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        if not hasattr(self, "_cellCenterTreeData"):
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                cKDTree = None
+
+            if cKDTree is None or self.globalNumberOfCells == 0:
+                self._cellCenterTreeData = None
+            else:
+                centers = numerix.array(self.cellCenters.globalValue, dtype=float)
+                self._cellCenterTreeData = cKDTree(centers.swapaxes(0, 1))
+
+        return self._cellCenterTreeData
 
     def _test(self):
         """
@@ -73,7 +73,8 @@ def _suite():
         'fipy.meshes.cylindricalNonUniformGrid2D',
         'fipy.meshes.factoryMeshes',
         'fipy.meshes.abstractMesh',
-        'fipy.meshes.representations.gridRepresentation'))
+        'fipy.meshes.representations.gridRepresentation',
+        'fipy.meshes.topologies.gridTopology'))
 
 if __name__ == '__main__':
     fipy.tests.testProgram.main(defaultTest='_suite')
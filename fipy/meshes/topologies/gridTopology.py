@@ -64,6 +64,60 @@ class _GridTopology(_AbstractTopology):
     def _isOrthogonal(self):
         return True
 
+    def _blockCellIDs(self, lower, upper, shape, offset=None):
+        """Return the IDs of the block of cells from `lower` up to `upper`,
+        on each axis, of a grid of `shape` cells.
+
+        The block starts at `offset` in the grid; the x index varies fastest.
+
+            >>> from fipy.meshes.topologies.gridTopology import _GridTopology
+            >>> print _GridTopology(mesh=None)._blockCellIDs(lower=(1, 0), upper=(3, 2),
+            ...                                              shape=(4, 3), offset=(0, 1))
+            [ 5  6  9 10]
+        """
+        if offset is None:
+            offset = (0,) * len(shape)
+
+        # block indices, with z slowest
+        indices = numerix.indices([max(u - l, 0) for l, u in zip(lower, upper)][::-1])
+
+        IDs = 0
+        stride = 1
+        for axis, (l, n, o) in enumerate(zip(lower, shape, offset)):
+            IDs = IDs + (indices[-1 - axis] + l + o) * stride
+            stride *= n
+
+        return numerix.ravel(IDs)
+
+    @property
+    def _lowerNonOverlapping(self):
+        return [self.mesh.overlap[side] for side in ('left', 'bottom', 'front')[:self.mesh.dim]]
+
+    @property
+    def _upperNonOverlapping(self):
+        return [n - self.mesh.overlap[side]
+                for n, side in zip(self.mesh.shape, ('right', 'top', 'back'))]
+
+    @property
+    def _globalNonOverlappingCellIDs(self):
+        return self._blockCellIDs(lower=self._lowerNonOverlapping,
+                                  upper=self._upperNonOverlapping,
+                                  shape=self.mesh.globalShape,
+                                  offset=self.mesh.offset)
+
+    @property
+    def _globalOverlappingCellIDs(self):
+        return self._blockCellIDs(lower=(0,) * self.mesh.dim,
+                                  upper=self.mesh.shape,
+                                  shape=self.mesh.globalShape,
+                                  offset=self.mesh.offset)
+
+    @property
+    def _localNonOverlappingCellIDs(self):
+        return self._blockCellIDs(lower=self._lowerNonOverlapping,
+                                  upper=self._upperNonOverlapping,
+                                  shape=self.mesh.shape)
+
 class _Grid1DTopology(_GridTopology):
 
     _concatenatedClass = Mesh1D
@@ -239,8 +293,7 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange((self.mesh.offset[1] + self.mesh.overlap['bottom']) * self.mesh.nx,
-                              (self.mesh.offset[1] + self.mesh.ny - self.mesh.overlap['top']) * self.mesh.nx)
+        return super(_Grid2DTopology, self)._globalNonOverlappingCellIDs
 
     @property
     def _globalOverlappingCellIDs(self):
@@ -260,7 +313,7 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.offset[1] * self.mesh.nx, (self.mesh.offset[1] + self.mesh.ny) * self.mesh.nx)
+        return super(_Grid2DTopology, self)._globalOverlappingCellIDs
 
     @property
     def _localNonOverlappingCellIDs(self):
@@ -280,8 +333,7 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.overlap['bottom'] * self.mesh.nx,
-                              (self.mesh.ny - self.mesh.overlap['top']) * self.mesh.nx)
+        return super(_Grid2DTopology, self)._localNonOverlappingCellIDs
 
     @property
     def _localOverlappingCellIDs(self):
@@ -324,8 +376,7 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange((self.mesh.offset[2] + self.mesh.overlap['front']) * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.offset[2] + self.mesh.nz - self.mesh.overlap['back']) * self.mesh.nx * self.mesh.ny)
+        return super(_Grid3DTopology, self)._globalNonOverlappingCellIDs
 
     @property
     def _globalOverlappingCellIDs(self):
@@ -335,9 +386,7 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-
-        return numerix.arange(self.mesh.offset[2] * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.offset[2] + self.mesh.nz) * self.mesh.nx * self.mesh.ny)
+        return super(_Grid3DTopology, self)._globalOverlappingCellIDs
 
     @property
     def _localNonOverlappingCellIDs(self):
@@ -347,8 +396,7 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.overlap['front'] * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.nz - self.mesh.overlap['back']) * self.mesh.nx * self.mesh.ny)
+        return super(_Grid3DTopology, self)._localNonOverlappingCellIDs
 
     @property
     def _localOverlappingCellIDs(self):
@@ -106,6 +106,7 @@ class UniformGrid1D(UniformGrid):
          scale,
          self.globalNumberOfCells,
          self.globalNumberOfFaces,
+         self.globalShape,
          self.overlap,
          self.offset,
          self.numberOfVertices,
@@ -70,7 +70,7 @@ class UniformGrid2D(UniformGrid):
     first and then vertical faces.
     """
     def __init__(self, dx=1., dy=1., nx=1, ny=1, origin=((0,),(0,)),
-                       overlap=2, communicator=parallelComm,
+                       overlap=2, communicator=parallelComm, decomposition=None,
                        _RepresentationClass=_Grid2DRepresentation,
                        _TopologyClass=_Grid2DTopology):
 
@@ -87,11 +87,12 @@ class UniformGrid2D(UniformGrid):
             'nx': nx,
             'ny': ny,
             'origin': origin,
-            'overlap': overlap
+            'overlap': overlap,
+            'decomposition': decomposition
         }
 
         builder.buildGridData([dx, dy], [nx, ny], overlap, communicator,
-                              origin)
+                              origin, decomposition=decomposition)
 
         ([self.dx, self.dy],
          [self.nx, self.ny],
@@ -99,6 +100,7 @@ class UniformGrid2D(UniformGrid):
          scale,
          self.globalNumberOfCells,
          self.globalNumberOfFaces,
+         self.globalShape,
          self.overlap,
          self.offset,
          self.numberOfVertices,
@@ -466,7 +468,8 @@ class UniformGrid2D(UniformGrid):
     def _translate(self, vector):
         return self.__class__(dx = self.args['dx'], nx = self.args['nx'],
                               dy = self.args['dy'], ny = self.args['ny'],
-                             origin = numerix.array(self.args['origin']) + vector, overlap=self.args['overlap'])
+                             origin = numerix.array(self.args['origin']) + vector, overlap=self.args['overlap'],
+                             decomposition=self.args['decomposition'])
 
     def __mul__(self, factor):
         if numerix.shape(factor) is ():
@@ -474,7 +477,8 @@ class UniformGrid2D(UniformGrid):
 
         return UniformGrid2D(dx=self.args['dx'] * numerix.array(factor[0]), nx=self.args['nx'],
                              dy=self.args['dy'] * numerix.array(factor[1]), ny=self.args['ny'],
-                             origin=numerix.array(self.args['origin']) * factor, overlap=self.args['overlap'])
+                             origin=numerix.array(self.args['origin']) * factor, overlap=self.args['overlap'],
+                             decomposition=self.args['decomposition'])
 
     @property
     def _concatenableMesh(self):
@@ -50,6 +50,7 @@ __docformat__ = 'restructuredtext'
 
 import os
 from fipy.solvers.pysparseMatrixSolver import _PysparseMatrixSolver
+from fipy.tools.performance import profiler
 
 __all__ = ["PysparseSolver"]
 
@@ -83,7 +84,8 @@ class PysparseSolver(_PysparseMatrixSolver):
         if self.preconditioner is None:
             P = None
         else:
-            P, A = self.preconditioner._applyToMatrix(A)
+            with profiler._section("solver", "preconditioner"):
+                P, A = self.preconditioner._applyToMatrix(A)
 
         info, iter, relres = self.solveFnc(A, b, x, self.tolerance,
                                            self.iterations, P)
@@ -113,7 +115,8 @@ class PysparseSolver(_PysparseMatrixSolver):
 
             raise SolutionVariableNumberError
 
-        self._solve_(self.matrix, array, self.RHSvector)
+        with profiler._section("solver", "_solve_"):
+            self._solve_(self.matrix, array, self.RHSvector)
         factor = self.var.unit.factor
         if factor != 1:
             array /= self.var.unit.factor
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+## -*-Pyth-*-
+ # ###################################################################
+ #  FiPy - Python-based finite volume PDE solver
+ #
+ #  FILE: "preconditioner.py"
+ #
+ #  Author: Jonathan Guyer <guyer@nist.gov>
+ #  Author: Daniel Wheeler <daniel.wheeler@nist.gov>
+ #  Author: James Warren   <jwarren@nist.gov>
+ #    mail: NIST
+ #     www: http://www.ctcms.nist.gov/fipy/
+ #
+ # ========================================================================
+ # This software was developed at the National Institute of Standards
+ # of Standards and Technology, an agency of the Federal Government.
+ # Pursuant to title 17 section 105 of the United States Code,
+ # United States Code this software is not subject to copyright
+ # protection, and this software is considered to be in the public domain.
+ # FiPy is an experimental system.
+ # NIST assumes no responsibility whatsoever for its use by whatsoever for its use by
+ # other parties, and makes no guarantees, expressed or implied, about
+ # its quality, reliability, or any other characteristic.  We would
+ # appreciate acknowledgement if the software is used.
+ #
+ # To the extent that NIST may hold copyright in countries other than the
+ # United States, you are hereby granted the non-exclusive irrevocable and
+ # unconditional right to print, publish, prepare derivative works and
+ # distribute this software, in any medium, or authorize others to do so on
+ # your behalf, on a royalty-free basis throughout the world.
+ #
+ # You may improve, modify, and create derivative works of the software or
+ # any portion of the software, and you may copy and distribute such
+ # modifications or works.  Modified works should carry a notice stating
+ # that you changed the software and should note the date and nature of any
+ # such change.  Please explicitly acknowledge the National Institute of
+ # Standards and Technology as the original source.
+ #
+ # This software can be redistributed and/or modified freely provided that
+ # any derivative works bear some notice that they are derived from it, and
+ # any modified versions bear some notice that they have been modified.
+ # ========================================================================
+ #
+ # ###################################################################
+ ##
+
+__docformat__ = 'restructuredtext'
+
+__all__ = ["Preconditioner"]
+
+from fipy.tools import numerix
+
+class Preconditioner:
+    """
+    Base preconditioner class for the Scipy Krylov solvers.
+
+    If `reuse` is `True`, the preconditioner built for one matrix is kept
+    and handed back for any later matrix with the same sparsity pattern,
+    avoiding its setup cost on every sweep at the price of preconditioning
+    with slightly stale values.
+
+        >>> from fipy import *
+        >>> from fipy.solvers.scipy.preconditioners import *
+        >>> mesh = Grid2D(nx=20, ny=20)
+        >>> for precon in (JacobiPreconditioner(),
+        ...                SsorPreconditioner(),
+        ...                ILUPreconditioner()):
+        ...     var = CellVariable(mesh=mesh)
+        ...     var.constrain(0., mesh.facesLeft)
+        ...     var.constrain(1., mesh.facesRight)
+        ...     DiffusionTerm().solve(var, solver=LinearPCGSolver(tolerance=1e-10,
+        ...                                                       precon=precon))
+        ...     print numerix.allclose(var, mesh.x / 20., atol=1e-6)
+        True
+        True
+        True
+
+        >>> precon = JacobiPreconditioner(reuse=True)
+        >>> solver = LinearPCGSolver(precon=precon)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(1., mesh.facesRight)
+        >>> DiffusionTerm().solve(var, solver=solver)
+        >>> M = precon._M
+        >>> DiffusionTerm(coeff=2.).solve(var, solver=solver)
+        >>> print precon._M is M
+        True
+
+    .. attention:: This class is abstract. Always create one of its subclasses.
+    """
+
+    def __init__(self, reuse=False):
+        """
+        Create a `Preconditioner` object.
+
+        :Parameters:
+          - `reuse`: Whether to keep the preconditioner for later matrices
+            with an unchanged sparsity pattern.
+        """
+        if self.__class__ is Preconditioner:
+            raise NotImplementedError, "can't instantiate abstract base class"
+
+        self.reuse = reuse
+        self._M = None
+        self._pattern = None
+
+    def _applyToMatrix(self, A):
+        """
+        Returns the `LinearOperator` used for Scipy preconditioning.
+        """
+        A = A.tocsr()
+
+        if not (self.reuse and self._M is not None and self._hasPattern(A)):
+            self._M = self._getPreconditioner(A)
+            if self.reuse:
+                self._pattern = (A.shape, A.indptr.copy(), A.indices.copy())
+
+        return self._M
+
+    def _hasPattern(self, A):
+        shape, indptr, indices = self._pattern
+        return (A.shape == shape
+                and numerix.array_equal(A.indptr, indptr)
+                and numerix.array_equal(A.indices, indices))
+
+    def _getPreconditioner(self, A):
+        """
+        Returns a `LinearOperator` approximating the inverse of the CSR
+        matrix `A`.
+        """
+        raise NotImplementedError
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+## -*-Pyth-*-
+ # ###################################################################
+ #  FiPy - Python-based finite volume PDE solver
+ #
+ #  FILE: "ssorPreconditioner.py"
+ #
+ #  Author: Jonathan Guyer <guyer@nist.gov>
+ #  Author: Daniel Wheeler <daniel.wheeler@nist.gov>
+ #  Author: James Warren   <jwarren@nist.gov>
+ #    mail: NIST
+ #     www: http://www.ctcms.nist.gov/fipy/
+ #
+ # ========================================================================
+ # This software was developed at the National Institute of Standards
+ # of Standards and Technology, an agency of the Federal Government.
+ # Pursuant to title 17 section 105 of the United States Code,
+ # United States Code this software is not subject to copyright
+ # protection, and this software is considered to be in the public domain.
+ # FiPy is an experimental system.
+ # NIST assumes no responsibility whatsoever for its use by whatsoever for its use by
+ # other parties, and makes no guarantees, expressed or implied, about
+ # its quality, reliability, or any other characteristic.  We would
+ # appreciate acknowledgement if the software is used.
+ #
+ # To the extent that NIST may hold copyright in countries other than the
+ # United States, you are hereby granted the non-exclusive irrevocable and
+ # unconditional right to print, publish, prepare derivative works and
+ # distribute this software, in any medium, or authorize others to do so on
+ # your behalf, on a royalty-free basis throughout the world.
+ #
+ # You may improve, modify, and create derivative works of the software or
+ # any portion of the software, and you may copy and distribute such
+ # modifications or works.  Modified works should carry a notice stating
+ # that you changed the software and should note the date and nature of any
+ # such change.  Please explicitly acknowledge the National Institute of
+ # Standards and Technology as the original source.
+ #
+ # This software can be redistributed and/or modified freely provided that
+ # any derivative works bear some notice that they are derived from it, and
+ # any modified versions bear some notice that they have been modified.
+ # ========================================================================
+ #
+ # ###################################################################
+ ##
+
+__docformat__ = 'restructuredtext'
+
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, splu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+
+__all__ = ["SsorPreconditioner"]
+
+class SsorPreconditioner(Preconditioner):
+    """
+    Symmetric successive over-relaxation preconditioner for Scipy.
+    """
+    def __init__(self, omega=1., reuse=False):
+        """
+        :Parameters:
+          - `omega`: The relaxation parameter, between 0 and 2.
+          - `reuse`: Whether to keep the preconditioner for later matrices
+            with an unchanged sparsity pattern.
+        """
+        Preconditioner.__init__(self, reuse=reuse)
+        self.omega = omega
+
+    def _getPreconditioner(self, A):
+        omega = self.omega
+        diag = A.diagonal()
+        D = sp.diags(diag, format="csc")
+
+        # a triangular matrix is its own LU factorization when it is
+        # neither permuted nor pivoted, so `splu` gives compiled
+        # triangular solves without any fill
+        lower = splu((D + omega * sp.tril(A, k=-1)).tocsc(),
+                     permc_spec="NATURAL", diag_pivot_thresh=0.)
+        upper = splu((D + omega * sp.triu(A, k=1)).tocsc(),
+                     permc_spec="NATURAL", diag_pivot_thresh=0.)
+
+        scale = omega * (2. - omega)
+
+        def matvec(x):
+            return scale * upper.solve(diag * lower.solve(x))
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
@@ -54,6 +54,7 @@ __all__ = []
 import os
 
 from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.tools.performance import profiler
 
 class _ScipyKrylovSolver(_ScipySolver):
     """
@@ -67,7 +68,8 @@ class _ScipyKrylovSolver(_ScipySolver):
         if self.preconditioner is None:
             M = None
         else:
-            M = self.preconditioner._applyToMatrix(A)
+            with profiler._section("solver", "preconditioner"):
+                M = self.preconditioner._applyToMatrix(A)
 
         x, info = self.solveFnc(A, b, x,
                                 tol=self.tolerance,
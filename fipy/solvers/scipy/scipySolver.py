@@ -54,6 +54,7 @@ __all__ = []
 from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
 from fipy.solvers.solver import Solver
 from fipy.tools import numerix
+from fipy.tools.performance import profiler
 
 class _ScipySolver(Solver):
     """
@@ -71,4 +72,7 @@ class _ScipySolver(Solver):
          if self.var.mesh.communicator.Nproc > 1:
              raise Exception("SciPy solvers cannot be used with multiple processors")
 
-         self.var[:] = numerix.reshape(self._solve_(self.matrix, self.var.ravel(), numerix.array(self.RHSvector)), self.var.shape)
+         with profiler._section("solver", "_solve_"):
+             x = self._solve_(self.matrix, self.var.ravel(), numerix.array(self.RHSvector))
+
+         self.var[:] = numerix.reshape(x, self.var.shape)
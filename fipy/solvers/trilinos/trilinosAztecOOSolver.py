@@ -54,6 +54,7 @@ from PyTrilinos import AztecOO
 
 from fipy.solvers.trilinos.trilinosSolver import TrilinosSolver
 from fipy.solvers.trilinos.preconditioners.jacobiPreconditioner import JacobiPreconditioner
+from fipy.tools.performance import profiler
 
 __all__ = ["TrilinosAztecOOSolver"]
 
@@ -89,7 +90,8 @@ class TrilinosAztecOOSolver(TrilinosSolver):
         Solver.SetAztecOption(AztecOO.AZ_output, AztecOO.AZ_none)
 
         if self.preconditioner is not None:
-            self.preconditioner._applyToSolver(solver=Solver, matrix=L)
+            with profiler._section("solver", "preconditioner"):
+                self.preconditioner._applyToSolver(solver=Solver, matrix=L)
         else:
             Solver.SetAztecOption(AztecOO.AZ_precond, AztecOO.AZ_none)
 
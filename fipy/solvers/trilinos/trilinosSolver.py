@@ -53,6 +53,7 @@ from PyTrilinos import EpetraExt
 
 from fipy.solvers.solver import Solver
 from fipy.tools import numerix
+from fipy.tools.performance import profiler
 
 class TrilinosSolver(Solver):
 
@@ -125,9 +126,10 @@ class TrilinosSolver(Solver):
 
             raise SolutionVariableNumberError
 
-        self._solve_(globalMatrix.matrix,
-                     nonOverlappingVector,
-                     nonOverlappingRHSvector)
+        with profiler._section("solver", "_solve_"):
+            self._solve_(globalMatrix.matrix,
+                         nonOverlappingVector,
+                         nonOverlappingRHSvector)
 
         overlappingVector.Import(nonOverlappingVector,
                                  Epetra.Import(globalMatrix.colMap,
@@ -62,8 +62,8 @@ class PIDStepper(Stepper):
            pages =   {201-231},
         }
     """
-    def __init__(self, vardata=(), proportional=0.075, integral=0.175, derivative=0.01):
-        Stepper.__init__(self, vardata=vardata)
+    def __init__(self, vardata=(), proportional=0.075, integral=0.175, derivative=0.01, recycleMatrices=False):
+        Stepper.__init__(self, vardata=vardata, recycleMatrices=recycleMatrices)
 
         self.proportional = proportional
         self.integral = integral
@@ -86,6 +86,8 @@ class PIDStepper(Stepper):
 
                 for var, eqn, bcs in self.vardata:
                     var.setValue(var.old)
+                    if self.recycleMatrices:
+                        eqn._recycleMatrices()
 
                 factor = min(1. / self.error[2], 0.8)
 
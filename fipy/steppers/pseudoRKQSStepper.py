@@ -56,8 +56,8 @@ class PseudoRKQSStepper(Stepper):
     Not really appropriate, since we're not doing Runge-Kutta steps
     in the first place, but works OK.
     """
-    def __init__(self, vardata=(), safety=0.9, pgrow=-0.2, pshrink=-0.25, errcon=1.89e-4):
-        Stepper.__init__(self, vardata=vardata)
+    def __init__(self, vardata=(), safety=0.9, pgrow=-0.2, pshrink=-0.25, errcon=1.89e-4, recycleMatrices=False):
+        Stepper.__init__(self, vardata=vardata, recycleMatrices=recycleMatrices)
         self.safety = safety
         self.pgrow = pgrow
         self.pshrink = pshrink
@@ -75,6 +75,8 @@ class PseudoRKQSStepper(Stepper):
                 # revert
                 for var, eqn, bcs in self.vardata:
                     var.setValue(var.old)
+                    if self.recycleMatrices:
+                        eqn._recycleMatrices()
 
                     dt = max(self.safety * dt * residual**self.pgrow, 0.1 * dt)
 
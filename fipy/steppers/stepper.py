@@ -48,8 +48,18 @@ __docformat__ = 'restructuredtext'
 __all__ = ["Stepper"]
 
 class Stepper:
-    def __init__(self, vardata=()):
+    """
+    :Parameters:
+      - `vardata`: a sequence of `(var, eqn, bcs)` tuples
+      - `recycleMatrices`: if `True`, the matrices of the terms that don't
+        depend on `dt` are kept from the first sweep of a step and reused
+        for the first sweep of each retry after a rejected step. This is
+        only valid if those terms depend on nothing but the variables in
+        `vardata`, which are reset to their old values on rejection.
+    """
+    def __init__(self, vardata=(), recycleMatrices=False):
         self.vardata = vardata
+        self.recycleMatrices = recycleMatrices
 
     def sweepFn(vardata, dt, *args, **kwargs):
         residual = 0
@@ -100,10 +110,17 @@ class Stepper:
 
             for var, eqn, bcs in self.vardata:
                 var.updateOld()
-
-            dtPrev, dtTry = self._step(dt=dtTry, dtPrev=dtPrev,
-                                       sweepFn=sweepFn, failFn=failFn,
-                                       *args, **kwargs)
+                if self.recycleMatrices:
+                    eqn._startRecycling()
+
+            try:
+                dtPrev, dtTry = self._step(dt=dtTry, dtPrev=dtPrev,
+                                           sweepFn=sweepFn, failFn=failFn,
+                                           *args, **kwargs)
+            finally:
+                if self.recycleMatrices:
+                    for var, eqn, bcs in self.vardata:
+                        eqn._stopRecycling()
 
             self.elapsed += dtPrev
 
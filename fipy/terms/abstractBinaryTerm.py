@@ -115,6 +115,13 @@ class _AbstractBinaryTerm(Term):
             self._internalVars = self._calcVars()
         return self._internalVars
 
+    @property
+    def _cacheFlags(self):
+        """Whether each node of the tree caches its matrix or right-hand side
+        """
+        return (self._cacheMatrix, self._cacheRHSvector,
+                self.term._cacheFlags, self.other._cacheFlags)
+
     @property
     def _transientVars(self):
         return self.term._transientVars + self.other._transientVars
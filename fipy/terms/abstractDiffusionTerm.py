@@ -52,6 +52,7 @@ __all__ = []
 import os
 
 from fipy.terms.unaryTerm import _UnaryTerm
+from fipy.tools.performance import profiler
 from fipy.tools import numerix
 from fipy.terms import TermMultiplyError
 from fipy.terms import AbstractBaseClassError
@@ -281,7 +282,8 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
     def __doBCs(self, SparseMatrix, higherOrderBCs, N, M, coeffs, coefficientMatrix, boundaryB):
         for boundaryCondition in higherOrderBCs:
-            LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffs)
+            with profiler._section("boundaryConditions", boundaryCondition.__class__.__name__):
+                LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffs)
             if 'FIPY_DISPLAY_MATRIX' in os.environ:
                 self._viewer.title = r"%s %s" % (boundaryCondition.__class__.__name__, self.__class__.__name__)
                 self._viewer.plot(matrix=LL, RHSvector=bb)
@@ -68,7 +68,7 @@ class _BinaryTerm(_AbstractBinaryTerm):
         matrix = SparseMatrix(mesh=var.mesh)
         RHSvector = 0
 
-        for term in (self.term, self.other):
+        for term in self._leafTerms:
 
             tmpVar, tmpMatrix, tmpRHSvector = term._buildAndAddMatrices(var,
                                                                         SparseMatrix,
@@ -103,6 +103,50 @@ class _BinaryTerm(_AbstractBinaryTerm):
     def _uncoupledTerms(self):
         return [self]
 
+    @property
+    def _leafTerms(self):
+        """Constituent `Term` objects of the binary tree
+
+        The tree is flattened, so that the matrices of all of the
+        constituent terms are summed into a single matrix and right-hand
+        side, rather than into a new matrix at each node of the tree.
+        Nodes that cache their matrix or right-hand side are kept whole,
+        so the tree is flattened again whenever a node starts caching.
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=3)
+        >>> v = CellVariable(mesh=m)
+        >>> eq = TransientTerm(var=v) == DiffusionTerm(var=v) + ImplicitSourceTerm(var=v) + 1.
+        >>> print [term.__class__.__name__ for term in eq._leafTerms]
+        ['TransientTerm', 'DiffusionTerm', 'ImplicitSourceTerm', '_ExplicitSourceTerm']
+
+        >>> eq = TransientTerm(var=v) == DiffusionTerm(var=v) + ImplicitSourceTerm(var=v)
+        >>> eq.other.cacheMatrix()
+        >>> print [term.__class__.__name__ for term in eq._leafTerms]
+        ['TransientTerm', '_BinaryTerm']
+
+        A node can start caching after the equation has been solved
+
+        >>> v.value = 1.
+        >>> eq = TransientTerm() == DiffusionTerm() + ImplicitSourceTerm(1.)
+        >>> eq.solve(v, dt=1.)
+        >>> eq.other.cacheMatrix()
+        >>> eq.solve(v, dt=1.)
+        >>> print eq.other.matrix is None
+        False
+        """
+        flags = self._cacheFlags
+        if not hasattr(self, '_internalLeafTerms') or self._internalLeafTermsFlags != flags:
+            self._internalLeafTermsFlags = flags
+            self._internalLeafTerms = []
+            for term in (self.term, self.other):
+                if term._cacheMatrix or term._cacheRHSvector:
+                    self._internalLeafTerms.append(term)
+                else:
+                    self._internalLeafTerms += term._leafTerms
+
+        return self._internalLeafTerms
+
     def _getTransientGeomCoeff(self, var):
         return self._addNone(self.term._getTransientGeomCoeff(var), self.other._getTransientGeomCoeff(var))
 
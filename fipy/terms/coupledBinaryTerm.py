@@ -87,6 +87,13 @@ class _CoupledBinaryTerm(_AbstractBinaryTerm):
     def _uncoupledTerms(self):
         return self.term._uncoupledTerms + self.other._uncoupledTerms
 
+    @property
+    def _leafTerms(self):
+        leafTerms = []
+        for uncoupledTerm in self._uncoupledTerms:
+            leafTerms += uncoupledTerm._leafTerms
+        return leafTerms
+
     def _verifyVar(self, var):
         if var is not None:
             raise SolutionVariableNumberError('The solution variable should not be specified.')
@@ -118,26 +125,39 @@ class _CoupledBinaryTerm(_AbstractBinaryTerm):
 
             SparseMatrix.equationIndex = equationIndex
             termRHSvector = 0
-            termMatrix = SparseMatrix(mesh=var.mesh)
+            if uncoupledTerm._cacheMatrix:
+                termMatrix = SparseMatrix(mesh=var.mesh)
+            else:
+                termMatrix = None
 
             for varIndex, tmpVar in enumerate(var.vars):
 
                 SparseMatrix.varIndex = varIndex
 
-                tmpVar, tmpMatrix, tmpRHSvector = uncoupledTerm._buildAndAddMatrices(tmpVar,
-                                                                                     SparseMatrix,
-                                                                                     boundaryConditions=(),
-                                                                                     dt=dt,
-                                                                                     transientGeomCoeff=uncoupledTerm._getTransientGeomCoeff(tmpVar),
-                                                                                     diffusionGeomCoeff=uncoupledTerm._getDiffusionGeomCoeff(tmpVar),
-                                                                                     buildExplicitIfOther=buildExplicitIfOther)
+                transientGeomCoeff = uncoupledTerm._getTransientGeomCoeff(tmpVar)
+                diffusionGeomCoeff = uncoupledTerm._getDiffusionGeomCoeff(tmpVar)
+
+                # every block is summed directly into the coupled matrix,
+                # rather than into a matrix for each equation
+                for term in uncoupledTerm._leafTerms:
+                    _, tmpMatrix, tmpRHSvector = term._buildAndAddMatrices(tmpVar,
+                                                                           SparseMatrix,
+                                                                           boundaryConditions=(),
+                                                                           dt=dt,
+                                                                           transientGeomCoeff=transientGeomCoeff,
+                                                                           diffusionGeomCoeff=diffusionGeomCoeff,
+                                                                           buildExplicitIfOther=buildExplicitIfOther)
+
+                    matrix += tmpMatrix
+                    if termMatrix is not None:
+                        termMatrix += tmpMatrix
+                    termRHSvector += tmpRHSvector
 
-                termMatrix += tmpMatrix
-                termRHSvector += tmpRHSvector
+                    if term is not uncoupledTerm:
+                        term._buildCache(tmpMatrix, tmpRHSvector)
 
             uncoupledTerm._buildCache(termMatrix, termRHSvector)
             RHSvectors += [CellVariable(value=termRHSvector, mesh=var.mesh)]
-            matrix += termMatrix
 
         return (var, matrix, _CoupledCellVariable(RHSvectors))
 
@@ -48,6 +48,7 @@
 __docformat__ = 'restructuredtext'
 
 from fipy.terms.abstractDiffusionTerm import _AbstractDiffusionTerm
+from fipy.matrices.operatorMatrix import _OperatorMatrix
 
 __all__ = ["ExplicitDiffusionTerm"]
 
@@ -72,7 +73,9 @@ class ExplicitDiffusionTerm(_AbstractDiffusionTerm):
         else:
             varOld = var
 
-        varOld, L, b = _AbstractDiffusionTerm._buildMatrix(self, varOld, SparseMatrix, boundaryConditions = boundaryConditions, dt = dt,
+        # the matrix is only ever applied to `var`, so it need not be assembled
+        varOld, L, b = _AbstractDiffusionTerm._buildMatrix(self, varOld, self._getMatrixClass(None, var, SparseMatrix=_OperatorMatrix),
+                                                  boundaryConditions = boundaryConditions, dt = dt,
                                                   transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
 
         return (var, SparseMatrix(mesh=var.mesh), b - L * var.value)
@@ -53,6 +53,8 @@ from fipy.terms.nonDiffusionTerm import _NonDiffusionTerm
 from fipy.tools import vector
 from fipy.tools import numerix
 from fipy.tools import inline
+from fipy.matrices.operatorMatrix import _OperatorMatrix
+from fipy.tools.performance import profiler
 
 __all__ = ["FaceTerm"]
 
@@ -93,7 +95,8 @@ class FaceTerm(_NonDiffusionTerm):
         M = mesh._maxFacesPerCell
 
         for boundaryCondition in boundaryConditions:
-            LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffMatrix)
+            with profiler._section("boundaryConditions", boundaryCondition.__class__.__name__):
+                LL, bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffMatrix)
 
             if 'FIPY_DISPLAY_MATRIX' in os.environ:
                 self._viewer.title = r"%s %s" % (boundaryCondition.__class__.__name__, self.__class__.__name__)
@@ -115,9 +118,13 @@ class FaceTerm(_NonDiffusionTerm):
         N = mesh.numberOfCells
         M = mesh._maxFacesPerCell
 
+        # the boundary matrices are only ever applied to `oldArray`
+        SparseMatrix = self._getMatrixClass(None, var, SparseMatrix=_OperatorMatrix)
+
         for boundaryCondition in boundaryConditions:
 
-            LL,bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffMatrix)
+            with profiler._section("boundaryConditions", boundaryCondition.__class__.__name__):
+                LL,bb = boundaryCondition._buildMatrix(SparseMatrix, N, M, coeffMatrix)
             if LL != 0:
 ##              b -= LL.takeDiagonal() * numerix.array(oldArray)
                 b -= LL * numerix.array(oldArray)
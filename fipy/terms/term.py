@@ -52,6 +52,7 @@ import os
 from fipy.tools import numerix
 from fipy.terms import AbstractBaseClassError
 from fipy.terms import SolutionVariableRequiredError
+from fipy.tools.performance import profiler
 
 __all__ = ["Term"]
 
@@ -111,6 +112,62 @@ class Term(object):
         else:
             self._RHSvector = None
 
+    # whether the matrix depends on the time step
+    _dependsOnDt = False
+    # matrices recorded while a `Stepper` tries a step, or `None`
+    _recordedMatrices = None
+    _recyclableMatrices = ()
+
+    def _startRecycling(self):
+        """Record the matrices of the constituent terms during a step
+
+        The matrices of terms that don't depend on `dt` are identical for
+        the first sweep of each attempt at a step, because the variables
+        are reset to their old values when an attempt is rejected.
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=3)
+        >>> v = CellVariable(mesh=m, value=(0., 1., 0.), hasOld=True)
+        >>> D = Variable(1.)
+        >>> eq = TransientTerm(var=v) == DiffusionTerm(coeff=D, var=v)
+        >>> eq.cacheMatrix()
+        >>> eq._startRecycling()
+        >>> res = eq.sweep(dt=1., solver=DummySolver())
+        >>> print numerix.allclose(eq.matrix.numpyArray,
+        ...                        [[2, -1, 0], [-1, 3, -1], [0, -1, 2]])
+        True
+
+        After a rejected step, the `DiffusionTerm` is not rebuilt for the
+        next sweep, but the `TransientTerm` is rebuilt with the new `dt`
+
+        >>> D.setValue(2.)
+        >>> eq._recycleMatrices()
+        >>> res = eq.sweep(dt=0.5, solver=DummySolver())
+        >>> print numerix.allclose(eq.matrix.numpyArray,
+        ...                        [[3, -1, 0], [-1, 4, -1], [0, -1, 3]])
+        True
+        >>> res = eq.sweep(dt=0.5, solver=DummySolver())
+        >>> print numerix.allclose(eq.matrix.numpyArray,
+        ...                        [[4, -2, 0], [-2, 6, -2], [0, -2, 4]])
+        True
+        >>> eq._stopRecycling()
+        """
+        for term in self._leafTerms:
+            if term is not self and not term._dependsOnDt:
+                term._recordedMatrices = {}
+                term._recyclableMatrices = set()
+
+    def _recycleMatrices(self):
+        """Reuse the recorded matrices for the next sweep after a rejected step"""
+        for term in self._leafTerms:
+            if term._recordedMatrices is not None:
+                term._recyclableMatrices = set(term._recordedMatrices.keys())
+
+    def _stopRecycling(self):
+        for term in self._leafTerms:
+            term._recordedMatrices = None
+            term._recyclableMatrices = ()
+
     def _verifyVar(self, var):
         if var is None:
             if self.var is None:
@@ -133,20 +190,19 @@ class Term(object):
         else:
             return var.shape[0]
 
-    def _getMatrixClass(self, solver, var):
+    def _getMatrixClass(self, solver, var, SparseMatrix=None):
+        if SparseMatrix is None:
+            SparseMatrix = solver._matrixClass
+
         if self._vectorSize(var) > 1:
             from fipy.matrices.offsetSparseMatrix import OffsetSparseMatrix
-            SparseMatrix =  OffsetSparseMatrix(SparseMatrix=solver._matrixClass,
+            SparseMatrix =  OffsetSparseMatrix(SparseMatrix=SparseMatrix,
                                                numberOfVariables=self._vectorSize(var),
                                                numberOfEquations=self._vectorSize(var))
-        else:
-            SparseMatrix = solver._matrixClass
 
         return SparseMatrix
 
-    def _prepareLinearSystem(self, var, solver, boundaryConditions, dt):
-        solver = self.getDefaultSolver(var, solver)
-
+    def _prepareVarAndBoundaryConditions(self, var, boundaryConditions):
         var = self._verifyVar(var)
         self._checkVar(var)
 
@@ -156,6 +212,13 @@ class Term(object):
         for bc in boundaryConditions:
             bc._resetBoundaryConditionApplied()
 
+        return var, boundaryConditions
+
+    def _prepareLinearSystem(self, var, solver, boundaryConditions, dt):
+        solver = self.getDefaultSolver(var, solver)
+
+        var, boundaryConditions = self._prepareVarAndBoundaryConditions(var, boundaryConditions)
+
         if 'FIPY_DISPLAY_MATRIX' in os.environ:
             if not hasattr(self, "_viewer"):
                 from fipy.viewers.matplotlibViewer.matplotlibSparseMatrixViewer import MatplotlibSparseMatrixViewer
@@ -171,7 +234,8 @@ class Term(object):
 
         self._buildCache(matrix, RHSvector)
 
-        solver._storeMatrix(var=var, matrix=matrix, RHSvector=RHSvector)
+        with profiler._section("solver", "_storeMatrix"):
+            solver._storeMatrix(var=var, matrix=matrix, RHSvector=RHSvector)
 
         if 'FIPY_DISPLAY_MATRIX' in os.environ:
             if var is None:
@@ -208,9 +272,10 @@ class Term(object):
 
         """
 
-        solver = self._prepareLinearSystem(var, solver, boundaryConditions, dt)
+        with profiler._sweep(self):
+            solver = self._prepareLinearSystem(var, solver, boundaryConditions, dt)
 
-        solver._solve()
+            solver._solve()
 
     def sweep(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None, cacheResidual=False, cacheError=False):
         r"""
@@ -233,25 +298,29 @@ class Term(object):
               and store it in the `errorVector` member of `Term`
 
         """
-        solver = self._prepareLinearSystem(var=var, solver=solver, boundaryConditions=boundaryConditions, dt=dt)
-        solver._applyUnderRelaxation(underRelaxation=underRelaxation)
-        residual = solver._calcResidual(residualFn=residualFn)
-
-        if cacheResidual or cacheError:
-            self.residualVector = solver._calcResidualVector(residualFn=residualFn)
-
-        if cacheError:
-            self.errorVector = solver.var.copy()
-            var_tmp = solver.var
-            RHS_tmp = solver.RHSvector
-            solver._storeMatrix(var=self.errorVector, matrix=solver.matrix, RHSvector=self.residualVector)
-            solver._solve()
-            solver._storeMatrix(var=var_tmp, matrix=solver.matrix, RHSvector=RHS_tmp)
-
-        if not cacheResidual:
-            self.residualVector = None
+        with profiler._sweep(self):
+            solver = self._prepareLinearSystem(var=var, solver=solver, boundaryConditions=boundaryConditions, dt=dt)
+            if underRelaxation is not None:
+                with profiler._section("solver", "_applyUnderRelaxation"):
+                    solver._applyUnderRelaxation(underRelaxation=underRelaxation)
+            with profiler._section("solver", "_calcResidual"):
+                residual = solver._calcResidual(residualFn=residualFn)
+
+                if cacheResidual or cacheError:
+                    self.residualVector = solver._calcResidualVector(residualFn=residualFn)
+
+            if cacheError:
+                self.errorVector = solver.var.copy()
+                var_tmp = solver.var
+                RHS_tmp = solver.RHSvector
+                solver._storeMatrix(var=self.errorVector, matrix=solver.matrix, RHSvector=self.residualVector)
+                solver._solve()
+                solver._storeMatrix(var=var_tmp, matrix=solver.matrix, RHSvector=RHS_tmp)
+
+            if not cacheResidual:
+                self.residualVector = None
 
-        solver._solve()
+            solver._solve()
 
         return residual
 
@@ -278,12 +347,88 @@ class Term(object):
         >>> len(DiffusionTerm().justResidualVector(v)) == m.numberOfCells
         True
 
+        Unless the matrix or the residual must be kept, the residual is
+        found by applying the `Term` to `var` without assembling a matrix.
+
+        >>> v.value = m.cellCenters[0]**2
+        >>> eq = (TransientTerm() == DiffusionTerm(coeff=2.)
+        ...       + ExponentialConvectionTerm(coeff=(1.,)) + 3.)
+        >>> matrixFree = eq.justResidualVector(v, dt=.1, underRelaxation=.5)
+        >>> assembled = eq.justResidualVector(v, dt=.1, underRelaxation=.5,
+        ...                                   residualFn=lambda var, matrix, RHSvector:
+        ...                                       matrix * var.value - RHSvector)
+        >>> print numerix.allclose(matrixFree, assembled)
+        True
+
+        The diagonal of a higher order `DiffusionTerm` needs an assembled
+        matrix to be under-relaxed.
+
+        >>> m = Grid1D(nx=6)
+        >>> v = CellVariable(mesh=m, value=m.cellCenters[0]**3)
+        >>> eq = TransientTerm() == DiffusionTerm(coeff=(1., 1.))
+        >>> print eq.justResidualVector(v, dt=1., underRelaxation=0.5)
+        [  -5.75   -0.25    0.      0.    108.25 -102.25]
+
         """
+        if residualFn is None and self._canApplyWithoutMatrix(var):
+            residual = self._applyWithoutMatrix(var, boundaryConditions, dt, underRelaxation)
+            if residual is not None:
+                return residual
+
         solver = self._prepareLinearSystem(var, solver, boundaryConditions, dt)
         solver._applyUnderRelaxation(underRelaxation)
 
         return solver._calcResidualVector(residualFn=residualFn)
 
+    def _canApplyWithoutMatrix(self, var):
+        """Whether the residual can be calculated without assembling a matrix
+
+        An assembled matrix is needed if it is to be cached or displayed,
+        if the matrices of the constituent terms are being recorded by a
+        `Stepper`, or to communicate the overlapping cells in parallel.
+        """
+        if var is None:
+            var = self.var
+        if var is None or var.mesh.communicator.Nproc > 1:
+            return False
+        if 'FIPY_DISPLAY_MATRIX' in os.environ:
+            return False
+        for term in [self] + self._leafTerms:
+            if (term._cacheMatrix or term._cacheRHSvector
+                or term._recordedMatrices is not None):
+                return False
+        return True
+
+    def _applyWithoutMatrix(self, var, boundaryConditions, dt, underRelaxation):
+        r"""Calculate the residual :math:`\vec{r}=\mathsf{L}\vec{x} - \vec{b}`
+        by applying the `Term` to `var` as an `_OperatorMatrix`
+
+        Returns `None` if under-relaxation is requested, but the diagonal of
+        the operator, e.g., of the products of a higher order
+        `DiffusionTerm`, is not known without assembling it.
+        """
+        from fipy.matrices.operatorMatrix import _OperatorMatrix
+
+        var, boundaryConditions = self._prepareVarAndBoundaryConditions(var, boundaryConditions)
+
+        var, matrix, RHSvector = self._buildAndAddMatrices(var,
+                                                           self._getMatrixClass(None, var, SparseMatrix=_OperatorMatrix),
+                                                           boundaryConditions=boundaryConditions,
+                                                           dt=dt,
+                                                           transientGeomCoeff=self._getTransientGeomCoeff(var),
+                                                           diffusionGeomCoeff=self._getDiffusionGeomCoeff(var),
+                                                           buildExplicitIfOther=self._buildExplcitIfOther)
+
+        value = numerix.array(var).flatten()
+
+        if underRelaxation is not None:
+            if matrix._products:
+                return None
+            matrix.putDiagonal(matrix.takeDiagonal() / underRelaxation)
+            RHSvector += (1 - underRelaxation) * matrix.takeDiagonal() * value
+
+        return matrix * value - RHSvector
+
     def residualVectorAndNorm(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None):
         r"""
         Builds the `Term`'s linear system once. This method
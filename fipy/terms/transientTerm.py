@@ -164,6 +164,8 @@ class TransientTerm(CellTerm):
     def _transientVars(self):
         return self._vars
 
+    _dependsOnDt = True
+
     def _checkDt(self, dt):
         if dt is None:
             raise TypeError, "`dt` must be specified."
@@ -53,6 +53,8 @@ import os
 
 from fipy.tools import numerix
 from fipy.terms.term import Term
+from fipy.matrices.operatorMatrix import _OperatorMatrix
+from fipy.tools.performance import profiler
 
 class _UnaryTerm(Term):
 
@@ -68,6 +70,14 @@ class _UnaryTerm(Term):
     def _uncoupledTerms(self):
         return [self]
 
+    @property
+    def _leafTerms(self):
+        return [self]
+
+    @property
+    def _cacheFlags(self):
+        return (self._cacheMatrix, self._cacheRHSvector)
+
     def __repr__(self):
         """
         The representation of a `Term` object is given by,
@@ -103,21 +113,35 @@ class _UnaryTerm(Term):
 
         """
 
+        # the block of a coupled matrix is identified by the indices of
+        # its equation and variable
+        key = (var,
+               getattr(SparseMatrix, 'equationIndex', None),
+               getattr(SparseMatrix, 'varIndex', None),
+               buildExplicitIfOther)
+
+        if key in self._recyclableMatrices:
+            self._recyclableMatrices.remove(key)
+            matrix, RHSvector = self._recordedMatrices[key]
+            return (var, matrix, RHSvector)
+
         if var is self.var or self.var is None:
-            var, matrix, RHSvector = self._buildMatrix(var,
-                                                       SparseMatrix,
-                                                       boundaryConditions=boundaryConditions,
-                                                       dt=dt,
-                                                       transientGeomCoeff=transientGeomCoeff,
-                                                       diffusionGeomCoeff=diffusionGeomCoeff)
+            with profiler._section("terms", self.__class__.__name__):
+                var, matrix, RHSvector = self._buildMatrix(var,
+                                                           SparseMatrix,
+                                                           boundaryConditions=boundaryConditions,
+                                                           dt=dt,
+                                                           transientGeomCoeff=transientGeomCoeff,
+                                                           diffusionGeomCoeff=diffusionGeomCoeff)
         elif buildExplicitIfOther:
-            _, matrix, RHSvector = self._buildMatrix(self.var,
-                                                     SparseMatrix,
-                                                     boundaryConditions=boundaryConditions,
-                                                     dt=dt,
-                                                     transientGeomCoeff=transientGeomCoeff,
-                                                     diffusionGeomCoeff=diffusionGeomCoeff)
-            RHSvector = RHSvector - matrix * self.var.value
+            with profiler._section("terms", self.__class__.__name__):
+                _, matrix, RHSvector = self._buildMatrix(self.var,
+                                                         self._getMatrixClass(None, self.var, SparseMatrix=_OperatorMatrix),
+                                                         boundaryConditions=boundaryConditions,
+                                                         dt=dt,
+                                                         transientGeomCoeff=transientGeomCoeff,
+                                                         diffusionGeomCoeff=diffusionGeomCoeff)
+                RHSvector = RHSvector - matrix * self.var.value
             matrix = SparseMatrix(mesh=var.mesh)
         else:
             RHSvector = numerix.zeros(len(var.ravel()),'d')
@@ -129,6 +153,9 @@ class _UnaryTerm(Term):
              self._viewer.plot(matrix=matrix, RHSvector=RHSvector)
              raw_input()
 
+        if self._recordedMatrices is not None and key not in self._recordedMatrices:
+            self._recordedMatrices[key] = (matrix, RHSvector)
+
         return (var, matrix, RHSvector)
 
     def _reshapeIDs(self, var, ids):
@@ -52,6 +52,7 @@ def _TestClass(base):
         # name), and help string.
         user_options = base.user_options + [
             ('inline', None, "run FiPy with inline compilation enabled"),
+            ('numexpr', None, "run FiPy with numexpr evaluation of Variable expressions"),
             ('pythoncompiled=', None, "directory in which to put weave's work product"),
             ('Trilinos', None, "run FiPy using Trilinos solvers"),
             ('Pysparse', None, "run FiPy using Pysparse solvers (default)"),
@@ -84,6 +85,7 @@ def _TestClass(base):
             self.viewers = False
 
             self.inline = False
+            self.numexpr = False
             self.pythoncompiled = None
             self.cache = False
             self.no_cache = True
@@ -227,6 +229,13 @@ def _TestClass(base):
                     print >>sys.stderr, "!!! weave library is not installed"
                     return
 
+            if self.numexpr:
+                try:
+                    import numexpr
+                except ImportError, a:
+                    print >>sys.stderr, "!!! numexpr library is not installed"
+                    return
+
             if self.pythoncompiled is not None:
                 import os
                 os.environ['PYTHONCOMPILED'] = self.pythoncompiled
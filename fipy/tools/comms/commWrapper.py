@@ -93,6 +93,12 @@ class CommWrapper(object):
     def allgather(self, obj):
         return obj
 
+    def exchange(self, sends, sources):
+        """Send `sends[rank]` to each `rank` and receive an object from each
+        of the `sources`, returning them as a dictionary keyed by rank
+        """
+        return dict((rank, sends[rank]) for rank in sources)
+
     def sum(self, a, axis=None):
         summed = numerix.array(a).sum(axis=axis)
         shape = summed.shape
@@ -94,3 +94,14 @@ class Mpi4pyCommWrapper(CommWrapper):
 
         """
         return self.mpi4py_comm.allgather(sendobj=obj)
+
+    def exchange(self, sends, sources):
+        """Send `sends[rank]` to each `rank` and receive an object from each
+        of the `sources`, returning them as a dictionary keyed by rank
+
+        Only the processes named take part, unlike `allgather`.
+        """
+        requests = [self.mpi4py_comm.isend(obj, dest=rank) for rank, obj in sends.items()]
+        received = dict((rank, self.mpi4py_comm.recv(source=rank)) for rank in sources)
+        self.MPI.Request.Waitall(requests)
+        return received
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+
+## -*-Pyth-*-
+ # ###################################################################
+ #  FiPy - Python-based finite volume PDE solver
+ #
+ #  FILE: "threadCommWrapper.py"
+ #
+ #  Author: Jonathan Guyer <guyer@nist.gov>
+ #  Author: Daniel Wheeler <daniel.wheeler@nist.gov>
+ #  Author: James Warren   <jwarren@nist.gov>
+ #    mail: NIST
+ #     www: http://www.ctcms.nist.gov/fipy/
+ #
+ # ========================================================================
+ # This software was developed at the National Institute of Standards
+ # of Standards and Technology, an agency of the Federal Government.
+ # Pursuant to title 17 section 105 of the United States Code,
+ # United States Code this software is not subject to copyright
+ # protection, and this software is considered to be in the public domain.
+ # FiPy is an experimental system.
+ # NIST assumes no responsibility whatsoever for its use by whatsoever for its use by
+ # other parties, and makes no guarantees, expressed or implied, about
+ # its quality, reliability, or any other characteristic.  We would
+ # appreciate acknowledgement if the software is used.
+ #
+ # To the extent that NIST may hold copyright in countries other than the
+ # United States, you are hereby granted the non-exclusive irrevocable and
+ # unconditional right to print, publish, prepare derivative works and
+ # distribute this software, in any medium, or authorize others to do so on
+ # your behalf, on a royalty-free basis throughout the world.
+ #
+ # You may improve, modify, and create derivative works of the software or
+ # any portion of the software, and you may copy and distribute such
+ # modifications or works.  Modified works should carry a notice stating
+ # that you changed the software and should note the date and nature of any
+ # such change.  Please explicitly acknowledge the National Institute of
+ # Standards and Technology as the original source.
+ #
+ # This software can be redistributed and/or modified freely provided that
+ # any derivative works bear some notice that they are derived from it, and
+ # any modified versions bear some notice that they have been modified.
+ # ========================================================================
+ #
+ # ###################################################################
+ ##
+
+"""Communicator among the threads of a single process
+
+`ThreadCommWrapper` stands in for an MPI communicator, so that code
+written for several processes can be tested without `mpirun`. Each
+thread started by `runThreads` plays one process and gets a
+communicator of its own, with the rank of that process.
+
+    >>> def ranks(comm):
+    ...     return comm.procID, comm.Nproc, comm.allgather(comm.procID)
+    >>> for result in runThreads(ranks, Nproc=3):
+    ...     print result
+    (0, 3, [0, 1, 2])
+    (1, 3, [0, 1, 2])
+    (2, 3, [0, 1, 2])
+
+Reductions combine the values of every thread
+
+    >>> def reduce(comm):
+    ...     value = numerix.array([comm.procID, -comm.procID])
+    ...     return (comm.sum(value[0]), comm.MaxAll(value), comm.MinAll(value),
+    ...             comm.any(value > 1), comm.all(value >= 0))
+    >>> print runThreads(reduce, Nproc=3)[0]
+    (3, array([2, 0]), array([ 0, -2]), True, False)
+
+and `exchange` only passes messages between the threads named
+
+    >>> def ring(comm):
+    ...     right = (comm.procID + 1) % comm.Nproc
+    ...     left = (comm.procID - 1) % comm.Nproc
+    ...     return comm.exchange({right: comm.procID}, sources=[left])
+    >>> print runThreads(ring, Nproc=4)
+    [{3: 3}, {0: 0}, {1: 1}, {2: 2}]
+
+An exception in any thread is raised again once all of them have
+stopped, rather than leaving the others waiting forever
+
+    >>> def fail(comm):
+    ...     if comm.procID == 1:
+    ...         raise ValueError("rank 1 failed")
+    ...     comm.Barrier()
+    >>> runThreads(fail, Nproc=2)
+    Traceback (most recent call last):
+        ...
+    ValueError: rank 1 failed
+"""
+__docformat__ = 'restructuredtext'
+
+import sys
+import threading
+
+from fipy.tools import numerix
+from fipy.tools.comms.commWrapper import CommWrapper
+
+__all__ = ["ThreadCommWrapper", "runThreads"]
+
+class _Abort(Exception):
+    pass
+
+class _SharedState(object):
+    """State common to all of the communicators of a group of threads"""
+    def __init__(self, Nproc):
+        self.Nproc = Nproc
+        self.condition = threading.Condition()
+        self.arrived = 0
+        self.generation = 0
+        self.gathered = [None] * Nproc
+        self.mailboxes = {}
+        self.failed = False
+
+    def wait(self, ready):
+        """Wait, holding `condition`, until `ready()` is true"""
+        while not ready():
+            if self.failed:
+                raise _Abort()
+            self.condition.wait(0.1)
+
+class ThreadCommWrapper(CommWrapper):
+    """Communicator for one of the threads started by `runThreads`"""
+    def __init__(self, procID, shared):
+        self._procID = procID
+        self._shared = shared
+
+    def __repr__(self):
+        return "%s(procID=%d, Nproc=%d)" % (self.__class__.__name__, self._procID, self._shared.Nproc)
+
+    @property
+    def procID(self):
+        return self._procID
+
+    @property
+    def Nproc(self):
+        return self._shared.Nproc
+
+    def Barrier(self):
+        shared = self._shared
+        shared.condition.acquire()
+        try:
+            generation = shared.generation
+            shared.arrived += 1
+            if shared.arrived == shared.Nproc:
+                shared.arrived = 0
+                shared.generation += 1
+                shared.condition.notify_all()
+            else:
+                shared.wait(lambda: shared.generation != generation)
+        finally:
+            shared.condition.release()
+
+    def allgather(self, obj):
+        self.Barrier()
+        self._shared.gathered[self._procID] = obj
+        self.Barrier()
+        gathered = list(self._shared.gathered)
+        self.Barrier()
+        return gathered
+
+    def bcast(self, obj, root=0):
+        return self.allgather(obj)[root]
+
+    def all(self, a, axis=None):
+        return numerix.array(self.allgather(numerix.asarray(a).all(axis=axis))).all(axis=0)
+
+    def any(self, a, axis=None):
+        return numerix.array(self.allgather(numerix.asarray(a).any(axis=axis))).any(axis=0)
+
+    def allclose(self, a, b, rtol=1.e-5, atol=1.e-8):
+        return all(self.allgather(numerix.allclose(a, b, rtol=rtol, atol=atol)))
+
+    def allequal(self, a, b):
+        return all(self.allgather(numerix.allequal(a, b)))
+
+    def sum(self, a, axis=None):
+        return numerix.array(self.allgather(numerix.asarray(a).sum(axis=axis))).sum(axis=0)
+
+    def MaxAll(self, vec):
+        return numerix.array(self.allgather(numerix.array(vec))).max(axis=0)
+
+    def MinAll(self, vec):
+        return numerix.array(self.allgather(numerix.array(vec))).min(axis=0)
+
+    def exchange(self, sends, sources):
+        shared = self._shared
+        shared.condition.acquire()
+        try:
+            for rank, obj in sends.items():
+                shared.mailboxes.setdefault((self._procID, rank), []).append(obj)
+            shared.condition.notify_all()
+
+            received = {}
+            for rank in sources:
+                mailbox = shared.mailboxes.setdefault((rank, self._procID), [])
+                shared.wait(lambda: len(mailbox) > 0)
+                received[rank] = mailbox.pop(0)
+        finally:
+            shared.condition.release()
+
+        return received
+
+def runThreads(function, Nproc):
+    """Call `function(comm)` in each of `Nproc` threads, each with a
+    `ThreadCommWrapper` of its own rank, and return their results in
+    order of rank
+    """
+    shared = _SharedState(Nproc)
+    results = [None] * Nproc
+    errors = [None] * Nproc
+
+    def run(procID):
+        try:
+            results[procID] = function(ThreadCommWrapper(procID=procID, shared=shared))
+        except _Abort:
+            pass
+        except Exception:
+            errors[procID] = sys.exc_info()
+            shared.failed = True
+
+    threads = [threading.Thread(target=run, args=(procID,)) for procID in range(Nproc)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for error in errors:
+        if error is not None:
+            raise error[0], error[1], error[2]
+
+    return results
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -49,26 +49,38 @@ __docformat__ = 'restructuredtext'
 
 import cPickle
 import os
+import struct
 import sys
 import gzip
+import zipfile
 
+from fipy.tools import numerix
 from fipy.tools import parallelComm
 
 __all__ = ["write", "read"]
 
 # TODO: add test to show that round trip pickle of mesh doesn't work properly
 # FIXME: pickle fails to work properly on numpy 1.1 (run gapFillMesh.py)
-def write(data, filename = None, extension = '', communicator=parallelComm):
+def write(data, filename = None, extension = '', communicator=parallelComm, compressed=False):
     """
     Pickle an object and write it to a file. Wrapper for
     `cPickle.dump()`.
 
+    If the file name (or `extension`) ends in ".npz", the object is
+    written as a NumPy archive instead: the `numpy.ndarray` objects it
+    holds, such as the vertex coordinates of a `Mesh` or the value of
+    a `CellVariable`, are stored as raw array members and only the
+    remaining structure is pickled. The arrays are the global ones; there
+    is no separate layout for the cells of each process.
+
     :Parameters:
       - `data`: The object to be pickled.
       - `filename`: The name of the file to place the pickled object. If `filename` is `None`
         then a temporary file will be used and the file object and file name will be returned as a tuple
       - `extension`: Used if filename is not given.
       - `communicator`: Object with `procID` and `Nproc` attributes.
+      - `compressed`: Whether to compress the arrays of a ".npz" file.
+        Compressed arrays cannot be memory-mapped by `read()`.
 
     Test to check pickling and unpickling.
 
@@ -79,7 +91,43 @@ def write(data, filename = None, extension = '', communicator=parallelComm):
         >>> print old.numberOfCells == new.numberOfCells
         True
 
+    The same in a NumPy archive
+
+        >>> from fipy import CellVariable, Grid2D
+        >>> mesh = Grid2D(nx=3, ny=2)
+        >>> var = CellVariable(mesh=mesh, value=mesh.cellCenters[0], hasOld=True)
+        >>> f, tempfile = write(var, extension='.npz')
+        >>> new = read(tempfile, f)
+        >>> print new
+        [ 0.5  1.5  2.5  0.5  1.5  2.5]
+        >>> print new.mesh.numberOfCells
+        6
+
+    By default, what is read is a copy, so the same archive can be written
+    again, e.g., as a rolling checkpoint, without changing what was read
+    from it before.
+
+        >>> import tempfile
+        >>> from fipy.meshes.mesh2D import Mesh2D
+        >>> def mesh2D(dx):
+        ...     grid = Grid2D(nx=3, ny=2, dx=dx)
+        ...     return Mesh2D(vertexCoords=grid.vertexCoords,
+        ...                   faceVertexIDs=grid.faceVertexIDs,
+        ...                   cellFaceIDs=grid.cellFaceIDs)
+        >>> (f, filename) = tempfile.mkstemp(".npz")
+        >>> write(CellVariable(mesh=mesh2D(dx=1.), value=1.), filename)
+        >>> first = read(filename)
+        >>> write(CellVariable(mesh=mesh2D(dx=5.), value=2.), filename)
+        >>> print first.mesh.vertexCoords[0, :4]
+        [ 0.  1.  2.  3.]
+        >>> os.close(f)
+        >>> os.remove(filename)
+
     """
+    if _isArchive(filename, extension):
+        return _writeArchive(data, filename=filename, extension=extension,
+                             communicator=communicator, compressed=compressed)
+
     if communicator.procID == 0:
         if filename is None:
             import tempfile
@@ -97,18 +145,34 @@ def write(data, filename = None, extension = '', communicator=parallelComm):
     if filename is None:
         return (f, _filename)
 
-def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=False):
+def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=False, mmap=False):
     """
     Read a pickled object from a file. Returns the unpickled object.
     Wrapper for `cPickle.load()`.
 
+    A NumPy archive written by `write()` is opened by every process,
+    rather than read by the first and broadcast to the others.
+
     :Parameters:
       - `filename`: The name of the file to unpickle the object from.
       - `fileobject`: Used to remove temporary files
       - `communicator`: Object with `procID` and `Nproc` attributes.
       - `mesh_unmangle`: Correct improper pickling of non-uniform meshes (ticket:243)
+      - `mmap`: Whether to memory-map the uncompressed arrays of a NumPy
+        archive (copy-on-write), so that each process only reads the parts
+        of the global arrays, e.g., the cells of its own partition, that it
+        actually uses. All of the arrays, including those of any mesh,
+        are then views of the file, which must not be written again,
+        truncated or removed for as long as they are in use. A temporary
+        file given with `fileobject` is never mapped.
 
     """
+    if zipfile.is_zipfile(filename):
+        # a temporary file is removed as soon as it is read
+        return _readArchive(filename, fileobject=fileobject, communicator=communicator,
+                            mesh_unmangle=mesh_unmangle,
+                            mmap=mmap and fileobject is None)
+
     if communicator.procID == 0:
         fileStream = gzip.GzipFile(filename = filename, mode = 'r', fileobj = None)
         data = fileStream.read()
@@ -129,6 +193,9 @@ def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=Fal
         import io
         f = io.BytesIO(data)
 
+    return _unpickler(f, mesh_unmangle=mesh_unmangle).load()
+
+def _unpickler(f, mesh_unmangle=False):
     unpickler = cPickle.Unpickler(f)
 
     if mesh_unmangle:
@@ -159,7 +226,176 @@ def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=Fal
 
         unpickler.find_global = find_class
 
-    return unpickler.load()
+    return unpickler
+
+def _isArchive(filename, extension):
+    if filename is None:
+        filename = extension
+    return filename.endswith(".npz")
+
+def _archiveMembers(data, copy=False):
+    """
+    Pickle `data`, returning the members of a ".npz" file that hold its
+    arrays and the remaining structure. The arrays are copied if `copy`.
+    """
+    arrays = {}
+
+    def persistent_id(obj):
+        # only exact arrays of fixed-size elements can be stored raw
+        if type(obj) in (numerix.ndarray, numerix.memmap) and not obj.dtype.hasobject:
+            key = "arr_%d" % len(arrays)
+            if copy:
+                obj = obj.copy()
+            arrays[key] = obj
+            return key
+        return None
+
+    import StringIO
+    f = StringIO.StringIO()
+    pickler = cPickle.Pickler(f, 2)
+    pickler.persistent_id = persistent_id
+    pickler.dump(data)
+    arrays["pickle"] = numerix.frombuffer(f.getvalue(), dtype=numerix.uint8)
+
+    return arrays
+
+def _saveArchive(filename, arrays, compressed):
+    if compressed:
+        numerix.savez_compressed(filename, **arrays)
+    else:
+        numerix.savez(filename, **arrays)
+
+def _writeArchive(data, filename, extension, communicator, compressed):
+    """
+    Pickle `data` with its arrays stored as separate members of a ".npz" file.
+    """
+    arrays = _archiveMembers(data)
+
+    if communicator.procID == 0:
+        if filename is None:
+            import tempfile
+            (fileobject, _filename) =  tempfile.mkstemp(extension)
+        else:
+            (fileobject, _filename) = (None, filename)
+
+        _saveArchive(_filename, arrays, compressed)
+    else:
+        (fileobject, _filename) = (None, None)
+
+    # every process will read the file itself
+    _filename = communicator.bcast(_filename, root=0)
+
+    if filename is None:
+        return (fileobject, _filename)
+
+def _snapshot(data, filename, compressed=False):
+    """
+    Pickle `data` as it is now, and return a function that writes it to
+    `filename`, as `write()` would. Only the returned function compresses
+    the data and touches the file system, so it can be called later, or
+    from another thread, while `data` changes.
+
+        >>> from fipy import CellVariable, Grid1D
+        >>> var = CellVariable(mesh=Grid1D(nx=3), value=1.)
+        >>> import tempfile
+        >>> for extension in (".gz", ".npz"):
+        ...     (f, filename) = tempfile.mkstemp(extension)
+        ...     writeVar = _snapshot(var, filename)
+        ...     var.value = 2.
+        ...     writeVar()
+        ...     print read(filename, f)
+        ...     var.value = 1.
+        [ 1.  1.  1.]
+        [ 1.  1.  1.]
+    """
+    if _isArchive(filename, ''):
+        arrays = _archiveMembers(data, copy=True)
+
+        def writeArchive():
+            _saveArchive(filename, arrays, compressed)
+
+        return writeArchive
+    else:
+        pickled = cPickle.dumps(data, 0)
+
+        def writePickle():
+            fileStream = gzip.GzipFile(filename = filename, mode = 'w', fileobj = None)
+            fileStream.write(pickled)
+            fileStream.close()
+
+        return writePickle
+
+def _memmapMember(filename, archive, name):
+    """
+    Memory-map the uncompressed member `name` of the zip `archive`
+    in `filename`, or return `None` if it cannot be.
+    """
+    from numpy.lib import format
+
+    info = archive.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+
+    f = open(filename, 'rb')
+    try:
+        # the member's data follow its local header, which has its own
+        # copies of the name and extra fields
+        f.seek(info.header_offset)
+        header = f.read(30)
+        nameLength, extraLength = struct.unpack("<HH", header[26:30])
+        f.seek(info.header_offset + 30 + nameLength + extraLength)
+
+        version = format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = format.read_array_header_2_0(f)
+        offset = f.tell()
+    finally:
+        f.close()
+
+    if dtype.hasobject or numerix.prod(shape) == 0:
+        return None
+
+    if fortran_order:
+        order = 'F'
+    else:
+        order = 'C'
+
+    return numerix.memmap(filename, dtype=dtype, mode='c', shape=shape, order=order, offset=offset)
+
+def _readArchive(filename, fileobject, communicator, mesh_unmangle, mmap):
+    """
+    Unpickle an object written by `_writeArchive`.
+    """
+    archive = zipfile.ZipFile(filename)
+    npz = numerix.load(filename)
+    try:
+        def persistent_load(key):
+            arr = None
+            if mmap:
+                arr = _memmapMember(filename, archive, key + ".npy")
+            if arr is None:
+                arr = npz[key]
+            return arr
+
+        import StringIO
+        f = StringIO.StringIO(npz["pickle"].tostring())
+        unpickler = _unpickler(f, mesh_unmangle=mesh_unmangle)
+        unpickler.persistent_load = persistent_load
+        data = unpickler.load()
+    finally:
+        npz.close()
+        archive.close()
+
+    # every process needs to be done with the file before it is removed
+    communicator.Barrier()
+
+    if fileobject is not None and communicator.procID == 0:
+        os.close(fileobject)
+        os.remove(filename)
+
+    return data
 
 def _test():
     import fipy.tests.doctestPlus
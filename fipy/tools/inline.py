@@ -1,14 +1,36 @@
-__all__ = ["doInline"]
+__all__ = ["doInline", "doNumexpr"]
 
+import hashlib
 import inspect
+import json
 import os
+import re
 import sys
+import tempfile
+
+from fipy.tests.doctestPlus import register_skipper
 
 if '--inline' in [s.lower() for s in sys.argv[1:]]:
     doInline = True
 else:
     doInline = 'FIPY_INLINE' in os.environ
 
+if '--numexpr' in [s.lower() for s in sys.argv[1:]]:
+    doNumexpr = True
+else:
+    doNumexpr = 'FIPY_NUMEXPR' in os.environ
+
+def _checkForNumexpr():
+    try:
+        import numexpr
+    except ImportError:
+        return False
+    return True
+
+register_skipper(flag="NUMEXPR",
+                 test=_checkForNumexpr,
+                 why="the `numexpr` package cannot be imported")
+
 _inlineFrameComment = 'FIPY_INLINE_COMMENT' in os.environ
 
 def _getframeinfo(level, context=1):
@@ -181,3 +203,226 @@ static int arrayIndex(PyArrayObject* array, int i, int vec[])
     return index / array->descr->elsize;
 }
                  """)
+
+# `_getCstring()` index strings, e.g., "var01[i + j * ni]"
+_numexprIndex = re.compile(r"(var\w*)\[[^\[\]]*\]")
+# constructs that either can't be expressed by `numexpr` or that it would
+# evaluate with different semantics than NumPy
+_numexprUnsupported = re.compile(r"\[|`|//|%|\bnot\b|\bis\b|\bin\b")
+# `_OperatorVariable` C strings abbreviate "arc" as "a"
+_numexprArcFunctions = re.compile(r"\ba(sin|cos|tan|tan2|sinh|cosh|tanh)\(")
+_numexprRenames = {
+    "absolute": "abs",
+    "fabs": "abs",
+    "conjugate": "conj"
+}
+_numexprFunctions = re.compile(r"\b(%s)\(" % "|".join(_numexprRenames.keys()))
+
+_numexprPowFunction = re.compile(r"\bpow\(")
+
+def _numexprPow(expression):
+    """
+    Rewrite the C `pow()` calls of `Variable.__pow__` as `**`
+
+        >>> print _numexprPow("(pow((var00 - pow(var01, var02)), var1))")
+        ((((var00 - ((var01)**(var02))))**(var1)))
+    """
+    match = _numexprPowFunction.search(expression)
+    while match is not None:
+        depth = 0
+        comma = None
+        for end in range(match.end(), len(expression)):
+            if expression[end] == '(':
+                depth += 1
+            elif expression[end] == ')':
+                if depth == 0:
+                    break
+                depth -= 1
+            elif expression[end] == ',' and depth == 0:
+                comma = end
+        expression = "%s((%s)**(%s))%s" % (expression[:match.start()],
+                                           expression[match.end():comma].strip(),
+                                           expression[comma + 1:end].strip(),
+                                           expression[end + 1:])
+        match = _numexprPowFunction.search(expression)
+
+    return expression
+
+_numexprKernels = {}
+
+def _numexprCacheDirectory():
+    return os.environ.get('FIPY_NUMEXPR_CACHE', None)
+
+def _loadNumexprRecord(filename, record):
+    """Return whether the expression and signature of `record` compiled,
+    according to `filename`, or `None` if that is not recorded.
+    """
+    try:
+        f = open(filename, 'r')
+        try:
+            stored = json.load(f)
+        finally:
+            f.close()
+    except (IOError, OSError, ValueError):
+        return None
+
+    if not isinstance(stored, dict) or stored.get('record', None) != record:
+        return None
+
+    return stored.get('compiles', None) is True
+
+def _storeNumexprRecord(filename, record, compiles):
+    dirname = os.path.dirname(filename)
+    try:
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        # write to a scratch file and rename it, so that concurrent
+        # processes never see a partially written record
+        fd, scratch = tempfile.mkstemp(dir=dirname)
+        f = os.fdopen(fd, 'w')
+        try:
+            json.dump(dict(record=record, compiles=compiles), f)
+        finally:
+            f.close()
+        os.rename(scratch, filename)
+    except (IOError, OSError):
+        # the disk cache is an optimization; an unwritable
+        # directory just means trying again next session
+        pass
+
+def _compileNumexprKernel(expression, signature, context):
+    from numexpr import necompiler, interpreter
+
+    try:
+        threeAddrProgram, inputsig, tempsig, constants, inputNames = necompiler.precompile(expression, signature, context)
+    except (NameError, SyntaxError, TypeError, ValueError, KeyError, NotImplementedError):
+        return None
+    if [op for op in threeAddrProgram if op[0] in ('div_iii', 'div_lll')]:
+        # `numexpr` truncates integer quotients toward zero,
+        # whereas NumPy rounds them down
+        return None
+
+    return inputNames, interpreter.NumExpr(inputsig.encode('ascii'),
+                                           tempsig.encode('ascii'),
+                                           necompiler.compileThreeAddrForm(threeAddrProgram),
+                                           constants, inputNames)
+
+def _numexprKernel(expression, args):
+    import numexpr
+    from numexpr import necompiler
+
+    context = necompiler.getContext(dict(truediv=False))
+    try:
+        names, usesVML = necompiler.getExprNames(expression, context)
+    except (NameError, SyntaxError, TypeError, ValueError, KeyError, NotImplementedError):
+        return None
+
+    if [name for name in names if name not in args]:
+        return None
+
+    try:
+        signature = [(name, necompiler.getType(args[name])) for name in names]
+    except ValueError:
+        return None
+
+    # only plain data is kept on disk; kernels are always compiled
+    # from the expression in hand
+    filename = None
+    directory = _numexprCacheDirectory()
+    if directory:
+        record = dict(numexpr=numexpr.__version__,
+                      expression=expression,
+                      signature=[[name, necompiler.type_to_typecode[t]] for name, t in signature])
+        filename = hashlib.sha1(json.dumps(record, sort_keys=True)).hexdigest()
+        filename = os.path.join(directory, filename + ".json")
+        compiles = _loadNumexprRecord(filename, record)
+        if compiles is False:
+            return None
+        elif compiles is True:
+            filename = None
+
+    kernel = _compileNumexprKernel(expression, signature, context)
+
+    if filename is not None:
+        _storeNumexprRecord(filename, record, compiles=kernel is not None)
+
+    if kernel is None:
+        return None
+
+    inputNames, kernel = kernel
+    return inputNames, usesVML, kernel
+
+def _runNumexpr(code_in, **args):
+    """
+    Evaluate the element-wise C expression `code_in`, as generated by
+    `Variable._getCstring()`, with a single compiled `numexpr` kernel.
+
+    Kernels are cached in memory, keyed by the expression and the dtype and
+    shape of each argument. If `FIPY_NUMEXPR_CACHE` names a directory,
+    whether each expression and signature can be compiled is recorded
+    there as JSON, so that later sessions skip expressions that `numexpr`
+    cannot evaluate.
+
+        >>> from fipy.tools import numerix
+        >>> print _runNumexpr("(var0[i] * acos(var1))",
+        ...                   var0=numerix.array((1., 2., 3.)),
+        ...                   var1=0.) # doctest: +NUMEXPR
+        [ 1.57079633  3.14159265  4.71238898]
+
+    Returns `None` if the expression cannot be evaluated by `numexpr`.
+
+        >>> print _runNumexpr("(var0[i] % var1)",
+        ...                   var0=numerix.array((1., 2., 3.)),
+        ...                   var1=2.) # doctest: +NUMEXPR
+        None
+
+    Nothing is written to disk unless `FIPY_NUMEXPR_CACHE` is set.
+
+        >>> import shutil
+        >>> cache = tempfile.mkdtemp()
+        >>> os.environ['FIPY_NUMEXPR_CACHE'] = cache
+        >>> print _runNumexpr("(var0[i] / var1[i])",
+        ...                   var0=numerix.array((3, -3)),
+        ...                   var1=numerix.array((2, 2))) # doctest: +NUMEXPR
+        None
+        >>> _numexprKernels.clear()
+        >>> print _runNumexpr("(var0[i] / var1[i])",
+        ...                   var0=numerix.array((3, -3)),
+        ...                   var1=numerix.array((2, 2))) # doctest: +NUMEXPR
+        None
+        >>> records = os.listdir(cache)
+        >>> print len(records) # doctest: +NUMEXPR
+        1
+        >>> f = open(os.path.join(cache, records[0])) # doctest: +NUMEXPR
+        >>> print json.load(f)['compiles'] # doctest: +NUMEXPR
+        False
+        >>> f.close() # doctest: +NUMEXPR
+        >>> del os.environ['FIPY_NUMEXPR_CACHE']
+        >>> shutil.rmtree(cache)
+    """
+    from fipy.tools import numerix
+
+    expression = _numexprIndex.sub(r"\1", code_in)
+    if _numexprUnsupported.search(expression):
+        return None
+    expression = _numexprArcFunctions.sub(r"arc\1(", expression)
+    expression = _numexprPow(expression)
+    expression = _numexprFunctions.sub(lambda match: _numexprRenames[match.group(1)] + "(", expression)
+
+    args = dict([(name, numerix.asarray(value)) for name, value in args.items()])
+
+    key = (expression,) + tuple([(name, value.dtype.str, value.shape) for name, value in sorted(args.items())])
+    if key not in _numexprKernels:
+        _numexprKernels[key] = _numexprKernel(expression, args)
+
+    kernel = _numexprKernels[key]
+    if kernel is None:
+        return None
+
+    names, usesVML, kernel = kernel
+    try:
+        return kernel(*[args[name] for name in names], ex_uses_vml=usesVML)
+    except (TypeError, ValueError):
+        # e.g., arguments that cannot be safely cast to a `numexpr` type
+        _numexprKernels[key] = None
+        return None
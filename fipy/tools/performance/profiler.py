@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+
+## -*-Pyth-*-
+ # ###################################################################
+ #  FiPy - Python-based finite volume PDE solver
+ #
+ #  FILE: "profiler.py"
+ #
+ #  Author: Jonathan Guyer <guyer@nist.gov>
+ #  Author: Daniel Wheeler <daniel.wheeler@nist.gov>
+ #  Author: James Warren   <jwarren@nist.gov>
+ #    mail: NIST
+ #     www: http://www.ctcms.nist.gov/fipy/
+ #
+ # ========================================================================
+ # This software was developed at the National Institute of Standards
+ # of Standards and Technology, an agency of the Federal Government.
+ # Pursuant to title 17 section 105 of the United States Code,
+ # United States Code this software is not subject to copyright
+ # protection, and this software is considered to be in the public domain.
+ # FiPy is an experimental system.
+ # NIST assumes no responsibility whatsoever for its use by whatsoever for its use by
+ # other parties, and makes no guarantees, expressed or implied, about
+ # its quality, reliability, or any other characteristic.  We would
+ # appreciate acknowledgement if the software is used.
+ #
+ # To the extent that NIST may hold copyright in countries other than the
+ # United States, you are hereby granted the non-exclusive irrevocable and
+ # unconditional right to print, publish, prepare derivative works and
+ # distribute this software, in any medium, or authorize others to do so on
+ # your behalf, on a royalty-free basis throughout the world.
+ #
+ # You may improve, modify, and create derivative works of the software or
+ # any portion of the software, and you may copy and distribute such
+ # modifications or works.  Modified works should carry a notice stating
+ # that you changed the software and should note the date and nature of any
+ # such change.  Please explicitly acknowledge the National Institute of
+ # Standards and Technology as the original source.
+ #
+ # This software can be redistributed and/or modified freely provided that
+ # any derivative works bear some notice that they are derived from it, and
+ # any modified versions bear some notice that they have been modified.
+ # ========================================================================
+ #
+ # ###################################################################
+ ##
+
+"""Record where the time of each sweep goes.
+
+A `SweepProfiler` breaks down every sweep, i.e., every call to the
+`solve()` or `sweep()` method of a `Term`, into
+
+ - `"terms"`: the `_buildMatrix` of each class of `Term`,
+ - `"boundaryConditions"`: the assembly of each class of boundary condition,
+ - `"solver"`: the solver phases `_storeMatrix`, `_applyUnderRelaxation`,
+   `_calcResidual`, `preconditioner` (its setup) and `_solve_`,
+ - `"variables"`: the recalculation of each `Variable`, by name,
+
+recording the number of calls, the wall time and the growth of resident
+memory (on Linux) of each. Times are inclusive, e.g., a `Variable`
+evaluated while building a `Term`'s matrix counts toward both.
+
+Profiling is enabled either for a block of code
+
+>>> from fipy import *
+>>> mesh = Grid1D(nx=10)
+>>> phi = CellVariable(mesh=mesh, name="phi")
+>>> phi.constrain(1., mesh.facesLeft)
+>>> eq = TransientTerm() == DiffusionTerm(coeff=phi + 1.)
+>>> from fipy.tools.performance.profiler import SweepProfiler
+>>> with SweepProfiler() as profiler:
+...     for sweep in range(2):
+...         res = eq.sweep(var=phi, dt=1.)
+>>> len(profiler.reports)
+2
+>>> report = profiler.reports[-1]
+>>> print report["sweep"], report["equation"]
+1 (TransientTerm(coeff=1.0) + DiffusionTerm(coeff=[-((phi + 1.0))]))
+>>> print sorted(report["terms"].keys())
+['DiffusionTerm', 'TransientTerm']
+>>> print sorted(report["solver"].keys())
+['_calcResidual', '_solve_', '_storeMatrix']
+>>> print report["solver"]["_solve_"]["calls"]
+1
+>>> print report["variables"]["(phi + _Constant(...))"]["calls"]
+1
+
+or for the whole session, by setting the :envvar:`FIPY_PROFILE`
+environment variable to the name of a file, to which the report of
+each sweep is appended as a line of JSON.
+"""
+
+__docformat__ = 'restructuredtext'
+
+import json
+import os
+import time
+
+from fipy.tools.performance.memoryUsage import _resident
+
+__all__ = ["SweepProfiler"]
+
+_profilers = []
+
+class SweepProfiler(object):
+    """
+    Collects a report of each sweep made while it is active.
+
+    Each report is a dictionary holding the index of the `"sweep"`, the
+    `"equation"` swept, its total `"time"` and `"bytes"`, and, for each
+    category of section, a dictionary of the `"calls"`, `"time"` and
+    `"bytes"` of each named section.
+    """
+    def __init__(self, filename=None):
+        """
+        :Parameters:
+          - `filename`: the file to append each report to as a line of
+            JSON. If `None`, the reports are kept in `reports`.
+        """
+        self.filename = filename
+        self.reports = []
+        self._count = 0
+        self._depth = 0
+        self._report = None
+
+    def __enter__(self):
+        _profilers.append(self)
+        return self
+
+    def __exit__(self, type, value, traceback):
+        _profilers.remove(self)
+
+    def _startSweep(self):
+        if self._depth == 0:
+            self._report = {"terms": {},
+                            "boundaryConditions": {},
+                            "solver": {},
+                            "variables": {}}
+        self._depth += 1
+
+    def _stopSweep(self, equation, elapsed, growth):
+        self._depth -= 1
+        if self._depth == 0:
+            report = self._report
+            self._report = None
+
+            report["sweep"] = self._count
+            report["equation"] = repr(equation)
+            report["time"] = elapsed
+            report["bytes"] = growth
+            self._count += 1
+
+            if self.filename is None:
+                self.reports.append(report)
+            else:
+                self._dump(report)
+
+    def _record(self, category, name, elapsed, growth):
+        if self._report is not None:
+            entry = self._report[category].setdefault(name, {"calls": 0,
+                                                             "time": 0.,
+                                                             "bytes": 0})
+            entry["calls"] += 1
+            entry["time"] += elapsed
+            entry["bytes"] += growth
+
+    def _dump(self, report):
+        from fipy.tools import parallelComm
+
+        filename = self.filename
+        if parallelComm.Nproc > 1:
+            filename = "%s.%d" % (filename, parallelComm.procID)
+
+        f = open(filename, 'a')
+        try:
+            f.write(json.dumps(report, sort_keys=True) + "\n")
+        finally:
+            f.close()
+
+class _NullSection(object):
+    def __enter__(self):
+        pass
+
+    def __exit__(self, type, value, traceback):
+        pass
+
+_nullSection = _NullSection()
+
+class _Section(object):
+    def __init__(self, category, name):
+        self.category = category
+        self.name = name
+
+    def __enter__(self):
+        self.resident = _resident()
+        self.start = time.time()
+
+    def __exit__(self, type, value, traceback):
+        elapsed = time.time() - self.start
+        growth = int(_resident() - self.resident)
+
+        if callable(self.name):
+            self.name = self.name()
+
+        for profiler in list(_profilers):
+            profiler._record(self.category, self.name, elapsed, growth)
+
+class _Sweep(_Section):
+    def __init__(self, equation):
+        self.name = equation
+
+    def __enter__(self):
+        self.profilers = list(_profilers)
+        for profiler in self.profilers:
+            profiler._startSweep()
+        _Section.__enter__(self)
+
+    def __exit__(self, type, value, traceback):
+        elapsed = time.time() - self.start
+        growth = int(_resident() - self.resident)
+
+        for profiler in self.profilers:
+            profiler._stopSweep(self.name, elapsed, growth)
+
+def _section(category, name):
+    """Return a context manager that times `name` in `category`.
+
+    `name` may be a callable, which is only called, to obtain the name,
+    if a `SweepProfiler` is active.
+    """
+    if _profilers:
+        return _Section(category, name)
+    else:
+        return _nullSection
+
+def _sweep(equation):
+    """Return a context manager that delimits a sweep of `equation`.
+    """
+    if _profilers:
+        return _Sweep(equation)
+    else:
+        return _nullSection
+
+if 'FIPY_PROFILE' in os.environ:
+    _profilers.append(SweepProfiler(filename=os.environ['FIPY_PROFILE']))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
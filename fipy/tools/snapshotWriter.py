@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+
+## -*-Pyth-*-
+ # ###################################################################
+ #  FiPy - Python-based finite volume PDE solver
+ #
+ #  FILE: "snapshotWriter.py"
+ #
+ #  Author: Jonathan Guyer <guyer@nist.gov>
+ #  Author: Daniel Wheeler <daniel.wheeler@nist.gov>
+ #  Author: James Warren   <jwarren@nist.gov>
+ #    mail: NIST
+ #     www: http://www.ctcms.nist.gov/fipy/
+ #
+ # ========================================================================
+ # This software was developed at the National Institute of Standards
+ # of Standards and Technology, an agency of the Federal Government.
+ # Pursuant to title 17 section 105 of the United States Code,
+ # United States Code this software is not subject to copyright
+ # protection, and this software is considered to be in the public domain.
+ # FiPy is an experimental system.
+ # NIST assumes no responsibility whatsoever for its use by whatsoever for its use by
+ # other parties, and makes no guarantees, expressed or implied, about
+ # its quality, reliability, or any other characteristic.  We would
+ # appreciate acknowledgement if the software is used.
+ #
+ # To the extent that NIST may hold copyright in countries other than the
+ # United States, you are hereby granted the non-exclusive irrevocable and
+ # unconditional right to print, publish, prepare derivative works and
+ # distribute this software, in any medium, or authorize others to do so on
+ # your behalf, on a royalty-free basis throughout the world.
+ #
+ # You may improve, modify, and create derivative works of the software or
+ # any portion of the software, and you may copy and distribute such
+ # modifications or works.  Modified works should carry a notice stating
+ # that you changed the software and should note the date and nature of any
+ # such change.  Please explicitly acknowledge the National Institute of
+ # Standards and Technology as the original source.
+ #
+ # This software can be redistributed and/or modified freely provided that
+ # any derivative works bear some notice that they are derived from it, and
+ # any modified versions bear some notice that they have been modified.
+ # ========================================================================
+ #
+ # ###################################################################
+ ##
+
+"""Write output from a background thread.
+
+Formatting, compressing and writing files can take a large part of the
+time of a simulation that saves its fields often. A `SnapshotWriter`
+copies the values of the variables to be written, which is quick, and
+leaves the rest to a thread of its own, while the solution continues.
+
+>>> import os
+>>> import tempfile
+>>> from fipy import *
+>>> from fipy.tools.snapshotWriter import SnapshotWriter
+>>> mesh = Grid1D(nx=3)
+>>> phi = CellVariable(mesh=mesh, name="phi", value=0.)
+>>> directory = tempfile.mkdtemp()
+>>> viewer = TSVViewer(vars=(phi, phi.grad))
+>>> with SnapshotWriter() as writer:
+...     for step in range(3):
+...         phi.value = step
+...         writer.plot(viewer, os.path.join(directory, "phi%d.tsv" % step))
+...         writer.dump(phi, os.path.join(directory, "phi%d.gz" % step))
+>>> print open(os.path.join(directory, "phi1.tsv")).read() #doctest: +NORMALIZE_WHITESPACE
+x       phi     phi_gauss_grad_x
+0.5     1       0
+1.5     1       0
+2.5     1       0
+>>> print dump.read(os.path.join(directory, "phi2.gz"))
+[ 2.  2.  2.]
+
+Any other function that writes variables can be called with `submit()`,
+e.g., the `write()` of a Gmsh `POSFile` or `MSHFile`.
+
+Variables are snapshotted by creating a new `CellVariable`, `FaceVariable`
+or `Variable` with a copy of their value, so that the viewers and files are
+given the values at the time of the call. The mesh is not copied.
+
+At most `backlog` snapshots wait to be written at any time; a call that
+would exceed this blocks until the writer catches up. `flush()` waits for
+every snapshot to be written and `close()` also stops the thread. An error
+raised while writing is raised again by the next call to the writer.
+
+>>> writer = SnapshotWriter()
+>>> writer.submit(open, os.path.join(directory, "missing", "file"), "w")
+>>> writer.close() #doctest: +ELLIPSIS
+Traceback (most recent call last):
+...
+IOError: [Errno 2] No such file or directory: '...file'
+
+Writers that are never closed are closed when the interpreter exits.
+Errors are then reported as warnings, rather than raised.
+
+>>> import warnings
+>>> from fipy.tools.snapshotWriter import _closeWriters
+>>> writer = SnapshotWriter()
+>>> writer.submit(open, os.path.join(directory, "missing", "file"), "w")
+>>> with warnings.catch_warnings(record=True) as caught:
+...     warnings.simplefilter("always")
+...     _closeWriters()
+>>> print caught[0].message #doctest: +ELLIPSIS
+SnapshotWriter could not write a snapshot: [Errno 2] No such file or directory: '...file'
+
+>>> import shutil
+>>> shutil.rmtree(directory)
+
+In parallel, variables can only be gathered by all processes together, so
+everything is written immediately, as if there were no `SnapshotWriter`.
+
+.. note::
+
+   Viewers are plotted from the writer's thread, so only viewers that
+   write files, such as `TSVViewer` or `VTKCellViewer`, should be given
+   to `plot()`. The snapshot of a viewer shares any other state, such as
+   the dataset of a `VTKViewer`, with the original, which should not be
+   plotted directly while the writer is in use.
+"""
+__docformat__ = 'restructuredtext'
+
+import atexit
+import copy
+import sys
+import threading
+import warnings
+import weakref
+import Queue
+
+from fipy.tools import dump
+from fipy.tools import parallelComm
+
+__all__ = ["SnapshotWriter"]
+
+_writers = weakref.WeakSet()
+
+def _closeWriters():
+    """Close any `SnapshotWriter` still open when the interpreter exits.
+    """
+    for writer in list(_writers):
+        try:
+            writer.close()
+        except Exception, e:
+            warnings.warn("SnapshotWriter could not write a snapshot: %s" % e,
+                          RuntimeWarning)
+
+atexit.register(_closeWriters)
+
+def _snapshot(obj):
+    """Return a copy of `obj` whose value will not change, if `obj` is a
+    `Variable`, or a list or tuple of them.
+    """
+    from fipy.variables.variable import Variable
+    from fipy.variables.meshVariable import _MeshVariable
+
+    if isinstance(obj, _MeshVariable):
+        return obj._getArithmeticBaseClass()(mesh=obj.mesh, name=obj.name, value=obj)
+    elif isinstance(obj, Variable):
+        return Variable(name=obj.name, value=obj)
+    elif type(obj) in (type(()), type([])):
+        return type(obj)([_snapshot(item) for item in obj])
+    else:
+        return obj
+
+class SnapshotWriter(object):
+    """Queue of output written by a background thread.
+
+    Usable as a context manager, which closes the writer on exit.
+    """
+    def __init__(self, backlog=1, communicator=parallelComm):
+        """
+        :Parameters:
+          - `backlog`: The number of snapshots that may wait to be written.
+          - `communicator`: Object with `procID` and `Nproc` attributes.
+        """
+        self.backlog = backlog
+        self.communicator = communicator
+        self._queue = Queue.Queue(maxsize=backlog)
+        self._error = None
+        self._thread = None
+
+        # don't lose the snapshots of a writer that is never closed
+        _writers.add(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if type is None:
+            self.close()
+        else:
+            # don't mask the original exception
+            try:
+                self.close()
+            except Exception:
+                pass
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    function, args, kwargs = item
+                    try:
+                        function(*args, **kwargs)
+                    except Exception:
+                        self._error = sys.exc_info()
+            finally:
+                self._queue.task_done()
+
+    def _raise(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error[0], error[1], error[2]
+
+    def _put(self, function, *args, **kwargs):
+        self._raise()
+
+        if self.communicator.Nproc > 1:
+            function(*args, **kwargs)
+        else:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SnapshotWriter")
+                self._thread.daemon = True
+                self._thread.start()
+
+            # blocks while `backlog` snapshots are waiting
+            self._queue.put((function, args, kwargs))
+
+    def submit(self, function, *args, **kwargs):
+        """Call `function` from the writer's thread with snapshots of any
+        variables among the arguments.
+        """
+        if self.communicator.Nproc == 1:
+            args = [_snapshot(arg) for arg in args]
+            kwargs = dict([(key, _snapshot(value)) for key, value in kwargs.items()])
+
+        self._put(function, *args, **kwargs)
+
+    def plot(self, viewer, *args, **kwargs):
+        """Call the `plot()` method of `viewer` with a snapshot of its
+        variables.
+        """
+        if self.communicator.Nproc == 1:
+            viewer = copy.copy(viewer)
+            viewer.vars = _snapshot(list(viewer.vars))
+
+        self._put(viewer.plot, *args, **kwargs)
+
+    def dump(self, data, filename, compressed=False):
+        """Write `data` to `filename` with `fipy.tools.dump.write()`.
+
+        The pickling, which copies `data`, is done right away, and the
+        compression and writing in the background.
+        """
+        if self.communicator.Nproc == 1:
+            self._put(dump._snapshot(data, filename, compressed=compressed))
+        else:
+            dump.write(data, filename, communicator=self.communicator, compressed=compressed)
+
+    def flush(self):
+        """Wait until every snapshot has been written.
+        """
+        if self._thread is not None:
+            self._queue.join()
+
+        self._raise()
+
+    def close(self):
+        """Write every snapshot and stop the writer's thread.
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+        self._raise()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
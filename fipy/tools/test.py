@@ -56,6 +56,10 @@ def _suite():
             'numerix',
             'dump',
             'vector',
+            'inline',
+            'performance.profiler',
+            'snapshotWriter',
+            'comms.threadCommWrapper',
         ), base = __name__)
 
     return theSuite
@@ -46,7 +46,6 @@
 
 __docformat__ = 'restructuredtext'
 
-from fipy.tools.numerix import random
 from fipy.variables.noiseVariable import NoiseVariable
 
 __all__ = ["BetaNoiseVariable"]
@@ -135,8 +134,9 @@ class BetaNoiseVariable(NoiseVariable):
         self.beta = self._requires(beta)
 
     def random(self):
-        return random.beta(a = self.alpha, b = self.beta,
-                           size = [self.mesh.globalNumberOfCells])
+        x = self._gamma(self.alpha, key=(0,))
+        y = self._gamma(self.beta, key=(1,))
+        return x / (x + y)
 
 def _test():
     import fipy.tests.doctestPlus
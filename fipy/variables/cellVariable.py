@@ -310,6 +310,14 @@ class CellVariable(_MeshVariable):
         >>> print numerix.allclose(CellVariable(mesh=Grid1D(dx=(2.0, 1.0, 0.5)),
         ...                                     value=(0, 1, 2)).leastSquaresGrad.globalValue, [[0.461538461538, 0.8, 1.2]])
         True
+
+        >>> from fipy import Grid3D
+        >>> m = Grid3D(nx=2, ny=2, nz=2, dx=0.1, dy=2.0, dz=1.0)
+        >>> print numerix.allclose(CellVariable(mesh=m, value=(0,1,3,6,2,4,5,7)).leastSquaresGrad.globalValue,
+        ...                        [[8.0, 8.0, 24.0, 24.0, 16.0, 16.0, 16.0, 16.0],
+        ...                         [1.2, 2.0, 1.2, 2.0, 1.2, 1.2, 1.2, 1.2],
+        ...                         [1.6, 2.4, 1.6, 0.8, 1.6, 2.4, 1.6, 0.8]])
+        True
         """
 
         if not hasattr(self, '_leastSquaresGrad'):
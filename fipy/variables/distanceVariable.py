@@ -95,7 +95,11 @@ LSM_SOLVER = _parseLSMSolver()
 
 register_skipper(flag="LSM",
                  test=lambda : LSM_SOLVER is not None,
-                 why="neither `lsmlib` nor `skfmm` can be found on the $PATH")
+                 why="neither `lsmlib` nor `skfmm` can be found on the $PATH and `FIPY_LSM` is not set")
+
+register_skipper(flag="LSM2",
+                 test=lambda : LSM_SOLVER in ('lsmlib', 'skfmm'),
+                 why="`lsmlib` or `skfmm` must be used to run second order tests")
 
 register_skipper(flag="LSMLIB",
                  test=lambda : LSM_SOLVER == 'lsmlib',
@@ -120,6 +124,22 @@ class DistanceVariable(CellVariable):
     by the zero level set.  The solution can either be first or second
     order.
 
+    `LSMLIB` or `Scikit-fmm` are used on 1D and 2D grids, if available.
+    Otherwise, or when `FIPY_LSM=fipy`, a first order solver that works on
+    any mesh is used (see `fipy.variables.fastMarching`). That solver is
+    also used in parallel, where each process only works on its own part
+    of the mesh, and it supports updating only a narrow band of cells
+    around the zero level set
+
+    >>> from fipy.meshes import Grid3D
+    >>> from fipy.tools import serialComm
+    >>> mesh = Grid3D(nx=2, ny=2, nz=6, communicator=serialComm)
+    >>> z = mesh.cellCenters[2]
+    >>> var = DistanceVariable(mesh=mesh, value=numerix.where(z > 3, 1., -1.))
+    >>> var.calcDistanceFunction(narrowBand=1)
+    >>> print var.value.reshape((6, 2, 2))[:, 0, 0]
+    [-1.5 -1.5 -0.5  0.5  1.5  1.5]
+
     Here we will define a few test cases. Firstly a 1D test case
 
     >>> from fipy.meshes import Grid1D
@@ -229,7 +249,7 @@ class DistanceVariable(CellVariable):
     ...           -0.5, -0.35355339, 0.5, 1.45118446,
     ...            0.5, 0.5, 0.97140452, 1.76215286,
     ...            1.49923009, 1.45118446, 1.76215286, 2.33721352]
-    >>> print numerix.allclose(var, answer, rtol=1e-9) #doctest: +LSM
+    >>> print numerix.allclose(var, answer, rtol=1e-9) #doctest: +LSM2
     True
 
     ** A test for a bug in both LSMLIB and Scikit-fmm **
@@ -285,7 +305,16 @@ class DistanceVariable(CellVariable):
     def _calcValue(self):
         return self._value
 
-    def extendVariable(self, extensionVariable, order=2):
+    def _useNativeSolver(self, narrowBand):
+        mesh = self.mesh
+        return (LSM_SOLVER not in ('lsmlib', 'skfmm')
+                or narrowBand is not None
+                or mesh.communicator.Nproc > 1
+                or hasattr(mesh, 'nz')
+                or not hasattr(mesh, 'nx')
+                or numerix.prod(mesh.shape) != mesh.numberOfCells)
+
+    def extendVariable(self, extensionVariable, order=2, narrowBand=None):
         """
 
         Calculates the extension of `extensionVariable` from the zero
@@ -294,9 +323,21 @@ class DistanceVariable(CellVariable):
         :Parameters:
           - `extensionVariable`: The variable to extend from the zero
             level set.
+          - `order`: The order of accuracy of the extension, either 1 or
+            2. The native solver is always first order.
+          - `narrowBand`: If given, only extend to the cells within this
+            many layers of cells of the zero level set.
 
         """
 
+        if self._useNativeSolver(narrowBand):
+            from fipy.variables.fastMarching import _calcDistanceFunction
+            tmp, extensionValue = _calcDistanceFunction(self.mesh, self._value,
+                                                        extension=extensionVariable.value,
+                                                        narrowBand=narrowBand)
+            extensionVariable[:] = extensionValue
+            return
+
         dx, shape = self.getLSMshape()
         extensionValue = numerix.reshape(extensionVariable.value, shape)
         phi = numerix.reshape(self._value, shape)
@@ -327,16 +368,28 @@ class DistanceVariable(CellVariable):
 
         return dx, shape
 
-    def calcDistanceFunction(self, order=2):
+    def calcDistanceFunction(self, order=2, narrowBand=None):
         """
         Calculates the `distanceVariable` as a distance function.
 
         :Parameters:
           - `order`: The order of accuracy for the distance funtion
-            calculation, either 1 or 2.
+            calculation, either 1 or 2. The native solver is always
+            first order.
+          - `narrowBand`: If given, only recalculate the cells within this
+            many layers of cells of the zero level set. The cells
+            outside of the band are set to at least the largest
+            distance in the band.
 
         """
 
+        if self._useNativeSolver(narrowBand):
+            from fipy.variables.fastMarching import _calcDistanceFunction
+            self._value, tmp = _calcDistanceFunction(self.mesh, self._value,
+                                                     narrowBand=narrowBand)
+            self._markFresh()
+            return
+
         dx, shape = self.getLSMshape()
 
         if LSM_SOLVER == 'lsmlib':
@@ -0,0 +1,566 @@
+#!/usr/bin/env python
+
+## -*-Pyth-*-
+ # ###################################################################
+ #  FiPy - Python-based finite volume PDE solver
+ #
+ #  FILE: "fastMarching.py"
+ #
+ #  Author: Jonathan Guyer <guyer@nist.gov>
+ #  Author: Daniel Wheeler <daniel.wheeler@nist.gov>
+ #  Author: James Warren   <jwarren@nist.gov>
+ #    mail: NIST
+ #     www: http://www.ctcms.nist.gov/fipy/
+ #
+ # ========================================================================
+ # This software was developed at the National Institute of Standards
+ # of Standards and Technology, an agency of the Federal Government.
+ # Pursuant to title 17 section 105 of the United States Code,
+ # United States Code this software is not subject to copyright
+ # protection, and this software is considered to be in the public domain.
+ # FiPy is an experimental system.
+ # NIST assumes no responsibility whatsoever for its use by whatsoever for its use by
+ # other parties, and makes no guarantees, expressed or implied, about
+ # its quality, reliability, or any other characteristic.  We would
+ # appreciate acknowledgement if the software is used.
+ #
+ # To the extent that NIST may hold copyright in countries other than the
+ # United States, you are hereby granted the non-exclusive irrevocable and
+ # unconditional right to print, publish, prepare derivative works and
+ # distribute this software, in any medium, or authorize others to do so on
+ # your behalf, on a royalty-free basis throughout the world.
+ #
+ # You may improve, modify, and create derivative works of the software or
+ # any portion of the software, and you may copy and distribute such
+ # modifications or works.  Modified works should carry a notice stating
+ # that you changed the software and should note the date and nature of any
+ # such change.  Please explicitly acknowledge the National Institute of
+ # Standards and Technology as the original source.
+ #
+ # This software can be redistributed and/or modified freely provided that
+ # any derivative works bear some notice that they are derived from it, and
+ # any modified versions bear some notice that they have been modified.
+ # ========================================================================
+ #
+ # ###################################################################
+ ##
+
+"""Distance function and extension velocity solver for arbitrary meshes
+
+The solution of :math:`\abs{\nabla \phi} = 1` is found on the cell-to-cell
+connectivity of the mesh, so any `Mesh` in 1D, 2D or 3D can be used. The
+update of each cell is first order upwind: the value of a cell is found
+from its known neighbors with the smallest values whose directions are
+linearly independent, such that the gradient fit to those neighbors has
+unit magnitude. Cells are updated with the "fast iterative" variant of
+the fast marching method, i.e., the whole front of active cells is
+updated at once, until no value decreases any further. In parallel, the
+values of ghost cells are exchanged between the processes until they
+stop changing.
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+
+# Neighbor directions closer to parallel than about 25 degrees to the
+# ones already chosen don't add any information to the gradient
+_independence = 0.45
+_tolerance = 1e-12
+
+def _selectNeighbors(values, vectors, extension=None, keys=None):
+    """Choose up to `D` neighbors with independent directions for each cell
+
+    The neighbors are taken in order of increasing `keys` (`values` by
+    default). Neighbors with infinite `values` are unknown. The chosen
+    direction vectors are orthogonalized, such that the ith chosen vector is
+    :math:`\sum_{l \le i} L_{il} \hat{q}_l`.
+
+    :Parameters:
+      - `values`: `(M, n)` values of the neighbors of `n` cells
+      - `vectors`: `(D, M, n)` vectors from each cell to its neighbors
+      - `extension`: `(M, n)` extension values of the neighbors
+      - `keys`: `(M, n)` ordering of the neighbors
+
+    :Returns:
+      - `L`: `(D, D, n)` lower triangular coefficients
+      - `used`: `(D, n)` values of the chosen neighbors
+      - `usedExtension`: `(D, n)` extension values of the chosen neighbors
+      - `count`: number of neighbors chosen for each cell
+
+    """
+    D, M, n = vectors.shape
+    if keys is None:
+        keys = values
+    order = numerix.argsort(keys, axis=0)
+    cells = numerix.arange(n)
+    values = values[order, cells]
+    vectors = vectors[:, order, cells]
+    if extension is not None:
+        extension = extension[order, cells]
+
+    Q = numerix.zeros((D, D, n), 'd')
+    L = numerix.zeros((D, D, n), 'd')
+    used = numerix.zeros((D, n), 'd')
+    usedExtension = numerix.zeros((D, n), 'd')
+    count = numerix.zeros((n,), 'l')
+
+    for j in range(M):
+        r = vectors[:, j]
+        coefficients = numerix.sum(Q * r[:, numerix.newaxis], axis=0)
+        residual = r - numerix.sum(Q * coefficients[numerix.newaxis], axis=1)
+        norm = numerix.sqrt(numerix.sum(residual**2, axis=0))
+        length = numerix.sqrt(numerix.sum(r**2, axis=0))
+        accept = (numerix.isfinite(values[j])
+                  & (count < D)
+                  & (norm > _independence * length))
+        for i in range(D):
+            new = numerix.nonzero(accept & (count == i))[0]
+            if len(new) > 0:
+                L[i][:, new] = coefficients[:, new]
+                L[i][i, new] = norm[new]
+                Q[:, i][:, new] = residual[:, new] / norm[new]
+                used[i, new] = values[j, new]
+                if extension is not None:
+                    usedExtension[i, new] = extension[j, new]
+        count += accept
+
+    return L, used, usedExtension, count
+
+def _solveEikonal(L, used, count):
+    """Largest upwind solution for the chosen neighbors of each cell
+
+    With `m` neighbors, the gradient is fit exactly to the differences
+    between the cell and its neighbors, and the cell value is the larger
+    root of :math:`\abs{\nabla \phi}^2 = 1`. The largest `m` whose root is
+    no smaller than any of the neighbors it uses is chosen.
+
+    Two orthogonal neighbors at distances of `1` and `2` with values of
+    `0.5` and `1`
+
+    >>> L = numerix.zeros((2, 2, 1), 'd')
+    >>> L[0, 0] = 2.
+    >>> L[1, 1] = 1.
+    >>> value, chosen = _solveEikonal(L, numerix.array([[0.5], [1.]]), numerix.array([2]))
+    >>> dsq = 1. + 4.
+    >>> print numerix.allclose(value, (0.5 * 1. + 1. * 4. + numerix.sqrt(4. * (dsq - 0.25))) / dsq)
+    True
+    >>> print chosen
+    [2]
+
+    The second neighbor is too far upwind to contribute
+
+    >>> value, chosen = _solveEikonal(L, numerix.array([[0.5], [5.]]), numerix.array([2]))
+    >>> print value, chosen
+    [ 2.5] [1]
+    """
+    D, n = used.shape
+    y = numerix.zeros((D, n), 'd')
+    z = numerix.zeros((D, n), 'd')
+    A = numerix.zeros((n,), 'd')
+    B = numerix.zeros((n,), 'd')
+    C = numerix.zeros((n,), 'd')
+    value = numerix.zeros((n,), 'd') + numerix.inf
+    chosen = numerix.zeros((n,), 'l')
+
+    for i in range(D):
+        valid = count > i
+        diagonal = numerix.where(valid, L[i, i], 1.)
+        y[i] = numerix.where(valid, (1. - numerix.sum(L[i, :i] * y[:i], axis=0)) / diagonal, 0.)
+        z[i] = numerix.where(valid, (used[i] - numerix.sum(L[i, :i] * z[:i], axis=0)) / diagonal, 0.)
+        A += y[i]**2
+        B += y[i] * z[i]
+        C += z[i]**2
+        discriminant = B**2 - A * (C - 1.)
+        root = (B + numerix.sqrt(numerix.maximum(discriminant, 0.))) / numerix.where(valid, A, 1.)
+        upwind = valid & (discriminant >= 0) & (root >= used[i])
+        value = numerix.where(upwind, root, value)
+        chosen = numerix.where(upwind, i + 1, chosen)
+
+    return value, chosen
+
+def _extend(L, used, usedExtension, value, chosen):
+    """Extension values that satisfy :math:`\nabla u \cdot \nabla \phi = 0`
+
+    The gradients of both :math:`u` and :math:`\phi` are fit to the same
+    `chosen` neighbors.
+    """
+    D, n = used.shape
+    extension = numerix.zeros((n,), 'd')
+    for m in range(1, D + 1):
+        cells = numerix.nonzero(chosen == m)[0]
+        if len(cells) == 0:
+            continue
+        Lm = L[:m, :m][..., cells]
+        w = value[cells] - used[:m, cells]
+        y = numerix.zeros((m, len(cells)), 'd')
+        for i in range(m):
+            y[i] = (w[i] - numerix.sum(Lm[i, :i] * y[:i], axis=0)) / Lm[i, i]
+        c = numerix.zeros((m, len(cells)), 'd')
+        for i in range(m - 1, -1, -1):
+            c[i] = (y[i] - numerix.sum(Lm[i + 1:, i] * c[i + 1:], axis=0)) / Lm[i, i]
+        total = numerix.sum(c, axis=0)
+        weighted = numerix.sum(c * usedExtension[:m, cells], axis=0)
+        extension[cells] = numerix.where(total != 0,
+                                         weighted / numerix.where(total != 0, total, 1.),
+                                         usedExtension[0, cells])
+    return extension
+
+def _calcDistanceFunction(mesh, phi, extension=None, narrowBand=None):
+    r"""Signed distance from the zero level set of `phi`
+
+    :Parameters:
+      - `mesh`: any `Mesh`
+      - `phi`: the level set values of the cells of `mesh`
+      - `extension`: values to extend from the zero level set, if any
+      - `narrowBand`: only update the cells within this many layers of
+        cells of the zero level set. The cells outside of the band are
+        set to at least the largest distance found in the band, with
+        their sign kept
+
+    :Returns:
+      - the distance function, which is the same as `phi` in the cells
+        that aren't reached
+      - the extended values, or `None`
+
+    The distance is exact in 1D
+
+    >>> from fipy import Grid1D, Grid2D, Grid3D, Tri2D
+    >>> mesh = Grid1D(dx=.5, nx=8)
+    >>> phi, ext = _calcDistanceFunction(mesh, numerix.array((-1., -1., -1., -1., 1., 1., 1., 1.)))
+    >>> print numerix.allclose(phi, (-1.75, -1.25, -.75, -0.25, 0.25, 0.75, 1.25, 1.75))
+    True
+
+    and for a plane in 3D
+
+    >>> mesh = Grid3D(nx=4, ny=3, nz=5, dx=0.5, dy=2., dz=1.)
+    >>> x, y, z = mesh.cellCenters
+    >>> phi, ext = _calcDistanceFunction(mesh, numerix.where(z > 3., 1., -1.))
+    >>> print numerix.allclose(phi, z - 3.)
+    True
+
+    Cells of a single cut link are a distance from the interface given by
+    linear interpolation along the link, and cells with two cut links
+    that are orthogonal combine them
+
+    >>> dx, dy = 1., 2.
+    >>> mesh = Grid2D(dx=dx, dy=dy, nx=2, ny=3)
+    >>> phi, ext = _calcDistanceFunction(mesh, numerix.array((-1., 1., 1., 1., -1., 1.)))
+    >>> vbl = -dx * dy / numerix.sqrt(dx**2 + dy**2) / 2.
+    >>> vbr = dx / 2
+    >>> vml = dy / 2.
+    >>> dsq = dx**2 + dy**2
+    >>> top = vbr * dx**2 + vml * dy**2
+    >>> sqrt = numerix.sqrt((dx * dy)**2 * (dsq - (vbr - vml)**2))
+    >>> vmr = (top + sqrt) / dsq
+    >>> print numerix.allclose(phi, (vbl, vbr, vml, vmr, vbl, vbr))
+    True
+
+    Extension values are carried along the characteristics
+
+    >>> mesh = Grid2D(dx=1., dy=1., nx=3, ny=3)
+    >>> phi, ext = _calcDistanceFunction(mesh,
+    ...                                  numerix.array((-1., 1., 1.,
+    ...                                                  1., 1., 1.,
+    ...                                                  1., 1., 1.)),
+    ...                                  extension=numerix.array((-1., .5, -1.,
+    ...                                                            2., -1., -1.,
+    ...                                                           -1., -1., -1.)))
+    >>> tmp = 1 / numerix.sqrt(2)
+    >>> v1 = 0.5 + tmp
+    >>> v2 = 1.5
+    >>> tmp1 = (v1 + v2) / 2 + numerix.sqrt(2. - (v1 - v2)**2) / 2
+    >>> tmp2 = tmp1 + 1 / numerix.sqrt(2)
+    >>> print numerix.allclose(phi, (-tmp / 2, 0.5, 1.5, 0.5, 0.5 + tmp,
+    ...                              tmp1, 1.5, tmp1, tmp2))
+    True
+    >>> print numerix.allclose(ext, (1.25, .5, .5, 2, 1.25, 0.9544, 2, 1.5456, 1.25), rtol=1e-4)
+    True
+
+    Unstructured meshes are handled the same way. Links between
+    neighboring cells that are far from orthogonal to each other, like
+    those of `Tri2D`, only give a first order upwind update along some
+    directions, so the distance from a circle is only accurate to within
+    a cell or so
+
+    >>> mesh = Tri2D(nx=40, ny=40, dx=0.025, dy=0.025)
+    >>> x, y = mesh.cellCenters
+    >>> r = numerix.sqrt((x - 0.5)**2 + (y - 0.5)**2)
+    >>> phi, ext = _calcDistanceFunction(mesh, numerix.where(r > 0.25, 1., -1.))
+    >>> error = abs(phi - (r - 0.25))
+    >>> print error.max() < 3 * 0.025, error.mean() < 0.025
+    True True
+
+    A narrow band only updates the cells within a few layers of the
+    interface. The cells beyond it are pushed out to the edge of the band,
+    so that none of them look closer to the interface than the band does
+
+    >>> mesh = Grid1D(nx=10)
+    >>> phi, ext = _calcDistanceFunction(mesh, numerix.where(mesh.x > 5, 1., -1.),
+    ...                                  narrowBand=2)
+    >>> print phi
+    [-2.5 -2.5 -2.5 -1.5 -0.5  0.5  1.5  2.5  2.5  2.5]
+
+    while cells that are already farther away keep their values
+
+    >>> phi, ext = _calcDistanceFunction(mesh, 3 * (mesh.x - 5), narrowBand=2)
+    >>> print phi
+    [-13.5 -10.5  -2.5  -1.5  -0.5   0.5   1.5   2.5  10.5  13.5]
+
+    In parallel, each process only solves on its own cells and its ghost
+    cells. The values of the ghost cells are repeatedly replaced with those
+    of the processes that own them until no value changes anywhere, which
+    gives the same result as a serial solution
+
+    >>> from fipy import CellVariable
+    >>> from fipy.tools import serialComm
+    >>> def circle(mesh):
+    ...     x, y = mesh.cellCenters
+    ...     r = numerix.sqrt((x - 0.5)**2 + (y - 0.3)**2)
+    ...     return _calcDistanceFunction(mesh, numerix.where(r > 0.25, 1., -1.),
+    ...                                  extension=numerix.array(y), narrowBand=4)
+    >>> mesh = Grid2D(nx=30, ny=40, dx=1. / 30, dy=1. / 30)
+    >>> phi, ext = circle(mesh)
+    >>> serialPhi, serialExt = circle(Grid2D(nx=30, ny=40, dx=1. / 30, dy=1. / 30,
+    ...                                      communicator=serialComm))
+    >>> print numerix.allclose(CellVariable(mesh=mesh, value=phi).globalValue, serialPhi)
+    True
+    >>> print numerix.allclose(CellVariable(mesh=mesh, value=ext).globalValue, serialExt)
+    True
+
+    Threads can stand in for the processes, so this holds for any number
+    of them without `mpirun`
+
+    >>> from fipy.tools.comms.threadCommWrapper import runThreads
+    >>> def threaded(comm):
+    ...     mesh = Grid2D(nx=30, ny=40, dx=1. / 30, dy=1. / 30, communicator=comm)
+    ...     phi, ext = circle(mesh)
+    ...     IDs = mesh._globalOverlappingCellIDs
+    ...     return numerix.allclose(phi, serialPhi[IDs]) and numerix.allclose(ext, serialExt[IDs])
+    >>> for Nproc in (2, 3, 5):
+    ...     print runThreads(threaded, Nproc=Nproc)
+    [True, True]
+    [True, True, True]
+    [True, True, True, True, True]
+    """
+    N = mesh.numberOfCells
+    phi = numerix.array(phi, 'd')
+
+    cellToCellIDs = mesh._cellToCellIDs
+    mask = MA.getmaskarray(cellToCellIDs)
+    ids = numerix.where(mask, numerix.arange(N)[numerix.newaxis], MA.filled(cellToCellIDs, 0))
+    vectors = MA.filled(mesh._cellToCellDistances * mesh._cellNormals, 0)
+    vectors = numerix.where(mask[numerix.newaxis], 0., vectors)
+
+    if extension is not None:
+        extension = numerix.array(extension, 'd')
+
+    if mesh.communicator.Nproc > 1:
+        exchange = _GhostExchange(mesh)
+        ghosts = exchange.ghosts
+    else:
+        exchange = None
+        ghosts = numerix.zeros((N,), 'bool')
+
+    ## initialize the cells at the interface from the crossings of their
+    ## links. Ghost cells may be missing some of their neighbors, so they
+    ## get their values from the processes that own them.
+    neighborPhi = phi[ids]
+    cut = ~mask & (phi * neighborPhi <= 0)
+    difference = abs(phi - neighborPhi)
+    fraction = numerix.where(cut & (difference > 0),
+                             abs(phi) / numerix.where(difference > 0, difference, 1.),
+                             0.)
+    crossings = vectors * fraction
+    interface = cut.any(axis=0) & ~ghosts
+
+    interfaceIDs = numerix.nonzero(interface)[0]
+    keys = numerix.where(cut, numerix.sqrt(numerix.sum(crossings**2, axis=0)), numerix.inf)
+    L, used, usedExtension, count = _selectNeighbors(values=numerix.where(cut, 0., numerix.inf)[:, interfaceIDs],
+                                                     vectors=crossings[..., interfaceIDs],
+                                                     keys=keys[:, interfaceIDs])
+    value, chosen = _solveEikonal(L, used, count)
+
+    distance = numerix.zeros((N,), 'd') + numerix.inf
+    distance[interfaceIDs] = numerix.where(phi[interfaceIDs] == 0, 0., value)
+
+    if exchange is not None:
+        interface = exchange(interface)
+        distance = exchange(distance)
+        interfaceIDs = numerix.nonzero(interface)[0]
+        if not mesh.communicator.any(interface):
+            return phi, extension
+    elif len(interfaceIDs) == 0:
+        return phi, extension
+
+    sign = numerix.where(phi > 0, 1, -1)
+
+    if extension is not None:
+        ## extend from the positive side of the interface to the negative side
+        negativeIDs = interfaceIDs[(phi[interfaceIDs] <= 0) & ~ghosts[interfaceIDs]]
+        positiveNeighbors = cut[:, negativeIDs] & (phi[ids[:, negativeIDs]] > 0)
+        neighborDistance = numerix.where(positiveNeighbors, distance[ids[:, negativeIDs]], numerix.inf)
+        L, used, usedExtension, count = _selectNeighbors(values=neighborDistance,
+                                                         vectors=vectors[..., negativeIDs],
+                                                         extension=extension[ids[:, negativeIDs]])
+        extension[negativeIDs] = numerix.where(count > 0,
+                                               _extend(L, used, usedExtension,
+                                                       -distance[negativeIDs], count),
+                                               extension[negativeIDs])
+        if exchange is not None:
+            extension = exchange(extension)
+
+    band = interface.copy()
+    if narrowBand is None:
+        band[:] = True
+    else:
+        for layer in range(narrowBand):
+            band[ids[:, band][~mask[:, band]]] = True
+            if exchange is not None:
+                band = exchange(band)
+
+    known = interface | ghosts
+    active = numerix.zeros((N,), 'bool')
+    active[ids[:, interfaceIDs][~mask[:, interfaceIDs]]] = True
+    active &= band & ~known
+
+    while True:
+        _march(distance, extension, sign, ids, mask, vectors, active, band & ~known)
+
+        if exchange is None:
+            break
+
+        ## restart from the neighbors of any ghost cells that were
+        ## improved by the processes that own them
+        oldDistance = distance[ghosts]
+        distance = exchange(distance)
+        changed = numerix.zeros((N,), 'bool')
+        changed[ghosts] = distance[ghosts] < oldDistance * (1 - _tolerance)
+        if extension is not None:
+            oldExtension = extension[ghosts]
+            extension = exchange(extension)
+            changed[ghosts] |= abs(extension[ghosts] - oldExtension) > _tolerance * (1 + abs(oldExtension))
+
+        if not mesh.communicator.any(changed):
+            break
+
+        changedIDs = numerix.nonzero(changed)[0]
+        active[ids[:, changedIDs][~mask[:, changedIDs]]] = True
+        active &= band & ~known
+
+    phi = numerix.where(numerix.isinf(distance), phi, sign * distance)
+
+    if narrowBand is not None:
+        ## stale values outside of the band could otherwise be closer to
+        ## the interface than the band itself
+        farthest = numerix.where(band & ~numerix.isinf(distance), distance, 0.).max()
+        if exchange is not None:
+            farthest = max(mesh.communicator.MaxAll(numerix.array([farthest])))
+        phi = numerix.where(band, phi, sign * numerix.maximum(abs(phi), farthest))
+
+    return phi, extension
+
+def _march(distance, extension, sign, ids, mask, vectors, active, free):
+    """Update the `active` cells, and then their neighbors, until no value decreases
+
+    Only the `free` cells are updated. `distance`, `extension` and
+    `active` are modified in place.
+    """
+    while active.any():
+        activeIDs = numerix.nonzero(active)[0]
+        neighborIDs = ids[:, activeIDs]
+        upwind = ~mask[:, activeIDs] & (sign[neighborIDs] == sign[activeIDs])
+        if extension is not None:
+            neighborExtension = extension[neighborIDs]
+        else:
+            neighborExtension = None
+        L, used, usedExtension, count = _selectNeighbors(values=numerix.where(upwind, distance[neighborIDs], numerix.inf),
+                                                         vectors=vectors[..., activeIDs],
+                                                         extension=neighborExtension)
+        value, chosen = _solveEikonal(L, used, count)
+
+        old = distance[activeIDs]
+        changed = value < old * (1 - _tolerance)
+        distance[activeIDs[changed]] = value[changed]
+
+        if extension is not None:
+            ## the extension values follow their neighbors, even when
+            ## the distance doesn't change
+            unchanged = ~changed & (count > 0) & (value <= old * (1 + _tolerance))
+            update = changed | unchanged
+            newExtension = _extend(L[..., update], used[:, update], usedExtension[:, update],
+                                   value[update], chosen[update])
+            oldExtension = extension[activeIDs[update]]
+            extensionChanged = abs(newExtension - oldExtension) > _tolerance * (1 + abs(oldExtension))
+            extension[activeIDs[update]] = newExtension
+            changed[update] |= extensionChanged
+
+        changedIDs = activeIDs[changed]
+        active[:] = False
+        active[ids[:, changedIDs][~mask[:, changedIDs]]] = True
+        active &= free
+
+class _GhostExchange(object):
+    """Copies the values of the cells owned by each process to the ghost
+    cells of its neighbors
+
+    The neighbors of each process, and the cells it sends to each of them,
+    are found once. After that, each process only exchanges values with
+    its own neighbors.
+
+    >>> from fipy import Grid1D
+    >>> from fipy.tools.comms.threadCommWrapper import runThreads
+    >>> def neighbors(comm):
+    ...     exchange = _GhostExchange(Grid1D(nx=12, communicator=comm))
+    ...     return sorted(exchange.exports.keys()), sorted(exchange.imports.keys())
+    >>> print runThreads(neighbors, Nproc=4)
+    [([1], [1]), ([0, 2], [0, 2]), ([1, 3], [1, 3]), ([2], [2])]
+    """
+    def __init__(self, mesh):
+        self.communicator = mesh.communicator
+        N = mesh.numberOfCells
+        globalIDs = numerix.asarray(mesh._globalOverlappingCellIDs)
+
+        self.ghosts = numerix.ones((N,), 'bool')
+        self.ghosts[mesh._localNonOverlappingCellIDs] = False
+        ghostIDs = numerix.nonzero(self.ghosts)[0]
+        ownedIDs = numerix.nonzero(~self.ghosts)[0]
+
+        ## the cells owned here that are ghost cells of each other process,
+        ## in order of their global IDs
+        self.exports = {}
+        for rank, needed in enumerate(self.communicator.allgather(globalIDs[ghostIDs])):
+            if rank != self.communicator.procID:
+                exported = ownedIDs[numerix.in1d(globalIDs[ownedIDs], needed)]
+                if len(exported) > 0:
+                    self.exports[rank] = exported[numerix.argsort(globalIDs[exported])]
+
+        ## the ghost cells that receive the values sent by each neighbor
+        sources = [rank for rank, destinations
+                   in enumerate(self.communicator.allgather(self.exports.keys()))
+                   if self.communicator.procID in destinations]
+        received = self.communicator.exchange(dict((rank, globalIDs[exported])
+                                                   for rank, exported in self.exports.items()),
+                                              sources)
+        order = numerix.argsort(globalIDs[ghostIDs])
+        sortedGhosts = globalIDs[ghostIDs][order]
+        self.imports = dict((rank, ghostIDs[order[numerix.searchsorted(sortedGhosts, exported)]])
+                            for rank, exported in received.items())
+
+    def __call__(self, values):
+        values = values.copy()
+        received = self.communicator.exchange(dict((rank, values[exported])
+                                                   for rank, exported in self.exports.items()),
+                                              self.imports.keys())
+        for rank, ghostIDs in self.imports.items():
+            values[ghostIDs] = received[rank]
+        return values
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -44,7 +44,7 @@
 
 __docformat__ = 'restructuredtext'
 
-from fipy.tools.numerix import random
+from fipy.tools import numerix
 from fipy.variables.noiseVariable import NoiseVariable
 
 __all__ = ["GammaNoiseVariable"]
@@ -132,8 +132,7 @@ class GammaNoiseVariable(NoiseVariable):
         self.rate = self._requires(rate)
 
     def random(self):
-        return random.gamma(shape=self.shapeParam, scale=self.rate,
-                            size=[self.mesh.globalNumberOfCells])
+        return self._gamma(self.shapeParam) * numerix.array(self.rate)
 
 def _test():
     import fipy.tests.doctestPlus
@@ -46,7 +46,7 @@
 
 __docformat__ = 'restructuredtext'
 
-from fipy.tools.numerix import random, sqrt
+from fipy.tools import numerix
 from fipy.variables.noiseVariable import NoiseVariable
 
 __all__ = ["GaussianNoiseVariable"]
@@ -159,18 +159,9 @@ class GaussianNoiseVariable(NoiseVariable):
         self.variance = variance
         NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
 
-    def parallelRandom(self):
-
-        if hasattr(self.variance, 'globalValue'):
-            variance = self.variance.globalValue
-        else:
-            variance = self.variance
-
-        if self.mesh.communicator.procID == 0:
-            return random.normal(self.mean, sqrt(variance),
-                                 size = [self.mesh.globalNumberOfCells])
-        else:
-            return None
+    def random(self):
+        return (numerix.array(self.mean)
+                + numerix.sqrt(numerix.array(self.variance)) * self._normal())
 
 def _test():
     import fipy.tests.doctestPlus
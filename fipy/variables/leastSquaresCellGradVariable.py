@@ -64,15 +64,24 @@ class _LeastSquaresCellGradVariable(CellVariable):
     def _neighborValue(self):
         return numerix.take(numerix.array(self.var), self.mesh._cellToCellIDs)
 
-    def _calcValue(self):
-        cellToCellDistances = self.mesh._cellToCellDistances
-        cellNormals = self.mesh._cellNormals
-        neighborValue = self._neighborValue
-        value = numerix.array(self.var)
-        cellDistanceNormals = cellToCellDistances * cellNormals
+    @property
+    def _geometry(self):
+        """The `cellDistanceNormals` and the inverse moment matrix of each cell
+
+        These depend only on the mesh, so they are calculated once and
+        shared by every least-squares gradient on that mesh, until
+        `Mesh._setGeometry()` discards them.
+        """
+        mesh = self.mesh
+        if not hasattr(mesh, '_leastSquaresGeometry'):
+            mesh._leastSquaresGeometry = self._calcGeometry()
+        return mesh._leastSquaresGeometry
+
+    def _calcGeometry(self):
+        cellDistanceNormals = self.mesh._cellToCellDistances * self.mesh._cellNormals
 
-        N = self.mesh.numberOfCells
         M = self.mesh._maxFacesPerCell
+        N = self.mesh.numberOfCells
         D = self.mesh.dim
 
         mat = numerix.zeros((D, D, M, N), 'd')
@@ -84,19 +93,22 @@ class _LeastSquaresCellGradVariable(CellVariable):
 
         mat = numerix.sum(mat, axis=2)
 
-        vec = numerix.array(numerix.sum((neighborValue - value) * cellDistanceNormals, axis=1))
-
         if D == 1:
-            vec[0] = vec[0] / mat[0, 0]
+            inverse = 1. / mat
         elif D == 2:
             divisor = mat[0,0] * mat[1,1] - mat[0,1] * mat[1,0]
-            gradx = (vec[0] * mat[1,1] - vec[1] * mat[1,0]) / divisor
-            grady = (vec[1] * mat[0,0] - vec[0] * mat[0,1]) / divisor
-            vec[0] = gradx
-            vec[1] = grady
+            inverse = numerix.array([[mat[1,1], -mat[1,0]],
+                                     [-mat[0,1], mat[0,0]]]) / divisor
         else:
-            ## very stuppy! numerix.linalg.solve should have an axis argument!!!
-            for i in range(N):
-                vec[...,i] = numerix.linalg.solve(mat[...,i],vec[...,i])
+            inverse = numerix.linalg.inv(mat.transpose((2, 0, 1))).transpose((1, 2, 0))
+
+        return cellDistanceNormals, inverse
+
+    def _calcValue(self):
+        cellDistanceNormals, inverse = self._geometry
+        neighborValue = self._neighborValue
+        value = numerix.array(self.var)
+
+        vec = numerix.array(numerix.sum((neighborValue - value) * cellDistanceNormals, axis=1))
 
-        return vec
+        return numerix.sum(inverse * vec[numerix.newaxis], axis=1)
@@ -44,10 +44,21 @@
 
 __docformat__ = 'restructuredtext'
 
+from fipy.tools import numerix
 from fipy.variables.cellVariable import CellVariable
 
 __all__ = ["NoiseVariable"]
 
+_golden = numerix.uint64(0x9E3779B97F4A7C15)
+
+def _mix(x):
+    """Scramble the bits of the `uint64` array `x` with the SplitMix64 finalizer.
+    """
+    x = x + _golden
+    x = (x ^ (x >> numerix.uint64(30))) * numerix.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> numerix.uint64(27))) * numerix.uint64(0x94D049BB133111EB)
+    return x ^ (x >> numerix.uint64(31))
+
 class NoiseVariable(CellVariable):
     r"""
     .. attention:: This class is abstract. Always create one of its subclasses.
@@ -60,13 +71,44 @@ class NoiseVariable(CellVariable):
 
     The `seed()` and `get_seed()` functions of the
     `fipy.tools.numerix.random` module can be set and query the random
-    number generated used by all `NoiseVariable` objects.
+    number generated used to seed each `NoiseVariable` when it is created.
+
+    The values are generated by each processor, for its own cells, from a
+    counter-based stream keyed on the seed, the number of times the noise
+    has been scrambled and the global ID of each cell. They are thus the
+    same for any number of processors. Accordingly, `random()` returns the
+    values of the local cells, including ghost cells, on every processor,
+    rather than the values of every cell of the mesh on processor 0.
+
+    >>> from fipy import numerix
+    >>> from fipy.meshes import Grid1D
+    >>> from fipy.variables.uniformNoiseVariable import UniformNoiseVariable
+    >>> numerix.random.seed(1)
+    >>> noise = UniformNoiseVariable(mesh=Grid1D(nx=10))
+    >>> numerix.random.seed(1)
+    >>> fewer = UniformNoiseVariable(mesh=Grid1D(nx=6))
+    >>> print numerix.allequal(noise.value[:6], fewer.value)
+    True
+    >>> noise.scramble()
+    >>> print numerix.allequal(noise.value[:6], fewer.value)
+    False
+    >>> fewer.scramble()
+    >>> print numerix.allequal(noise.value[:6], fewer.value)
+    True
     """
     def __init__(self, mesh, name = '', hasOld = 0):
         if self.__class__ is NoiseVariable:
             raise NotImplementedError, "can't instantiate abstract base class"
 
         CellVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+
+        if self.mesh.communicator.procID == 0:
+            seed = numerix.random.randint(2**31)
+        else:
+            seed = None
+        self._seed = self.mesh.communicator.bcast(seed, root=0)
+        self._step = 0
+
         self.scramble()
 
     def copy(self):
@@ -82,26 +124,102 @@ class NoiseVariable(CellVariable):
         """
         Generate a new random distribution.
         """
+        self._step += 1
         self._markStale()
 
     def random(self):
-        pass
+        """
+        Return random values for the local cells.
+        """
+        raise NotImplementedError
 
     def parallelRandom(self):
+        """
+        Return random values for every cell of the mesh on processor 0,
+        and `None` on the other processors.
+
+        Deprecated, as `random()` now returns the values of the local cells
+        on every processor. Use it, or `globalValue`, instead.
+
+        >>> import warnings
+        >>> from fipy.meshes import Grid1D
+        >>> from fipy.variables.uniformNoiseVariable import UniformNoiseVariable
+        >>> noise = UniformNoiseVariable(mesh=Grid1D(nx=3))
+        >>> with warnings.catch_warnings(record=True) as caught:
+        ...     warnings.simplefilter("always")
+        ...     rnd = noise.parallelRandom()
+        >>> print caught[0].category.__name__
+        DeprecationWarning
+        >>> print numerix.allequal(rnd, noise.globalValue) # doctest: +PROCESSOR_0
+        True
+        """
+        import warnings
+        warnings.warn("NoiseVariable.parallelRandom() is deprecated; use random() or globalValue",
+                      DeprecationWarning, stacklevel=2)
 
+        # gathering is collective, so every processor must take part
+        globalValue = self.globalValue
         if self.mesh.communicator.procID == 0:
-            return self.random()
+            return globalValue
         else:
             return None
 
-    def _calcValue(self):
-        from fipy.tools import parallelComm
+    def _uniform(self, key=(), cells=slice(None)):
+        """Return uniform deviates in the open interval (0, 1) for the local
+        `cells`.
 
-        rnd = self.parallelRandom()
+        Each tuple of integers `key` selects an independent stream.
+        """
+        state = _mix(numerix.array([self._seed], dtype=numerix.uint64))
+        for k in (self._step,) + key:
+            state = _mix(state ^ numerix.uint64(k))
 
-        if parallelComm.Nproc > 1:
-            rnd = parallelComm.bcast(rnd, root=0)
+        cellIDs = numerix.array(self.mesh._globalOverlappingCellIDs[cells], dtype=numerix.uint64)
+        bits = _mix(state + cellIDs * _golden)
 
-            return rnd[self.mesh._globalOverlappingCellIDs]
-        else:
-            return rnd
+        return ((bits >> numerix.uint64(11)).astype(float) + 0.5) / 2.**53
+
+    def _normal(self, key=(), cells=slice(None)):
+        """Return standard normal deviates for the local `cells`.
+        """
+        return (numerix.sqrt(-2. * numerix.log(self._uniform(key + (0,), cells)))
+                * numerix.cos(2. * numerix.pi * self._uniform(key + (1,), cells)))
+
+    def _gamma(self, shape, key=()):
+        """Return gamma deviates with unit scale for the local cells.
+
+        Uses the rejection method of Marsaglia and Tsang, boosting
+        `shape` < 1 by one.
+        """
+        shape = numerix.array(shape, dtype=float) * numerix.ones(self.mesh.numberOfCells)
+        boost = shape < 1
+        d = numerix.where(boost, shape + 1., shape) - 1. / 3.
+        c = 1. / numerix.sqrt(9. * d)
+
+        value = numerix.zeros(self.mesh.numberOfCells)
+        pending = numerix.arange(self.mesh.numberOfCells)
+        attempt = 0
+        while len(pending) > 0:
+            x = self._normal(key + (0, attempt), pending)
+            u = self._uniform(key + (1, attempt), pending)
+            v = (1. + c[pending] * x)**3
+            logv = numerix.log(numerix.where(v > 0, v, 1.))
+            dp = d[pending]
+            accept = (v > 0) & (numerix.log(u) < 0.5 * x**2 + dp - dp * v + dp * logv)
+            value[pending[accept]] = (dp * v)[accept]
+            pending = pending[~accept]
+            attempt += 1
+
+        with numerix.errstate(divide='ignore'):
+            u = self._uniform(key + (2,))
+            return numerix.where(boost, value * numerix.exp(numerix.log(u) / shape), value)
+
+    def _calcValue(self):
+        return self.random()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
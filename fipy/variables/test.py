@@ -64,6 +64,7 @@ def _suite():
             'fipy.variables.exponentialNoiseVariable',
             'fipy.variables.gammaNoiseVariable',
             'fipy.variables.gaussianNoiseVariable',
+            'fipy.variables.noiseVariable',
             'fipy.variables.uniformNoiseVariable',
             'fipy.variables.cellVolumeAverageVariable',
             'fipy.variables.modularVariable',
@@ -77,7 +78,8 @@ def _suite():
             'fipy.variables.surfactantConvectionVariable',
             'fipy.variables.surfactantVariable',
             'fipy.variables.levelSetDiffusionVariable',
-            'fipy.variables.distanceVariable'
+            'fipy.variables.distanceVariable',
+            'fipy.variables.fastMarching'
         ))
 
 if __name__ == '__main__':
@@ -44,7 +44,7 @@
 
 __docformat__ = 'restructuredtext'
 
-from fipy.tools.numerix import random
+from fipy.tools import numerix
 from fipy.variables.noiseVariable import NoiseVariable
 
 __all__ = ["UniformNoiseVariable"]
@@ -97,8 +97,9 @@ class UniformNoiseVariable(NoiseVariable):
         NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
 
     def random(self):
-        return random.uniform(self.minimum, self.maximum,
-                              size=[self.mesh.globalNumberOfCells])
+        minimum = numerix.array(self.minimum)
+        maximum = numerix.array(self.maximum)
+        return minimum + (maximum - minimum) * self._uniform()
 
 def _test():
     import fipy.tests.doctestPlus
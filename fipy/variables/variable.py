@@ -53,6 +53,7 @@ from fipy.tools.dimensions import physicalField
 from fipy.tools import numerix
 from fipy.tools import parser
 from fipy.tools import inline
+from fipy.tools.performance import profiler
 
 __all__ = ["Variable"]
 
@@ -522,7 +523,8 @@ class Variable(object):
         """
 
         if self.stale or not self._isCached() or self._value is None:
-            value = self._calcValue()
+            with profiler._section("variables", lambda: self.name or self.__class__.__name__):
+                value = self._calcValue()
             if self._isCached():
                 self._setValueInternal(value=value)
             else:
@@ -972,6 +974,55 @@ class Variable(object):
 
         return argDict['result']
 
+    def _execNumexpr(self):
+        """
+        Evaluates the whole expression tree from _getCstring() in a
+        single pass with `numexpr`, rather than creating a temporary
+        array for each intermediate operation.
+
+            >>> a = Variable((1., 2., 3.))
+            >>> b = Variable((4., 5., 6.))
+            >>> c = numerix.sqrt(a) * b + a**2 / b - numerix.arccos(a / 3.)
+            >>> print numerix.allclose(c._execNumexpr(), c.value)
+            True
+            >>> print numerix.allclose(c._execNumexpr(), c.value) # doctest: +NUMEXPR
+            True
+            >>> print (a > b)._execNumexpr()
+            [False False False]
+
+        The result has the same type as the un-fused calculation
+
+            >>> d = Variable((1, 2, 3)) * 2
+            >>> print d._execNumexpr(), d._execNumexpr().dtype == d.getsctype()
+            [2 4 6] True
+
+        Expressions that `numexpr` cannot evaluate fall back to the
+        un-fused calculation
+
+            >>> print (Variable((1, 2, 3)) / 2)._execNumexpr()
+            [0 1 1]
+        """
+
+        from fipy.tools import inline
+
+        if not hasattr(self, 'typecode'):
+            # the first evaluation is un-fused in order to determine
+            # the type of the result
+            value = self._calcValue_()
+            self.typecode = numerix.obj2sctype(value)
+            return value
+
+        argDict = {}
+        string = self._getCstring(argDict=argDict, freshen=True)
+
+        result = inline._runNumexpr(string, **argDict)
+
+        shape = getattr(self, 'opShape', None)
+        if result is None or (shape is not None and result.shape != tuple(shape)):
+            return self._calcValue_()
+
+        return numerix.asarray(result, dtype=self.getsctype())
+
     def _broadcastShape(self, other):
         ignore, ignore, broadcastshape = numerix._broadcastShapes(self.shape, numerix.getShape(other))
 
@@ -47,6 +47,7 @@
 
 __docformat__ = 'restructuredtext'
 
+import os
 import sys
 
 from fipy.tools import numerix
@@ -108,35 +109,91 @@ class TSVViewer(AbstractViewer):
             assert mesh is var.mesh
 
 
+    # number of rows formatted by each write
+    _chunk = 10000
+
+    def _limitedValues(self, values, dim):
+        """Omit the elements whose centers lie outside of the specified limits
+        and replace any values that lie outside of the specified datalimits
+        with `nan`.
+
+        :Returns:
+          an array of the remaining elements by columns
+        """
+        keep = numerix.ones(values.shape[-1], dtype=bool)
+        for axis in range(dim):
+            mini = self._getLimit("%smin" % self._axis[axis])
+            maxi = self._getLimit("%smax" % self._axis[axis])
+
+            if mini:
+                keep &= ~(values[axis] < mini)
+            if maxi:
+                keep &= ~(values[axis] > maxi)
+
+        values = numerix.array(values[..., keep], dtype=float).transpose()
+
+        mini = self._getLimit("datamin")
+        maxi = self._getLimit("datamax")
+        data = values[..., dim:]
+        # find both sets of outliers before any are replaced, and don't
+        # warn about comparing values that are already `nan`
+        with numerix.errstate(invalid='ignore'):
+            outside = numerix.zeros(data.shape, dtype=bool)
+            if mini:
+                outside |= data < mini
+            if maxi:
+                outside |= data > maxi
+        data[outside] = float("NaN")
+
+        return values
+
     def _plot(self, values, f, dim):
-        for index in range(values.shape[-1]):
-            lineValues = values[...,index]
+        values = self._limitedValues(values, dim)
 
-            # omit any elements whose cell centers lie outside of the specified limits
-            skip = False
-            for axis in range(dim):
-                mini = self._getLimit("%smin" % self._axis[axis])
-                maxi = self._getLimit("%smax" % self._axis[axis])
+        line = "\t".join(["%.15g"] * values.shape[-1]) + "\n"
+        for start in range(0, len(values), self._chunk):
+            rows = values[start:start + self._chunk]
+            f.write((line * len(rows)) % tuple(rows.ravel().tolist()))
 
-                if (mini and lineValues[axis] < mini) or (maxi and lineValues[axis] > maxi):
-                    skip = True
-                    break
+    def _headings(self, dim):
+        headings = []
+        for index in range(dim):
+            headings.extend(self._axis[index])
 
-            if skip:
-                continue
+        for var in self.vars:
+            name = var.name
+            if (isinstance(var, CellVariable) or isinstance(var, FaceVariable)) and var.rank == 1:
+                for index in range(dim):
+                    headings.extend(["%s_%s" % (name, self._axis[index])])
+            else:
+                headings.extend([name])
+
+        return headings
 
-            # replace any values that lie outside of the specified datalimits with 'nan'
-            for valIndex in range(dim, len(lineValues)):
-                mini = self._getLimit("datamin")
-                maxi = self._getLimit("datamax")
+    def _values(self, centers, Variable):
+        values = [centers.globalValue]
+        for var in self.vars:
+            if isinstance(var, Variable) and var.rank == 1:
+                values.append(numerix.array(var.globalValue))
+            else:
+                values.append((numerix.array(var.globalValue),))
 
-                if (mini and lineValues[valIndex] < mini) or (maxi and lineValues[valIndex] > maxi):
-                    lineValues[valIndex] = float("NaN")
-                    break
+        return numerix.concatenate(values)
 
-            line = ["%.15g" % value for value in lineValues]
-            f.write("\t".join(line))
-            f.write("\n")
+    def _writeColumns(self, f, headings, columns):
+        """Save the `columns` as a NumPy structured array with a field for
+        each of the `headings`.
+        """
+        fields = []
+        for heading in headings:
+            name = heading
+            suffix = 1
+            while name in [field for field, dtype in fields]:
+                name = "%s_%d" % (heading, suffix)
+                suffix += 1
+            fields.append((name, columns.dtype))
+
+        numerix.save(f, numerix.ascontiguousarray(columns).view(fields).ravel())
 
     def plot(self, filename=None):
         """
@@ -163,6 +220,47 @@ class TSVViewer(AbstractViewer):
         0.05    0.45    -2      35      -3.33333333333333
         0.15    0.45    5       35      5
 
+        Cells outside of the limits are omitted and values outside of the
+        datalimits are replaced with `nan`.
+
+        >>> TSVViewer(vars = (v, v.grad), xmax = 0.1, datamax = 9.).plot() #doctest: +NORMALIZE_WHITESPACE
+        x       y       var     var_gauss_grad_x        var_gauss_grad_y
+        0.05    0.15    0       nan     -3.33333333333333
+        0.05    0.45    -2      nan     -3.33333333333333
+
+        Values that are already `nan` are compared without warning.
+
+        >>> import warnings
+        >>> w = CellVariable(mesh = m, name = "w", value = (0, float("nan"), 3, 10))
+        >>> with warnings.catch_warnings(record=True) as caught:
+        ...     warnings.simplefilter("always")
+        ...     TSVViewer(vars = (v, w), datamin = -1., datamax = 9.).plot() #doctest: +NORMALIZE_WHITESPACE
+        x       y       var     w
+        0.05    0.15    0       0
+        0.15    0.15    2       nan
+        0.05    0.45    nan     3
+        0.15    0.45    5       nan
+        >>> print [str(warning.message) for warning in caught
+        ...        if "invalid value" in str(warning.message)]
+        []
+
+        If `filename` ends in ".npy", the columns are saved as a NumPy
+        structured array, with a field for each heading, which can be read
+        back with memory mapping.
+
+        >>> import os
+        >>> import tempfile
+        >>> fd, filename = tempfile.mkstemp(suffix=".npy")
+        >>> os.close(fd)
+        >>> TSVViewer(vars = (v, v.grad)).plot(filename) # doctest: +SERIAL
+        >>> columns = numerix.load(filename, mmap_mode="r") # doctest: +SERIAL
+        >>> print columns.dtype.names # doctest: +SERIAL
+        ('x', 'y', 'var', 'var_gauss_grad_x', 'var_gauss_grad_y')
+        >>> print columns["var_gauss_grad_y"] # doctest: +SERIAL
+        [-3.33333333  5.         -3.33333333  5.        ]
+        >>> del columns
+        >>> os.remove(filename)
+
         :Parameters:
           filename
             If not `None`, the name of a file to save the image into.
@@ -171,8 +269,28 @@ class TSVViewer(AbstractViewer):
         mesh = self.vars[0].mesh
         dim = mesh.dim
 
+        headings = self._headings(dim)
+
+        cellVars = [var for var in self.vars if isinstance(var, CellVariable)]
+        faceVars = [var for var in self.vars if isinstance(var, FaceVariable)]
+
+        if filename is not None and os.path.splitext(filename)[1] == ".npy":
+            columns = []
+            if len(cellVars) > 0:
+                columns.append(self._limitedValues(self._values(mesh.cellCenters, CellVariable), dim))
+            if len(faceVars) > 0:
+                columns.append(self._limitedValues(self._values(mesh.faceCenters, FaceVariable), dim))
+
+            if mesh.communicator.procID == 0:
+                f = open(filename, "wb")
+                try:
+                    self._writeColumns(f, headings, numerix.concatenate(columns))
+                finally:
+                    f.close()
+
+            return
+
         if filename is not None:
-            import os
             if mesh.communicator.procID == 0:
                 if os.path.splitext(filename)[1] == ".gz":
                     import gzip
@@ -188,43 +306,14 @@ class TSVViewer(AbstractViewer):
             f.write(self.title)
             f.write("\n")
 
-        headings = []
-        for index in range(dim):
-            headings.extend(self._axis[index])
-
-        for var in self.vars:
-            name = var.name
-            if (isinstance(var, CellVariable) or isinstance(var, FaceVariable)) and var.rank == 1:
-                for index in range(dim):
-                    headings.extend(["%s_%s" % (name, self._axis[index])])
-            else:
-                headings.extend([name])
-
         f.write("\t".join(headings))
         f.write("\n")
 
-        cellVars = [var for var in self.vars if isinstance(var, CellVariable)]
-        faceVars = [var for var in self.vars if isinstance(var, FaceVariable)]
-
         if len(cellVars) > 0:
-            values = mesh.cellCenters.globalValue
-            for var in self.vars:
-                if isinstance(var, CellVariable) and var.rank == 1:
-                    values = numerix.concatenate((values, numerix.array(var.globalValue)))
-                else:
-                    values = numerix.concatenate((values, (numerix.array(var.globalValue),)))
-
-            self._plot(values, f, dim)
+            self._plot(self._values(mesh.cellCenters, CellVariable), f, dim)
 
         if len(faceVars) > 0:
-            values = mesh.faceCenters.globalValue
-            for var in self.vars:
-                if isinstance(var, FaceVariable) and var.rank == 1:
-                    values = numerix.concatenate((values, numerix.array(var.globalValue)))
-                else:
-                    values = numerix.concatenate((values, (numerix.array(var.globalValue),)))
-
-            self._plot(values, f, dim)
+            self._plot(self._values(mesh.faceCenters, FaceVariable), f, dim)
 
         if f is not sys.stdout:
             f.close()